@@ -5,33 +5,47 @@ Content Audit - Find optimization opportunities
 import json
 import os
 from datetime import datetime, timedelta
+from content_cache import ContentCache
 from telegram_utils import send_telegram_alert
 
-# Pre-flight: check data file exists
 data_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'data', 'wp_posts.json')
 data_path = os.path.normpath(data_path)
 
-if not os.path.exists(data_path):
+# Prefer the shared content cache (kept fresh by build_site_inventory); only
+# metadata is needed here, so the cached bodies are never decompressed.
+cache = ContentCache.for_site()
+if cache.is_warm():
+    posts = [
+        {
+            'id': p.id,
+            'title': {'rendered': p.title},
+            'date': p.date,
+            'modified': p.modified,
+            'link': p.link,
+        }
+        for p in cache.posts(include_content=False)
+    ]
+    print(f"Loaded {len(posts)} posts from content cache")
+elif not os.path.exists(data_path):
     msg = ("🚨 *CONTENT AUDIT BLOCKED*\n"
-           f"• `{data_path}` does not exist\n"
-           "• Run the WordPress fetch step first to populate post data\n"
-           "• Content audit is offline")
-    print(msg)
-    send_telegram_alert(msg)
-    exit(1)
-
-# Load posts
-try:
-    with open(data_path, 'r') as f:
-        posts = json.load(f)
-except (json.JSONDecodeError, IOError) as e:
-    msg = (f"🚨 *CONTENT AUDIT FAILED*\n"
-           f"• Error reading `wp_posts.json`: `{str(e)[:200]}`\n"
-           "• File may be corrupt or empty\n"
+           f"• Content cache is empty and `{data_path}` does not exist\n"
+           "• Run build_inventory (or the WordPress fetch step) first to populate post data\n"
            "• Content audit is offline")
     print(msg)
     send_telegram_alert(msg)
     exit(1)
+else:
+    try:
+        with open(data_path, 'r') as f:
+            posts = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        msg = (f"🚨 *CONTENT AUDIT FAILED*\n"
+               f"• Error reading `wp_posts.json`: `{str(e)[:200]}`\n"
+               "• File may be corrupt or empty\n"
+               "• Content audit is offline")
+        print(msg)
+        send_telegram_alert(msg)
+        exit(1)
 
 print(f"📝 CONTENT AUDIT: {len(posts)} posts analyzed")
 print("=" * 80)
@@ -99,7 +113,8 @@ output = {
     }
 }
 
+os.makedirs(os.path.dirname(data_path), exist_ok=True)
 with open(os.path.join(os.path.dirname(data_path), 'content_opportunities.json'), 'w') as f:
-    json.dump(output, f, indent=2)
+    json.dump(output, f, indent=2, default=str)
 
 print(f"\n✅ Data saved to data/content_opportunities.json")
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from telegram_utils import send_telegram_alert
+from tool_protocol import emit_result
 from dotenv import load_dotenv
 
 # Load root .env
@@ -211,5 +212,6 @@ output_path = os.path.join(DATA_DIR, f'gsc_audit_{file_slug}.json')
 
 with open(output_path, 'w') as f:
     json.dump(output, f, indent=2)
+emit_result(output)
 
 print(f"\n✅ Data saved to {output_path}")
@@ -12,14 +12,15 @@ from datetime import datetime, timedelta
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from collections import defaultdict
-import time
 from dotenv import load_dotenv
 
 # Load root .env
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../shared/scripts'))
 from telegram_utils import send_telegram_alert
+from wp_client import WPClient
 
 # Configuration
 SITE_URL = os.getenv('GSC_SITE_URL', 'https://griddleking.com/')
@@ -160,46 +161,32 @@ if not WP_USERNAME or not WP_APP_PASS:
     send_telegram_alert(msg)
     exit(1)
 
-wp_auth = (WP_USERNAME, WP_APP_PASS)
+wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=30)
 all_posts = []
-page = 1
 
 print("Fetching WordPress posts...")
 wp_fetch_failed = False
-while True:
-    try:
-        response = requests.get(
-            f"{WP_URL}/wp-json/wp/v2/posts",
-            params={'per_page': 100, 'page': page, 'status': 'publish'},
-            auth=wp_auth,
-            timeout=30
-        )
-        if response.status_code == 401 or response.status_code == 403:
-            msg = (f"🚨 *WORDPRESS AUTH FAILED*\n"
-                   f"• Status code: `{response.status_code}`\n"
-                   f"• WordPress credentials are invalid or expired\n"
-                   f"• Content audit is offline")
-            print(msg)
-            send_telegram_alert(msg)
-            wp_fetch_failed = True
-            break
-        if response.status_code != 200:
-            break
-        posts = response.json()
-        if not posts:
-            break
+try:
+    for _, _, posts in wp.iter_post_pages({'status': 'publish'}):
         all_posts.extend(posts)
-        page += 1
-        time.sleep(0.5)
-    except requests.exceptions.RequestException as e:
-        msg = (f"🚨 *WORDPRESS API ERROR*\n"
-               f"• Error: `{str(e)[:200]}`\n"
-               f"• Retrieved {len(all_posts)} posts before failure\n"
-               f"• Content audit may be incomplete")
+except requests.exceptions.HTTPError as e:
+    status = e.response.status_code if e.response is not None else None
+    if status in (401, 403):
+        msg = (f"🚨 *WORDPRESS AUTH FAILED*\n"
+               f"• Status code: `{status}`\n"
+               f"• WordPress credentials are invalid or expired\n"
+               f"• Content audit is offline")
         print(msg)
         send_telegram_alert(msg)
         wp_fetch_failed = True
-        break
+except requests.exceptions.RequestException as e:
+    msg = (f"🚨 *WORDPRESS API ERROR*\n"
+           f"• Error: `{str(e)[:200]}`\n"
+           f"• Retrieved {len(all_posts)} posts before failure\n"
+           f"• Content audit may be incomplete")
+    print(msg)
+    send_telegram_alert(msg)
+    wp_fetch_failed = True
 
 if wp_fetch_failed and len(all_posts) == 0:
     print("❌ No posts retrieved. Cannot continue content audit.")
@@ -210,13 +197,13 @@ print(f"✅ Retrieved {len(all_posts)} published posts")
 # Build post database
 post_db = {}
 for post in all_posts:
-    post_db[post['link']] = {
-        'id': post['id'],
-        'title': post['title']['rendered'],
-        'date': post['date'],
-        'modified': post['modified'],
-        'link': post['link'],
-        'content': post['content']['rendered']
+    post_db[post.link] = {
+        'id': post.id,
+        'title': post.title,
+        'date': post.date,
+        'modified': post.modified,
+        'link': post.link,
+        'content': post.content
     }
 
 # Identify old posts (>12 months)
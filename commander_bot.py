@@ -35,6 +35,7 @@ from agents.agent_dispatch import (
 from core.state_store import StateStore
 from core.claude_client import ClaudeClient
 from core.commander_brain import CommanderBrain
+from core.tool_metrics import ToolMetricsStore
 
 # ── Config ──────────────────────────────────────────────────────────────────
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -51,6 +52,7 @@ START_CONFIRM_TTL_SECONDS = 120
 
 # ── Initialize Core Systems ────────────────────────────────────────────────
 state_store = StateStore(os.path.join(ROOT_DIR, "state"))
+tool_metrics = ToolMetricsStore(os.path.join(ROOT_DIR, "state"))
 claude_client = ClaudeClient(ANTHROPIC_API_KEY) if ANTHROPIC_API_KEY else None
 
 # Commander brain (scheduler wires in trigger_fn after init)
@@ -90,6 +92,7 @@ def _send_help(chat_id):
         "/status -- Live fleet status\n"
         "/mission -- Current mission overview\n"
         "/portfolio -- Portfolio allocation + KPI deltas\n"
+        "/toolstats `[site]` -- Tool latency (p50/p95) + failure rates\n"
         "/audit `[site]` -- Run SEO audit\n"
         "/keywords `[site]` -- Run keyword research\n\n"
         "*Safety:*\n"
@@ -310,6 +313,19 @@ def handle_portfolio(chat_id):
         send_message("Portfolio view unavailable: brain offline.", chat_id)
 
 
+def handle_toolstats(chat_id, args):
+    """Per-tool telemetry: p50/p95 latency and failure rate, 24h vs 7d."""
+    slugs = None
+    if args:
+        agent_key, agent = resolve_agent(args[0])
+        if not agent_key:
+            send_message(f"Unknown site: `{args[0]}`. Try: griddle, photo, tiger", chat_id)
+            return
+        slugs = [agent["prefix"].lower().replace("wp_", "").replace("_", "")]
+    report = tool_metrics.format_report(slugs=slugs)
+    send_message(f"*TOOL TELEMETRY*\n\n{report}", chat_id)
+
+
 def handle_site_command(chat_id, agent_key, args):
     """Handle /griddle, /photo, /tiger with optional sub-command."""
     agent = AGENTS.get(agent_key)
@@ -439,6 +455,7 @@ def process_message(message):
             "/status": lambda: handle_status(chat_id),
             "/mission": lambda: handle_mission(chat_id),
             "/portfolio": lambda: handle_portfolio(chat_id),
+            "/toolstats": lambda: handle_toolstats(chat_id, args),
             "/griddle": lambda: handle_site_command(chat_id, "griddle", args),
             "/photo": lambda: handle_site_command(chat_id, "photo", args),
             "/tiger": lambda: handle_site_command(chat_id, "tiger", args),
@@ -4,6 +4,7 @@ Assess -> Plan -> Execute -> Report, with Commander review gates.
 """
 
 import json
+import os
 import re
 import traceback
 from datetime import datetime, timedelta
@@ -55,7 +56,9 @@ PRIORITY ORDER (always follow this):
 1. Revenue leaks (broken affiliate links, missing CTAs) — use fix_affiliate_links
 2. Declining pages (traffic drops, position losses) — use update_post_meta to fix titles/descriptions
 3. Page 2 pushes (positions 11-20, close to Page 1) — use update_post_meta for CTR improvement
-4. Orphan fixes (posts with zero internal links) — use inject_internal_links
+4. Orphan fixes (posts with zero inbound internal links) — run suggest_links, then
+   inject_internal_links with no write_instructions (suggest_links writes them); when writing
+   injections by hand, take source posts from the inventory's top_authority_posts
 5. New content opportunities (keyword gaps) — use build_inventory + keyword_research
 
 You are in ASSESSMENT mode. Analyze the current data and respond with JSON:
@@ -123,6 +126,8 @@ class AgentBrain:
         self.claude = claude
         self.telegram_fn = telegram_fn
         self.review_now_fn = review_now_fn
+        # (path, mtime_ns, size) -> parsed inventory JSON, see _load_inventory
+        self._inventory_cache = None
 
     def tick(self):
         """Main loop iteration — called by scheduler every interval.
@@ -173,17 +178,28 @@ class AgentBrain:
             self._notify(f"Error during tick: {str(e)[:200]}")
 
     def _load_inventory(self):
-        """Load site inventory if it exists and is fresh enough."""
+        """Load site inventory if it exists and is fresh enough.
+
+        The parsed JSON export is memoized on the file's mtime and size, so
+        repeated calls during an assessment don't re-read an unchanged file.
+        """
         import os
         slug = self.config.get("prefix", "").lower().replace("wp_", "").replace("_", "")
         inv_path = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), "state", f"inventory_{slug}.json"
         )
-        if not os.path.exists(inv_path):
+        try:
+            st = os.stat(inv_path)
+        except OSError:
             return None
+        key = (inv_path, st.st_mtime_ns, st.st_size)
         try:
-            with open(inv_path, "r") as f:
-                inv = json.load(f)
+            if self._inventory_cache and self._inventory_cache[0] == key:
+                inv = self._inventory_cache[1]
+            else:
+                with open(inv_path, "r") as f:
+                    inv = json.load(f)
+                self._inventory_cache = (key, inv)
             # Check freshness — stale if older than 6 hours
             last_updated = inv.get("meta", {}).get("last_updated")
             if last_updated:
@@ -236,7 +252,7 @@ class AgentBrain:
             )
         elif not inventory:
             # No GSC data AND no inventory — run build_inventory as fallback
-            inv_result = self.tools.run_tool("build_inventory")
+            inv_result = self.tools.run_tool("build_inventory", progress_fn=self._record_progress)
             if inv_result["success"]:
                 inventory = self._load_inventory()
                 if inventory:
@@ -319,6 +335,9 @@ class AgentBrain:
                 )
                 return
 
+        # Plans with several write steps stage their edits and write each post once.
+        write_stage_path = self._plan_write_stage_path(steps)
+
         self.state.set_agent_status(self.agent_key, "executing", task=plan.get("name", "Executing plan"))
         self.state.log_agent_timeline(
             self.agent_key,
@@ -341,10 +360,13 @@ class AgentBrain:
             # Write instruction files for write tools before invoking them.
             self._write_tool_instructions(tool_name, step)
 
-            result = self.tools.run_tool(tool_name)
-            tools_ran.add(tool_name)
-
             is_write_tool = tool_name in self.WRITE_TOOL_INSTRUCTION_MAP
+            env_overrides = None
+            if write_stage_path and is_write_tool:
+                env_overrides = {"WRITE_STAGE_PATH": write_stage_path, "WRITE_STAGE_STEP": f"{i+1}:{tool_name}"}
+
+            result = self.tools.run_tool(tool_name, progress_fn=self._record_progress, env_overrides=env_overrides)
+            tools_ran.add(tool_name)
 
             if not result["success"]:
                 failed_steps += 1
@@ -382,6 +404,9 @@ class AgentBrain:
             except Exception:
                 pass  # Analysis is optional, don't fail the plan
 
+        if write_stage_path:
+            failed_steps += self._commit_staged_writes(write_stage_path)
+
         # Capture post-execution KPI snapshot — skip tools already run in plan.
         post_kpis = self._capture_post_execution_kpis(skip_tools=tools_ran)
         notes = f"{len(steps) - failed_steps}/{len(steps)} steps succeeded"
@@ -767,6 +792,59 @@ class AgentBrain:
         except Exception as e:
             print(f"[{self.agent_key}] Failed to write instructions for {tool_name}: {e}")
 
+    def _plan_write_stage_path(self, steps):
+        """Stage file for a plan with more than one write step, else None."""
+        write_steps = [s for s in steps if s.get("tool") in self.WRITE_TOOL_INSTRUCTION_MAP]
+        if len(write_steps) < 2:
+            return None
+        slug = self.config.get("prefix", "").lower().replace("wp_", "").replace("_", "")
+        state_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "state")
+        path = os.path.join(state_dir, f"write_stage_{slug}.json")
+        if os.path.exists(path):
+            os.unlink(path)  # left by an interrupted plan; its base content is stale
+        return path
+
+    def _commit_staged_writes(self, path):
+        """Write the plan's staged edits; returns how many steps had writes fail."""
+        if not os.path.exists(path):
+            return 0
+        result = self.tools.run_tool(
+            "commit_staged_writes",
+            progress_fn=self._record_progress,
+            env_overrides={"WRITE_STAGE_PATH": path},
+        )
+        if not result["success"]:
+            error_msg = f"Committing staged writes failed: {result['output'][:200]}"
+            self.state.log_agent_error(self.agent_key, error_msg)
+            self.state.log_write_failure(self.agent_key, "commit_staged_writes", error_msg)
+            self._notify(f"Plan step failed: {error_msg}")
+            return 1
+
+        data = result.get("data") or {}
+        failed = 0
+        for step, outcome in (data.get("steps") or {}).items():
+            if not outcome.get("failed"):
+                continue
+            failed += 1
+            step_number, _, tool_name = step.partition(":")
+            error_msg = f"Step {step_number} ({tool_name}) writes failed: {'; '.join(outcome.get('errors', [])[:3])}"
+            self.state.log_agent_error(self.agent_key, error_msg)
+            self.state.log_agent_timeline(
+                self.agent_key,
+                "step_failed",
+                error_msg,
+                {"step": int(step_number) if step_number.isdigit() else step_number, "tool": tool_name},
+            )
+            self.state.log_write_failure(self.agent_key, tool_name, error_msg)
+            self._notify(f"Plan step failed: {error_msg}")
+        print(f"[{self.agent_key}] Staged writes committed: {data.get('posts_written', 0)} posts written, "
+              f"{data.get('noop_writes_skipped', 0)} no-op, {data.get('failed', 0)} failed")
+        return failed
+
+    def _record_progress(self, event):
+        """Forward a streamed tool progress event to the agent's current task."""
+        self.state.record_task_progress(self.agent_key, event)
+
     def _notify(self, message):
         """Send a notification via the agent's Telegram bot."""
         full_msg = f"*{self.config['name']}*\n{message}"
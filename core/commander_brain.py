@@ -269,6 +269,10 @@ class CommanderBrain:
                 line += f" — {task}"
             line += "\n"
 
+            progress = self.state.get_task_progress(key)
+            if progress and task:
+                line += f"  Progress: {self._format_progress(progress)}\n"
+
             if snap:
                 clicks = snap.get("total_clicks")
                 if clicks is not None:
@@ -329,6 +333,28 @@ class CommanderBrain:
         lines.append(f"\n_Generated {datetime.now().strftime('%Y-%m-%d %H:%M')}_")
         return "\n".join(lines)
 
+    @staticmethod
+    def _format_progress(progress):
+        """One-line rendering of a streamed tool progress event."""
+        done = progress.get("done")
+        total = progress.get("total")
+        unit = progress.get("unit", "items")
+        text = f"{progress.get('stage', '?')} {done}"
+        if total:
+            text += f"/{total}"
+        text += f" {unit}"
+        rate = progress.get("rate_per_sec")
+        if rate:
+            text += f" ({rate:.1f}/s"
+            eta = progress.get("eta_seconds")
+            if eta is not None:
+                text += f", ETA {int(eta)}s"
+            text += ")"
+        recorded = progress.get("recorded_at") or progress.get("at") or ""
+        if recorded:
+            text += f" @ {recorded[11:19]}"
+        return text
+
     def get_mission_overview(self):
         """Deterministic mission overview from state, no model interpretation."""
         agent_states = self.state.get_all_agent_states(self.agent_keys)
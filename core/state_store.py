@@ -6,6 +6,7 @@ Atomic writes via tempfile + rename to prevent corruption on crash.
 import json
 import os
 import tempfile
+import threading
 from datetime import datetime, timedelta
 
 TIMELINE_LIMIT = 200
@@ -102,6 +103,11 @@ class StateStore:
     def __init__(self, state_dir):
         self.state_dir = state_dir
         os.makedirs(state_dir, exist_ok=True)
+        # Latest streamed tool progress per agent.  Kept in memory only: it is
+        # written from the tool reader thread, and a file read-modify-write
+        # there could overwrite a concurrent status change.
+        self._task_progress = {}
+        self._progress_lock = threading.Lock()
 
     def _path(self, name):
         return os.path.join(self.state_dir, f"{name}.json")
@@ -209,6 +215,8 @@ class StateStore:
         elif status == "idle":
             # Idle should never carry stale execution task text.
             state["current_task"] = None
+        if state.get("current_task") != prev_task or status == "idle":
+            self.clear_task_progress(agent_key)
         state["last_tick"] = _now()
         if prev_status != status or (task is not None and prev_task != task):
             self._append_timeline(
@@ -221,6 +229,21 @@ class StateStore:
             )
         self.save_agent(agent_key, state)
 
+    def record_task_progress(self, agent_key, progress):
+        """Remember the latest tool progress event for the agent's current task (memory only)."""
+        with self._progress_lock:
+            self._task_progress[agent_key] = {**(progress or {}), "recorded_at": _now()}
+
+    def get_task_progress(self, agent_key):
+        """Latest progress event recorded for the agent's current task, or None."""
+        with self._progress_lock:
+            progress = self._task_progress.get(agent_key)
+            return dict(progress) if progress else None
+
+    def clear_task_progress(self, agent_key):
+        with self._progress_lock:
+            self._task_progress.pop(agent_key, None)
+
     def request_reassess(self, agent_key, reason="manual trigger"):
         """Request a forced reassessment on the next idle tick."""
         state = self.get_agent(agent_key)
@@ -350,6 +373,7 @@ class StateStore:
         })
         state["completed_tasks"] = state["completed_tasks"][:50]
         state["current_task"] = None
+        self.clear_task_progress(agent_key)
         state["status"] = "idle"
         state["pending_plan"] = None
         state["last_assessment"] = None  # Allow immediate re-assessment next tick
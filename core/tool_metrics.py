@@ -0,0 +1,191 @@
+"""
+Per-tool execution telemetry — rolling metrics store per site and tool.
+
+ToolRegistry records one sample per tool invocation (wall time, child CPU,
+peak RSS, exit status, output volume).  Samples live in
+state/tool_metrics_{slug}.json, capped per tool, written atomically.
+Reports surface p50/p95 latency and failure rate per tool over time
+(/toolstats in Telegram, scripts/tool_stats.py on the CLI).
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+METRICS_PER_TOOL_LIMIT = 500
+
+_lock = threading.Lock()
+
+
+def _now():
+    return datetime.now().isoformat()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)."""
+    ordered = sorted(v for v in values if v is not None)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_samples(samples):
+    """Aggregate a list of samples into latency/failure/resource stats."""
+    if not samples:
+        return None
+    walls = [s.get("wall_seconds") for s in samples]
+    cpus = [
+        (s.get("cpu_user_seconds") or 0.0) + (s.get("cpu_sys_seconds") or 0.0)
+        for s in samples
+        if s.get("cpu_user_seconds") is not None
+    ]
+    failures = [s for s in samples if not s.get("success")]
+    rss = [s.get("max_rss_kb") for s in samples if s.get("max_rss_kb") is not None]
+    return {
+        "runs": len(samples),
+        "failures": len(failures),
+        "failure_rate_pct": round(len(failures) / len(samples) * 100.0, 1),
+        "p50_seconds": percentile(walls, 50),
+        "p95_seconds": percentile(walls, 95),
+        "total_seconds": round(sum(w for w in walls if w is not None), 1),
+        "avg_cpu_seconds": round(sum(cpus) / len(cpus), 2) if cpus else None,
+        "max_rss_kb": max(rss) if rss else None,
+        "last_run_at": max(s.get("at", "") for s in samples),
+    }
+
+
+class ToolMetricsStore:
+    """Rolling JSON metrics store, one file per site slug."""
+
+    def __init__(self, state_dir):
+        self.state_dir = state_dir
+        os.makedirs(state_dir, exist_ok=True)
+
+    def _path(self, slug):
+        return os.path.join(self.state_dir, f"tool_metrics_{slug}.json")
+
+    def _read(self, slug):
+        path = self._path(slug)
+        if not os.path.exists(path):
+            return {"slug": slug, "tools": {}}
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {"slug": slug, "tools": {}}
+
+    def _write(self, slug, data):
+        """Atomic write: write to tempfile then rename."""
+        path = self._path(slug)
+        fd, tmp = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2, default=str)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def slugs(self):
+        """Site slugs that have recorded metrics."""
+        found = []
+        for name in sorted(os.listdir(self.state_dir)):
+            if name.startswith("tool_metrics_") and name.endswith(".json"):
+                found.append(name[len("tool_metrics_"):-len(".json")])
+        return found
+
+    def record(self, slug, tool_name, sample):
+        """Append one invocation sample, trimming to the newest N per tool."""
+        entry = {"at": _now(), **sample}
+        with _lock:
+            data = self._read(slug)
+            samples = data.setdefault("tools", {}).setdefault(tool_name, [])
+            samples.insert(0, entry)
+            data["tools"][tool_name] = samples[:METRICS_PER_TOOL_LIMIT]
+            data["last_updated"] = entry["at"]
+            self._write(slug, data)
+        return entry
+
+    def samples(self, slug, tool_name=None, since=None):
+        """Return samples for a site, optionally filtered by tool and start time."""
+        data = self._read(slug)
+        tools = data.get("tools", {})
+        names = [tool_name] if tool_name else list(tools.keys())
+        cutoff = since.isoformat() if since else None
+        out = {}
+        for name in names:
+            rows = tools.get(name, [])
+            if cutoff:
+                rows = [r for r in rows if r.get("at", "") >= cutoff]
+            out[name] = rows
+        return out
+
+    def summarize(self, slug, since_hours=None):
+        """Per-tool stats for a site, optionally restricted to a recent window."""
+        since = datetime.now() - timedelta(hours=since_hours) if since_hours else None
+        stats = {}
+        for name, rows in self.samples(slug, since=since).items():
+            summary = summarize_samples(rows)
+            if summary:
+                stats[name] = summary
+        return stats
+
+    def daily_series(self, slug, tool_name, days=7):
+        """Per-day stats for one tool over the last N days (oldest first)."""
+        today = datetime.now().date()
+        rows = self.samples(slug, tool_name=tool_name).get(tool_name, [])
+        series = []
+        for offset in range(days - 1, -1, -1):
+            day = (today - timedelta(days=offset)).isoformat()
+            day_rows = [r for r in rows if r.get("at", "").startswith(day)]
+            series.append({"day": day, "stats": summarize_samples(day_rows)})
+        return series
+
+    def format_report(self, slugs=None, windows=(24, 168)):
+        """Compact text report: p50/p95 latency and failure rate per tool/window."""
+        slugs = slugs or self.slugs()
+        if not slugs:
+            return "No tool telemetry recorded yet."
+
+        def _fmt_secs(value):
+            return "n/a" if value is None else f"{value:.1f}s"
+
+        lines = []
+        for slug in slugs:
+            lines.append(f"*{slug}*")
+            per_window = {hours: self.summarize(slug, since_hours=hours) for hours in windows}
+            tool_names = sorted({name for stats in per_window.values() for name in stats})
+            if not tool_names:
+                lines.append("  no runs in window")
+                continue
+            # Tools that cost the most wall time in the widest window first.
+            widest = per_window[windows[-1]]
+            tool_names.sort(key=lambda n: -(widest.get(n, {}).get("total_seconds") or 0))
+            for name in tool_names:
+                parts = []
+                for hours in windows:
+                    st = per_window[hours].get(name)
+                    label = f"{hours}h" if hours < 48 else f"{hours // 24}d"
+                    if not st:
+                        parts.append(f"{label}: -")
+                        continue
+                    parts.append(
+                        f"{label}: n={st['runs']} p50={_fmt_secs(st['p50_seconds'])} "
+                        f"p95={_fmt_secs(st['p95_seconds'])} fail={st['failure_rate_pct']:.0f}%"
+                    )
+                lines.append(f"  `{name}` " + " | ".join(parts))
+                st = widest.get(name)
+                if st and (st.get("avg_cpu_seconds") is not None or st.get("max_rss_kb")):
+                    rss_mb = (st["max_rss_kb"] / 1024.0) if st.get("max_rss_kb") else None
+                    lines.append(
+                        f"    cpu avg={_fmt_secs(st.get('avg_cpu_seconds'))}, "
+                        f"peak rss={'n/a' if rss_mb is None else f'{rss_mb:.0f}MB'}, "
+                        f"wall total={_fmt_secs(st.get('total_seconds'))}"
+                    )
+            lines.append("")
+        return "\n".join(lines).rstrip()
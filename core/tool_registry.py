@@ -1,12 +1,25 @@
 """
 Tool Registry — wraps existing scripts as callable tools for agent brains.
 Runs scripts as subprocesses with correct SITE_PREFIX and PYTHONPATH.
+
+Structured results come back over a private pipe (see
+shared/scripts/tool_protocol.py), not through shared output files.  Progress
+events stream over a second pipe and are forwarded to a callback live.
 """
 
 import json
 import os
 import subprocess
 import sys
+import threading
+import time
+
+from core.tool_metrics import ToolMetricsStore
+
+TOOL_TIMEOUT_SECONDS = 300
+# Keep in sync with shared/scripts/tool_protocol.py
+RESULT_FD_ENV = "TOOL_RESULT_FD"
+PROGRESS_FD_ENV = "TOOL_PROGRESS_FD"
 
 TOOL_ALIASES = {
     "orphanrescue": "orphan_rescue",
@@ -17,38 +30,47 @@ TOOL_ALIASES = {
     "update_meta": "update_post_meta",
     "inject_links": "inject_internal_links",
     "fix_affiliates": "fix_affiliate_links",
+    "suggest_internal_links": "suggest_links",
+    "link_suggestions": "suggest_links",
 }
 
 
-# Tool definitions: name -> (script_path relative to ROOT_DIR, output_file relative to ROOT_DIR)
-# Output paths with {slug} are expanded per-agent based on SITE_PREFIX
+# Tool definitions: name -> script_path relative to ROOT_DIR.
+# Tools return structured data via tool_protocol.emit_result().  "output" is
+# only kept for legacy scripts that still write a report file; paths with
+# {slug} are expanded per-agent based on SITE_PREFIX.
 TOOL_DEFINITIONS = {
     # ── READ tools (intelligence gathering) ─────────────────────────────
     "gsc_audit": {
         "script": "agents/seo_manager/scripts/gsc_audit.py",
-        "output": "agents/seo_manager/data/gsc_audit_{slug}.json",
+        "output": None,
         "description": "Pull GSC performance data — clicks, impressions, positions, declining pages.",
     },
     "seo_audit": {
         "script": "shared/scripts/universal_seo_audit.py",
-        "output": "seo_kickstart_results.json",
+        "output": None,
         "description": "Full SEO audit — internal links, orphans, content quality, meta tags. EXPENSIVE: prefer build_inventory for routine checks.",
     },
     "keyword_research": {
         "script": "shared/scripts/universal_keyword_research.py",
-        "output": "keyword_opportunities.json",
+        "output": None,
         "description": "Keyword research — find opportunities, Page 2 pushes, gaps vs competitors.",
     },
     "affiliate_audit": {
         "script": "shared/scripts/affiliate_audit.py",
-        "output": "affiliate_audit_report.json",
+        "output": None,
         "description": "Audit affiliate links — find broken, missing, or underperforming links.",
     },
     "build_inventory": {
         "script": "shared/scripts/build_site_inventory.py",
-        "output": "state/inventory_{slug}.json",
+        "output": None,
         "description": "Build or refresh site inventory — crawls all posts, counts links, word counts, meta descriptions. Incremental after first run. Use INSTEAD of seo_audit for routine checks.",
     },
+    "suggest_links": {
+        "script": "shared/scripts/suggest_internal_links.py",
+        "output": None,
+        "description": "Find source posts and exact anchor phrases for every orphan (TF-IDF over post text, ranked by internal PageRank, skipping URLs in cooldown) and write them to state/pending_link_inject_{slug}.json. Run BEFORE inject_internal_links and give that step no write_instructions.",
+    },
     # ── WRITE tools (make actual changes) ───────────────────────────────
     "update_post_meta": {
         "script": "shared/scripts/update_post_meta.py",
@@ -58,18 +80,25 @@ TOOL_DEFINITIONS = {
     "inject_internal_links": {
         "script": "shared/scripts/inject_internal_links.py",
         "output": None,
-        "description": "Inject internal links into WordPress posts. Write instructions to state/pending_link_inject_{slug}.json BEFORE calling. Format: {\"injections\": [{\"source_post_id\": 456, \"target_url\": \"...\", \"anchor_text\": \"...\", \"context_hint\": \"...\"}]}",
+        "description": "Inject internal links into WordPress posts. Write instructions to state/pending_link_inject_{slug}.json BEFORE calling. Format: {\"injections\": [{\"source_post_id\": 456, \"target_url\": \"...\", \"anchor_text\": \"...\", \"context_hint\": \"...\"}]}. Pick source_post_id from the inventory summary's top_authority_posts (internal PageRank).",
     },
     "fix_affiliate_links": {
         "script": "shared/scripts/fix_affiliate_links.py",
         "output": None,
-        "description": "Fix broken or untagged affiliate links. Write instructions to state/pending_affiliate_fix_{slug}.json BEFORE calling. Format: {\"fixes\": [{\"post_id\": 123, \"broken_url\": \"...\", \"fixed_url\": \"...\", \"action\": \"retag\"}]}",
+        "description": "Fix broken or untagged affiliate links. Write instructions to state/pending_affiliate_fix_{slug}.json BEFORE calling. Format: {\"fixes\": [{\"post_id\": 123, \"broken_url\": \"...\", \"fixed_url\": \"...\", \"action\": \"retag\"}]} (max 30 fixes). To retag every Amazon link on the site whose tag isn't AMAZON_ASSOCIATE_TAG in one job, write {\"bulk_retag\": {\"match\": \"any\"}} instead (match: missing|wrong|any; add \"dry_run\": true to preview); the result names a rollback manifest.",
+    },
+    # ── PLAN tools (run by the agent brain, never planned) ──────────────
+    "commit_staged_writes": {
+        "script": "shared/scripts/commit_staged_writes.py",
+        "output": None,
+        "description": "Write the post updates staged by a plan's write steps, one update per post.",
+        "internal": True,
     },
     # ── LEGACY tools ────────────────────────────────────────────────────
     "orphan_rescue": {
         "script": "scripts/orphan_rescue.py",
         "output": "data/orphan_rescan.json",
-        "description": "DEPRECATED: Use inject_internal_links instead. Legacy orphan rescue script.",
+        "description": "DEPRECATED: Use inject_internal_links instead. Legacy orphan rescue script; reads the orphans and authorities of the last seo_audit run (data/seo_audit_{slug}.json).",
     },
     "generate_image": {
         "script": "shared/scripts/generate_featured_image.py",
@@ -82,21 +111,24 @@ TOOL_DEFINITIONS = {
 class ToolRegistry:
     """Wraps existing scripts as callable tools for agent brains."""
 
-    def __init__(self, root_dir, site_prefix):
+    def __init__(self, root_dir, site_prefix, metrics=None):
         """
         Args:
             root_dir: Project root directory.
             site_prefix: SITE_PREFIX env var value (e.g., "WP_GRIDDLEKING").
+            metrics: Optional ToolMetricsStore; defaults to one under state/.
         """
         self.root_dir = root_dir
         self.site_prefix = site_prefix
         self.slug = site_prefix.lower().replace('wp_', '').replace('_', '')
+        self.metrics = metrics if metrics is not None else ToolMetricsStore(os.path.join(root_dir, "state"))
 
     def list_tools(self):
         """Return available tool names and descriptions."""
         return {
             name: defn["description"]
             for name, defn in TOOL_DEFINITIONS.items()
+            if not defn.get("internal")
         }
 
     def _resolve_output_path(self, output_template):
@@ -105,11 +137,236 @@ class ToolRegistry:
             return None
         return output_template.replace("{slug}", self.slug)
 
-    def run_tool(self, tool_name, **kwargs):
+    def _load_legacy_output(self, defn):
+        """Read a legacy tool's report file, if it declares one."""
+        output_rel = self._resolve_output_path(defn.get("output"))
+        if not output_rel:
+            return None
+        output_path = os.path.join(self.root_dir, output_rel)
+        if not os.path.exists(output_path):
+            return None
+        try:
+            with open(output_path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return None
+
+    @staticmethod
+    def _parse_result(raw):
+        """Decode the single JSON document a tool emitted on its result channel."""
+        if not raw:
+            return None
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def _drain(stream, sink):
+        """Read a pipe to EOF into sink (list of bytes chunks)."""
+        try:
+            for chunk in iter(lambda: stream.read(65536), b""):
+                sink.append(chunk)
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _stream_progress(stream, progress_fn, last_event):
+        """Forward newline-delimited JSON progress events as they arrive."""
+        try:
+            for line in iter(stream.readline, b""):
+                try:
+                    event = json.loads(line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+                if not isinstance(event, dict):
+                    continue
+                last_event["event"] = event
+                if progress_fn:
+                    try:
+                        progress_fn(event)
+                    except Exception as e:
+                        print(f"Progress callback failed: {e}")
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def _run_process(self, cmd, env, cwd, progress_fn=None):
+        """Run a tool subprocess with private result and progress pipes.
+
+        stdout, stderr and both channels are drained on background threads so
+        a chatty tool can never deadlock on a full pipe buffer.
+
+        Returns:
+            dict: {"returncode", "stdout", "stderr", "result" (bytes),
+                   "last_progress", "timed_out"}
+        """
+        result_r, result_w = os.pipe()
+        progress_r, progress_w = os.pipe()
+        env = dict(env)
+        env[RESULT_FD_ENV] = str(result_w)
+        env[PROGRESS_FD_ENV] = str(progress_w)
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                env=env,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                pass_fds=(result_w, progress_w),
+            )
+        except Exception:
+            os.close(result_r)
+            os.close(progress_r)
+            raise
+        finally:
+            os.close(result_w)
+            os.close(progress_w)
+
+        buffers = {"stdout": [], "stderr": [], "result": []}
+        last_progress = {}
+        readers = [
+            threading.Thread(target=self._drain, args=(proc.stdout, buffers["stdout"]), daemon=True),
+            threading.Thread(target=self._drain, args=(proc.stderr, buffers["stderr"]), daemon=True),
+            threading.Thread(
+                target=self._drain,
+                args=(os.fdopen(result_r, "rb"), buffers["result"]),
+                daemon=True,
+            ),
+            threading.Thread(
+                target=self._stream_progress,
+                args=(os.fdopen(progress_r, "rb"), progress_fn, last_progress),
+                daemon=True,
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+
+        started = time.monotonic()
+        timed_out, rusage = self._wait_with_usage(proc)
+        wall_seconds = time.monotonic() - started
+
+        for reader in readers:
+            # Grandchildren may still hold a pipe open; don't hang on them.
+            reader.join(timeout=5)
+
+        stdout_raw = b"".join(buffers["stdout"])
+        stderr_raw = b"".join(buffers["stderr"])
+        return {
+            "returncode": proc.returncode,
+            "stdout": stdout_raw.decode("utf-8", errors="replace"),
+            "stderr": stderr_raw.decode("utf-8", errors="replace"),
+            "stdout_bytes": len(stdout_raw),
+            "stderr_bytes": len(stderr_raw),
+            "result": b"".join(buffers["result"]),
+            "last_progress": last_progress.get("event"),
+            "timed_out": timed_out,
+            "wall_seconds": wall_seconds,
+            "rusage": rusage,
+        }
+
+    @staticmethod
+    def _wait_with_usage(proc):
+        """Wait for proc and collect its own resource usage.
+
+        os.wait4 reports CPU and peak RSS for exactly this child, which stays
+        correct when several agents run tools concurrently (RUSAGE_CHILDREN
+        deltas would mix them up).
+
+        Returns:
+            (timed_out, rusage or None)
+        """
+        if not hasattr(os, "wait4"):
+            try:
+                proc.wait(timeout=TOOL_TIMEOUT_SECONDS)
+                return False, None
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                return True, None
+
+        reaped = {}
+
+        def _reap():
+            try:
+                _, status, usage = os.wait4(proc.pid, 0)
+                reaped["returncode"] = os.waitstatus_to_exitcode(status)
+                reaped["rusage"] = usage
+            except ChildProcessError:
+                pass
+
+        waiter = threading.Thread(target=_reap, daemon=True)
+        waiter.start()
+        waiter.join(TOOL_TIMEOUT_SECONDS)
+        timed_out = waiter.is_alive()
+        if timed_out:
+            proc.kill()
+            waiter.join()
+        if "returncode" in reaped:
+            proc.returncode = reaped["returncode"]
+        else:
+            proc.wait()
+        return timed_out, reaped.get("rusage")
+
+    def _record_metrics(self, tool_name, run=None, success=False, error=None):
+        """Persist one telemetry sample for this invocation (never raises)."""
+        if not self.metrics:
+            return
+        sample = {
+            "success": bool(success),
+            "exit_code": None,
+            "timed_out": False,
+            "wall_seconds": None,
+            "cpu_user_seconds": None,
+            "cpu_sys_seconds": None,
+            "max_rss_kb": None,
+            "stdout_bytes": 0,
+            "stderr_bytes": 0,
+            "result_bytes": 0,
+        }
+        if run:
+            usage = run.get("rusage")
+            sample.update({
+                "exit_code": run.get("returncode"),
+                "timed_out": run.get("timed_out", False),
+                "wall_seconds": round(run.get("wall_seconds") or 0.0, 3),
+                "stdout_bytes": run.get("stdout_bytes", 0),
+                "stderr_bytes": run.get("stderr_bytes", 0),
+                "result_bytes": len(run.get("result") or b""),
+            })
+            if usage is not None:
+                # ru_maxrss is KiB on Linux, bytes on macOS.
+                max_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+                sample.update({
+                    "cpu_user_seconds": round(usage.ru_utime, 3),
+                    "cpu_sys_seconds": round(usage.ru_stime, 3),
+                    "max_rss_kb": max_rss,
+                })
+        if error:
+            sample["error"] = str(error)[:200]
+        try:
+            self.metrics.record(self.slug, tool_name, sample)
+        except Exception as e:
+            print(f"Tool metrics write failed: {e}")
+
+    def run_tool(self, tool_name, progress_fn=None, env_overrides=None, **kwargs):
         """Run a tool by name and return results.
 
         Args:
             tool_name: Name from tool definitions.
+            progress_fn: Optional callable(event) invoked for every progress
+                event the tool streams while it runs.
+            env_overrides: Optional extra environment variables for the tool
+                process (e.g. WRITE_STAGE_PATH for plan-level write staging).
             **kwargs: Extra args (e.g., title for generate_image).
 
         Returns:
@@ -138,6 +395,7 @@ class ToolRegistry:
         # Suppress direct Telegram alerts from scripts — the Commander chain
         # of command owns all outward messaging when tools run under an agent.
         env["SUPPRESS_TELEGRAM_ALERTS"] = "1"
+        env.update(env_overrides or {})
 
         # Add shared/scripts to PYTHONPATH for telegram_utils etc.
         shared_scripts = os.path.join(self.root_dir, "shared", "scripts")
@@ -154,37 +412,41 @@ class ToolRegistry:
         # Determine working directory (script's parent)
         cwd = os.path.dirname(script_path)
 
+        run = None
         try:
-            result = subprocess.run(
-                cmd,
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=300,
-                cwd=cwd,
+            run = self._run_process(cmd, env, cwd, progress_fn=progress_fn)
+            self._record_metrics(
+                canonical_name,
+                run,
+                success=not run["timed_out"] and run["returncode"] == 0,
             )
 
-            stdout = result.stdout[-3000:] if result.stdout else ""
-            stderr = result.stderr[-1000:] if result.stderr else ""
+            stdout = run["stdout"][-3000:]
+            stderr = run["stderr"][-1000:]
 
-            if result.returncode != 0:
+            if run["timed_out"]:
+                last = run["last_progress"]
+                where = ""
+                if last:
+                    where = f" Last progress: {last.get('stage', '?')} {last.get('done')}/{last.get('total') or '?'}."
                 return {
                     "success": False,
-                    "output": f"Script failed (exit {result.returncode}):\n{stderr}\n{stdout}",
+                    "output": f"Tool `{canonical_name}` timed out ({TOOL_TIMEOUT_SECONDS // 60} min limit).{where}",
                     "data": None,
                 }
 
-            # Try to load structured output
-            data = None
-            output_rel = self._resolve_output_path(defn.get("output"))
-            if output_rel:
-                output_path = os.path.join(self.root_dir, output_rel)
-                if os.path.exists(output_path):
-                    try:
-                        with open(output_path, "r") as f:
-                            data = json.load(f)
-                    except (json.JSONDecodeError, OSError):
-                        pass
+            if run["returncode"] != 0:
+                return {
+                    "success": False,
+                    "output": f"Script failed (exit {run['returncode']}):\n{stderr}\n{stdout}",
+                    "data": None,
+                }
+
+            # Structured result arrives over the private result channel.
+            # Legacy scripts that never emit one still get their output file read.
+            data = self._parse_result(run["result"])
+            if data is None:
+                data = self._load_legacy_output(defn)
 
             return {
                 "success": True,
@@ -192,13 +454,9 @@ class ToolRegistry:
                 "data": data,
             }
 
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                    "output": f"Tool `{canonical_name}` timed out (5 min limit).",
-                "data": None,
-            }
         except Exception as e:
+            if run is None:
+                self._record_metrics(canonical_name, error=e)
             return {
                 "success": False,
                 "output": f"Tool `{canonical_name}` error: {str(e)[:300]}",
@@ -5,13 +5,15 @@ Safely injects contextual internal links into WordPress posts.
 """
 
 import os
+import sys
 import json
 import re
-import requests
-from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared', 'scripts'))
+from wp_client import WPClient
+
 load_dotenv()
 
 WP_URL = os.getenv('WP_URL').rstrip('/')
@@ -21,20 +23,13 @@ REQUEST_TIMEOUT = int(os.getenv('HTTP_TIMEOUT_SECONDS', '30'))
 
 class AutoLinkInjector:
     def __init__(self):
-        self.base_url = f"{WP_URL}/wp-json/wp/v2"
-        self.auth = HTTPBasicAuth(WP_USERNAME, WP_APP_PASS)
+        self.wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=REQUEST_TIMEOUT)
         self.injection_log = []
     
     def fetch_post(self, url):
         """Fetch complete post with raw content."""
         slug = url.rstrip('/').split('/')[-1]
-        api_url = f"{self.base_url}/posts?slug={slug}"
-        
-        response = requests.get(api_url, auth=self.auth, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        posts = response.json()
-        
-        return posts[0] if posts else None
+        return self.wp.get_post_by_slug(slug)
     
     def find_best_insertion_point(self, content, keyword, orphan_title):
         """
@@ -91,14 +86,7 @@ class AutoLinkInjector:
             new_content = content.replace(context, link_html, 1)
             
             # Update post
-            update_url = f"{self.base_url}/posts/{post_id}"
-            response = requests.post(
-                update_url,
-                json={'content': new_content},
-                auth=self.auth,
-                timeout=REQUEST_TIMEOUT,
-            )
-            response.raise_for_status()
+            self.wp.update_post(post_id, {'content': new_content})
             
             return True
         
@@ -117,8 +105,8 @@ class AutoLinkInjector:
         if not post:
             return {'error': 'Post not found'}
         
-        post_id = post['id']
-        content = post['content']['rendered']
+        post_id = post.id
+        content = post.content
         original_content = content
         
         injected_count = 0
@@ -165,14 +153,7 @@ class AutoLinkInjector:
         if content != original_content and injected_count > 0:
             print(f"\n🔧 Updating post with {injected_count} new links...")
             
-            update_url = f"{self.base_url}/posts/{post_id}"
-            response = requests.post(
-                update_url,
-                json={'content': content},
-                auth=self.auth,
-                timeout=REQUEST_TIMEOUT,
-            )
-            response.raise_for_status()
+            self.wp.update_post(post_id, {'content': content})
             
             print("✅ POST UPDATED SUCCESSFULLY!")
             
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: internal link graph, pairwise substring scan vs parsed hrefs.
+
+Generates a synthetic site where every post links to a few others using the
+spellings real content has (http/https, www, missing trailing slash, ?utm
+tags, #fragments, relative paths) and mentions one more post's URL in plain
+text.  Compares:
+- substring: `target_url in content` for every pair of posts (the old Step 4
+             of universal_seo_audit / rescan_orphans), O(n²·len)
+- hrefs:     link_graph.LinkGraph — hrefs parsed once per post, normalized,
+             looked up in a dict, O(total links)
+
+The substring scan is timed on --substring-posts posts and extrapolated
+quadratically to the full site; both are checked against the generated edges.
+Finally link_graph.pagerank() (internal authority) is timed on the full
+graph, pure Python and, when installed, NumPy.
+
+Usage:
+    python3 scripts/benchmarks/bench_link_graph.py --posts 20000 --links 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "..", "shared", "scripts"))
+
+import link_graph  # noqa: E402
+from link_graph import LinkGraph, pagerank  # noqa: E402
+
+SITE = "https://example.com"
+
+
+def post_url(post_id):
+    return f"{SITE}/post-{post_id}/"
+
+
+def link_spelling(rng, target):
+    """One of the ways a post links to another post's URL."""
+    return rng.choice([
+        post_url(target),
+        f"http://www.example.com/post-{target}/",
+        f"{SITE}/post-{target}",
+        f"{SITE}/post-{target}/?utm_source=related",
+        f"{SITE}/post-{target}/#section-2",
+        f"/post-{target}/",
+    ])
+
+
+def make_site(n, links, seed, paragraphs=12):
+    """({post_id: url}, {post_id: html}, {(source, target)} real edges)."""
+    rng = random.Random(seed)
+    filler = "Season the griddle, preheat evenly and keep the surface oiled. " * 8
+    urls = {pid: post_url(pid) for pid in range(1, n + 1)}
+    html = {}
+    edges = set()
+    for pid in urls:
+        targets = rng.sample(range(1, n + 1), min(links + 1, n))
+        targets = [t for t in targets if t != pid][:links]
+        body = [f"<p>{filler}</p>" for _ in range(paragraphs)]
+        for i, target in enumerate(targets):
+            body[i % paragraphs] += f'<p>See <a href="{link_spelling(rng, target)}">guide {target}</a>.</p>'
+            edges.add((pid, target))
+        mention = rng.randint(1, n)
+        body[-1] += f"<p>Bookmark {post_url(mention)} for later.</p>"  # text, not a link
+        html[pid] = "\n".join(body)
+    return urls, html, edges
+
+
+def substring_graph(urls, html, ids):
+    """Edges found by the old pairwise `url in content` scan over ids."""
+    edges = set()
+    for source in ids:
+        content = html[source]
+        for target in ids:
+            if target != source and urls[target] in content:
+                edges.add((source, target))
+    return edges
+
+
+def href_graph(urls, html, ids):
+    graph = LinkGraph({pid: urls[pid] for pid in ids}, host=SITE)
+    for pid in ids:
+        graph.add_content(pid, html[pid])
+    return {(source, target) for source, targets in graph.outbound.items() for target in targets}
+
+
+def accuracy(found, truth):
+    hits = len(found & truth)
+    return hits, len(found) - hits, len(truth) - hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=20000, help="Posts on the synthetic site")
+    parser.add_argument("--links", type=int, default=5, help="Internal links per post")
+    parser.add_argument("--substring-posts", type=int, default=1000,
+                        help="Posts to run the pairwise scan on (extrapolated to --posts)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    urls, html, truth = make_site(args.posts, args.links, args.seed)
+    sample = list(range(1, min(args.substring_posts, args.posts) + 1))
+    sample_set = set(sample)
+    sample_truth = {(s, t) for s, t in truth if s in sample_set and t in sample_set}
+
+    print(f"Synthetic site: {args.posts} posts, {len(truth)} internal links, "
+          f"{sum(len(h) for h in html.values()) / len(html) / 1024:.1f} KB/post")
+    print(f"{'method':>10} {'posts':>7} {'seconds':>9} {'correct':>7} {'false+':>7} {'missed':>7}")
+
+    started = time.perf_counter()
+    found = substring_graph(urls, html, sample)
+    sub_elapsed = time.perf_counter() - started
+    hits, false_pos, missed = accuracy(found, sample_truth)
+    print(f"{'substring':>10} {len(sample):>7} {sub_elapsed:>9.2f} {hits:>7} {false_pos:>7} {missed:>7}")
+
+    started = time.perf_counter()
+    found = href_graph(urls, html, sample)
+    elapsed = time.perf_counter() - started
+    hits, false_pos, missed = accuracy(found, sample_truth)
+    print(f"{'hrefs':>10} {len(sample):>7} {elapsed:>9.2f} {hits:>7} {false_pos:>7} {missed:>7}")
+
+    started = time.perf_counter()
+    found = href_graph(urls, html, list(urls))
+    href_elapsed = time.perf_counter() - started
+    hits, false_pos, missed = accuracy(found, truth)
+    print(f"{'hrefs':>10} {args.posts:>7} {href_elapsed:>9.2f} {hits:>7} {false_pos:>7} {missed:>7}")
+
+    projected = sub_elapsed * (args.posts / len(sample)) ** 2
+    print(f"\nSubstring scan projected to {args.posts} posts: {projected:,.0f} s "
+          f"({projected / href_elapsed:,.0f}x the href graph)")
+
+    backends = [("python", False)] + ([("numpy", True)] if link_graph.np is not None else [])
+    for name, use_numpy in backends:
+        started = time.perf_counter()
+        scores = pagerank(urls, found, use_numpy=use_numpy)
+        elapsed = time.perf_counter() - started
+        print(f"PageRank ({name}): {len(found)} edges in {elapsed:.2f} s, top authority {max(scores.values()):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: amzn.to expansion, serial vs concurrent vs warm persistent cache.
+
+Resolves a site's worth of short links against the local redirect stub:
+- serial:     one worker, one hop at a time
+- concurrent: the resolver's worker pool under the per-host cap
+- warm cache: a second audit run reading the persistent cache (no requests)
+
+Usage:
+    python3 scripts/benchmarks/bench_shortlinks.py --links 500 --latency 0.08 --hops 2
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "..", "shared", "scripts"))
+
+import shortlink_resolver  # noqa: E402
+from redirect_stub import RedirectStub  # noqa: E402
+from shortlink_resolver import ShortlinkCache, ShortlinkResolver  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--links", type=int, default=500, help="Unique short links on the site")
+    parser.add_argument("--latency", type=float, default=0.08, help="Simulated seconds per redirect")
+    parser.add_argument("--hops", type=int, default=1, help="Redirects per short link")
+    parser.add_argument("--workers", type=int, default=shortlink_resolver.RESOLVE_WORKERS,
+                        help="Resolver workers for the concurrent row")
+    parser.add_argument("--min-interval", type=float, default=0.0,
+                        help="Rate-limit gap between requests (the real default is "
+                             f"{shortlink_resolver.MIN_REQUEST_INTERVAL}s)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            RedirectStub(links=args.links, hops=args.hops, latency=args.latency) as stub:
+        print(f"Stub: {args.links} short links, {args.hops} hop(s), {args.latency * 1000:.0f} ms/redirect, "
+              f"host cap {shortlink_resolver.MAX_HOST_CONCURRENCY}")
+        print(f"{'mode':>11} {'resolved':>9} {'requests':>9} {'seconds':>8} {'links/sec':>10}")
+        modes = [
+            ("serial", os.path.join(tmp, "serial.json"), 1),
+            ("concurrent", os.path.join(tmp, "cache.json"), args.workers),
+            ("warm cache", os.path.join(tmp, "cache.json"), args.workers),
+        ]
+        baseline = None
+        for name, cache_path, workers in modes:
+            stub.reset_stats()
+            resolver = ShortlinkResolver(ShortlinkCache(cache_path), hosts=("127.0.0.1",),
+                                         workers=workers, min_interval=args.min_interval)
+            started = time.perf_counter()
+            resolved = resolver.resolve_many(stub.links)
+            resolver.save()
+            elapsed = time.perf_counter() - started
+            correct = sum(1 for short, url in resolved.items() if url == stub.links[short])
+            rate = correct / elapsed if elapsed else float("inf")
+            baseline = baseline or rate
+            print(f"{name:>11} {correct:>9} {stub.stats['requests']:>9} {elapsed:>8.2f} {rate:>10.1f}"
+                  f"   ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
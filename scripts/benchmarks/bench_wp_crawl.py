@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: paginated post crawl, sequential vs concurrent.
+
+Runs WPClient.fetch_all_posts against the local WordPress stub with a
+simulated per-request latency and reports posts/sec for each worker count.
+
+Usage:
+    python3 scripts/benchmarks/bench_wp_crawl.py --posts 2000 --latency 0.15
+"""
+
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "..", "shared", "scripts"))
+
+import wp_client  # noqa: E402
+from wp_client import WPClient  # noqa: E402
+from wp_stub import WPStub  # noqa: E402
+
+
+def run(stub, workers):
+    stub.reset_stats()
+    wp = WPClient(stub.url, "bench", "bench")
+    started = time.perf_counter()
+    posts = wp.fetch_all_posts(workers=workers)
+    elapsed = time.perf_counter() - started
+    ids = [p.id for p in posts]
+    assert ids == sorted(ids), "pages were not reassembled in order"
+    return len(posts), elapsed, stub.stats["max_in_flight"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.15, help="Simulated seconds per request")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    args = parser.parse_args()
+
+    # The stub is local; don't let the politeness floor dominate the timing.
+    wp_client.MIN_REQUEST_INTERVAL = 0.0
+    wp_client._limiters.clear()
+
+    with WPStub(posts=args.posts, latency=args.latency) as stub:
+        print(f"Stub: {args.posts} posts, {args.latency * 1000:.0f} ms/request, "
+              f"host concurrency cap {wp_client.MAX_HOST_CONCURRENCY}")
+        print(f"{'workers':>8} {'posts':>7} {'seconds':>8} {'posts/sec':>10} {'in-flight':>10}")
+        baseline = None
+        for workers in (int(w) for w in args.workers.split(",")):
+            count, elapsed, in_flight = run(stub, workers)
+            rate = count / elapsed if elapsed else 0.0
+            baseline = baseline or rate
+            print(f"{workers:>8} {count:>7} {elapsed:>8.2f} {rate:>10.0f} {in_flight:>10}"
+                  f"   ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full post objects vs per-consumer _fields projections.
+
+Fetches the same 100-post page from the local WordPress stub with each
+consumer's projection and reports bytes transferred and JSON parse time
+per 100 posts, relative to the unprojected response.
+
+Usage:
+    python3 scripts/benchmarks/bench_wp_fields.py --rounds 20
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "..", "shared", "scripts"))
+
+import wp_client  # noqa: E402
+from wp_client import (  # noqa: E402
+    AFFILIATE_FIELDS,
+    EDIT_FIELDS,
+    INVENTORY_FIELDS,
+    SEO_AUDIT_FIELDS,
+    WPClient,
+    build_query,
+)
+from wp_stub import WPStub  # noqa: E402
+
+PROFILES = (
+    ("full object", None, None),
+    ("full object (edit)", None, "edit"),
+    ("inventory", INVENTORY_FIELDS, None),
+    ("seo audit", SEO_AUDIT_FIELDS, None),
+    ("affiliate audit", AFFILIATE_FIELDS, None),
+    ("write tools (edit)", EDIT_FIELDS, "edit"),
+)
+
+
+def measure(wp, fields, context, rounds):
+    query = build_query({"per_page": 100, "page": 1}, fields, context)
+    total_bytes = 0
+    parse_seconds = 0.0
+    for _ in range(rounds):
+        response = wp.request("GET", "wp/v2/posts", params=query)
+        response.raise_for_status()
+        body = response.content
+        started = time.perf_counter()
+        json.loads(body)
+        parse_seconds += time.perf_counter() - started
+        total_bytes += len(body)
+    return total_bytes / rounds, parse_seconds / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    wp_client.MIN_REQUEST_INTERVAL = 0.0
+    with WPStub(posts=100, latency=0.0) as stub:
+        wp = WPClient(stub.url, "bench", "bench")
+        print(f"{'profile':<20} {'KB/100 posts':>13} {'parse ms':>9} {'bytes':>7} {'parse':>7}")
+        base_bytes = base_parse = None
+        for name, fields, context in PROFILES:
+            size, parse = measure(wp, fields, context, args.rounds)
+            base_bytes = base_bytes or size
+            base_parse = base_parse or parse
+            print(f"{name:<20} {size / 1024:>13.1f} {parse * 1000:>9.2f} "
+                  f"{(1 - size / base_bytes) * -100:>6.0f}% {(1 - parse / base_parse) * -100:>6.0f}%")
+
+
+if __name__ == "__main__":
+    main()
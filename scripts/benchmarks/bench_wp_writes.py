@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: multi-post writes, serial loop vs concurrent singles vs /batch/v1.
+
+Simulates a write tool working through a 30-post instruction file against
+the local WordPress stub:
+- serial:  get_post + update_post per post, one at a time (optionally with
+           the 0.5 s sleep the write tools used to have between posts)
+- singles: one include= listing, then concurrent single-post POSTs under the
+           per-host cap (the fallback when /batch/v1 is unavailable)
+- batch:   one include= listing, then /batch/v1 requests of 25 writes
+
+Usage:
+    python3 scripts/benchmarks/bench_wp_writes.py --posts 30 --latency 0.15 --write-latency 0.05
+"""
+
+import argparse
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "..", "shared", "scripts"))
+
+import wp_client  # noqa: E402
+from wp_client import EDIT_FIELDS, WPClient  # noqa: E402
+from wp_stub import WPStub  # noqa: E402
+
+
+def edit(content, run):
+    return content + f"\n<p>Updated in run {run}.</p>"
+
+
+def serial(wp, ids, run, sleep=0.0):
+    ok = 0
+    for post_id in ids:
+        post = wp.get_post(post_id, fields=EDIT_FIELDS, context="edit")
+        wp.update_post(post_id, {"content": edit(post.editable_content, run)})
+        ok += 1
+        if sleep:
+            time.sleep(sleep)
+    return ok
+
+
+def grouped(wp, ids, run, batch):
+    posts = wp.get_posts(ids, fields=EDIT_FIELDS, context="edit")
+    updates = [(pid, {"content": edit(posts[pid].editable_content, run)}) for pid in ids]
+    return sum(r.ok for r in wp.update_posts(updates, batch=batch))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--posts", type=int, default=30, help="Posts in the instruction file")
+    parser.add_argument("--latency", type=float, default=0.15, help="Simulated seconds per request")
+    parser.add_argument("--write-latency", type=float, default=0.05,
+                        help="Simulated server seconds per post saved")
+    parser.add_argument("--serial-sleep", type=float, default=0.5,
+                        help="Sleep between posts for the legacy serial row (0 to skip it)")
+    args = parser.parse_args()
+
+    # The stub is local; don't let the politeness floor dominate the timing.
+    wp_client.MIN_REQUEST_INTERVAL = 0.0
+    wp_client._limiters.clear()
+
+    ids = list(range(1, args.posts + 1))
+    modes = [("serial", lambda wp, run: serial(wp, ids, run))]
+    if args.serial_sleep:
+        modes.insert(0, (f"serial+{args.serial_sleep:g}s", lambda wp, run: serial(wp, ids, run, args.serial_sleep)))
+    modes += [
+        ("singles", lambda wp, run: grouped(wp, ids, run, batch=False)),
+        ("batch", lambda wp, run: grouped(wp, ids, run, batch=True)),
+    ]
+
+    with WPStub(posts=max(args.posts, 100), latency=args.latency, write_latency=args.write_latency) as stub:
+        print(f"Stub: {args.posts} post writes, {args.latency * 1000:.0f} ms/request, "
+              f"{args.write_latency * 1000:.0f} ms/save, host concurrency cap {wp_client.MAX_HOST_CONCURRENCY}")
+        print(f"{'mode':>12} {'written':>8} {'requests':>9} {'seconds':>8} {'posts/sec':>10}")
+        baseline = None
+        for run, (name, fn) in enumerate(modes, start=1):
+            stub.reset_stats()
+            wp = WPClient(stub.url, "bench", "bench")
+            started = time.perf_counter()
+            written = fn(wp, run)
+            elapsed = time.perf_counter() - started
+            rate = written / elapsed if elapsed else 0.0
+            baseline = baseline or rate
+            print(f"{name:>12} {written:>8} {stub.stats['requests']:>9} {elapsed:>8.2f} {rate:>10.1f}"
+                  f"   ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
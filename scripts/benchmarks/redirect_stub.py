@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Local short-link redirect stub for tests and benchmarks.
+
+Serves amzn.to-style short links: GET/HEAD /{code} answers 301 with a
+Location header, optionally through extra same-host hops (/{code}/hop/{n}),
+ending at an Amazon product URL that is tagged, untagged or wrongly tagged.
+Unknown codes get 404.  head=False answers HEAD with 405 (as some
+shorteners do), and throttle_every=N turns every Nth request into a 429 so
+retry/backoff can be exercised.  A per-request latency stands in for the
+round trip to the real shortener.
+
+Usage:
+    with RedirectStub(links=500, latency=0.05) as stub:
+        resolver = ShortlinkResolver(hosts=("127.0.0.1",))
+        resolved = resolver.resolve_many(stub.links)
+        assert resolved == stub.links
+"""
+
+import random
+import string
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TAGS = ("stub-20", "", "someone-else-20")  # tagged, untagged, wrong tag
+
+
+class RedirectStub:
+    """Threaded HTTP server answering short-link codes with redirects."""
+
+    def __init__(self, links=100, hops=1, latency=0.0, head=True, throttle_every=0, seed=7):
+        self.total_links = links
+        self.hops = max(1, hops)
+        self.latency = latency
+        self.head = head
+        self.throttle_every = throttle_every
+        self.seed = seed
+        self.links = {}    # short URL -> final destination
+        self.codes = {}    # code -> final destination
+        self.stats = {"requests": 0, "head": 0, "get": 0, "throttled": 0, "max_in_flight": 0}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.url = ""
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self, "GET")
+
+            def do_HEAD(self):
+                stub._handle(self, "HEAD")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        rng = random.Random(self.seed)
+        for i in range(self.total_links):
+            code = "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(7))
+            tag = TAGS[i % len(TAGS)]
+            destination = f"https://www.amazon.com/dp/B0{i:08d}" + (f"?tag={tag}&linkCode=ll1" if tag else "")
+            self.codes[code] = destination
+            self.links[f"{self.url}/{code}"] = destination
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"requests": 0, "head": 0, "get": 0, "throttled": 0, "max_in_flight": 0}
+
+    # ── Requests ────────────────────────────────────────────────────────
+
+    def _send(self, handler, status, location=None):
+        handler.send_response(status)
+        if location:
+            handler.send_header("Location", location)
+        handler.send_header("Content-Length", "0")
+        handler.end_headers()
+
+    def _handle(self, handler, method):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[method.lower()] += 1
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+            throttled = self.throttle_every and self.stats["requests"] % self.throttle_every == 0
+            if throttled:
+                self.stats["throttled"] += 1
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if throttled:
+                return self._send(handler, 429)
+            if method == "HEAD" and not self.head:
+                return self._send(handler, 405)
+            parts = handler.path.strip("/").split("/")
+            destination = self.codes.get(parts[0])
+            if destination is None:
+                return self._send(handler, 404)
+            hop = int(parts[2]) if len(parts) == 3 and parts[1] == "hop" else 0
+            if hop + 1 < self.hops:
+                return self._send(handler, 301, f"/{parts[0]}/hop/{hop + 1}")
+            return self._send(handler, 301, destination)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+
+if __name__ == "__main__":
+    with RedirectStub(links=20) as stub:
+        print(f"Redirect stub serving {len(stub.links)} short links at {stub.url} (Ctrl-C to stop)")
+        for short_url, destination in list(stub.links.items())[:3]:
+            print(f"  {short_url} -> {destination}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
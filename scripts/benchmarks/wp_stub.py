@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Local WordPress REST stub for benchmarks.
+
+Serves a synthetic /wp-json/wp/v2/posts collection with WordPress-shaped
+objects (rendered content, yoast_head_json, _links), the X-WP-Total /
+X-WP-TotalPages headers and ETags on listings (If-None-Match -> 304), with
+a configurable per-request latency so crawl strategies can be compared
+without touching a live site.  Writes go through POST /wp/v2/posts/{id} or
+the /batch/v1 route (disable it with batch=False to mimic WordPress < 5.6);
+write_latency adds server-side cost per post saved.  fail_next() queues
+error responses (429/5xx, optional Retry-After) for the next requests, and
+page_delays slows chosen listing pages so they complete out of order.
+
+Usage:
+    with WPStub(posts=2000, latency=0.05) as stub:
+        wp = WPClient(stub.url, "user", "pass")
+        ...
+        print(stub.stats)
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+WORDS = (
+    "griddle blackstone seasoning steel heat zone breakfast pancakes smash burger "
+    "propane flat top cast iron cleaning rust oil temperature recipe outdoor "
+    "cooking tips surface scraper spatula hibachi fried rice camp portable"
+).split()
+
+
+def _paragraph(rng, words=60):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_post(post_id, base_url, total_posts, rng):
+    """Build one synthetic WP post object (roughly 1,200 words of markup)."""
+    slug = f"post-{post_id}"
+    link = f"{base_url}/{slug}/"
+    paragraphs = []
+    for i in range(20):
+        text = _paragraph(rng)
+        if i % 4 == 1:
+            target = rng.randint(1, total_posts)
+            text += f' See <a href="{base_url}/post-{target}/">related guide {target}</a>.'
+        if i % 7 == 3:
+            text += f' <a href="https://www.amazon.com/dp/B0{post_id:07d}?tag=stub-20" rel="nofollow">Check price</a>.'
+        paragraphs.append(f"<p>{text}</p>")
+        if i % 5 == 0:
+            paragraphs.append(f"<h2>Section {i // 5 + 1}</h2>")
+    content = "\n".join(paragraphs)
+    modified = datetime(2025, 1, 1) + timedelta(hours=post_id)
+    title = f"Synthetic Post {post_id}"
+    return {
+        "id": post_id,
+        "date": (modified - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S"),
+        "date_gmt": (modified - timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%S"),
+        "modified": modified.strftime("%Y-%m-%dT%H:%M:%S"),
+        "modified_gmt": modified.strftime("%Y-%m-%dT%H:%M:%S"),
+        "slug": slug,
+        "status": "publish",
+        "type": "post",
+        "link": link,
+        "title": {"rendered": title, "raw": title},
+        "content": {"rendered": content, "raw": content, "protected": False},
+        "excerpt": {"rendered": f"<p>{_paragraph(rng, 25)}</p>", "raw": "", "protected": False},
+        "author": 1,
+        "categories": [1],
+        "tags": [],
+        "meta": {"_yoast_wpseo_metadesc": ""},
+        "yoast_head": "<meta name=\"description\" content=\"stub\" />" * 20,
+        "yoast_head_json": {
+            "title": title,
+            "description": _paragraph(rng, 20),
+            "robots": {"index": "index", "follow": "follow"},
+            "og_title": title,
+            "og_url": link,
+            "schema": {"@graph": [{"@type": "Article", "headline": title, "url": link}]},
+        },
+        "_links": {
+            "self": [{"href": f"{base_url}/wp-json/wp/v2/posts/{post_id}"}],
+            "collection": [{"href": f"{base_url}/wp-json/wp/v2/posts"}],
+            "author": [{"embeddable": True, "href": f"{base_url}/wp-json/wp/v2/users/1"}],
+            "wp:attachment": [{"href": f"{base_url}/wp-json/wp/v2/media?parent={post_id}"}],
+        },
+    }
+
+
+def in_context(post, context):
+    """Drop raw markup unless the request asked for context=edit."""
+    if context == "edit":
+        return post
+    view = {}
+    for key, value in post.items():
+        if isinstance(value, dict) and "raw" in value:
+            value = {k: v for k, v in value.items() if k != "raw"}
+        view[key] = value
+    return view
+
+
+def project(post, fields):
+    """Apply a _fields projection (supports nested "a.b" paths like WP 5.3+)."""
+    if not fields:
+        return post
+    out = {}
+    for path in (f for f in fields.split(",") if f):
+        head, _, rest = path.partition(".")
+        if head not in post:
+            continue
+        if not rest:
+            out[head] = post[head]
+        elif isinstance(post[head], dict) and rest in post[head]:
+            out.setdefault(head, {})[rest] = post[head][rest]
+    return out
+
+
+def shape(post, query):
+    return project(in_context(post, query.get("context")), query.get("_fields"))
+
+
+class WPStub:
+    """Threaded HTTP server that mimics the posts endpoints."""
+
+    def __init__(self, posts=1000, latency=0.05, seed=7, batch=True, write_latency=0.0):
+        self.total_posts = posts
+        self.latency = latency
+        self.batch = batch
+        self.write_latency = write_latency
+        self.seed = seed
+        self.page_delays = {}  # listing page -> extra seconds before answering
+        self._faults = []  # (status, headers) served to the next requests
+        self.posts = {}
+        self.stats = {"requests": 0, "bytes_sent": 0, "max_in_flight": 0, "not_modified": 0,
+                      "writes": 0, "batches": 0, "faults": 0}
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.url = ""
+
+    # ── Lifecycle ───────────────────────────────────────────────────────
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self, "GET")
+
+            def do_POST(self):
+                stub._handle(self, "POST")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        rng = random.Random(self.seed)
+        self.posts = {
+            pid: make_post(pid, self.url, self.total_posts, rng)
+            for pid in range(1, self.total_posts + 1)
+        }
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {"requests": 0, "bytes_sent": 0, "max_in_flight": 0, "not_modified": 0,
+                          "writes": 0, "batches": 0, "faults": 0}
+
+    def fail_next(self, status, count=1, retry_after=None):
+        """Answer the next `count` requests with `status` (e.g. 429 or 503)."""
+        headers = {"Retry-After": retry_after} if retry_after is not None else {}
+        with self._lock:
+            self._faults.extend([(status, headers)] * count)
+
+    def touch(self, post_id, when=None):
+        """Bump a post's modified timestamps (as WordPress does on save)."""
+        stamp = (when or datetime.utcnow()).strftime("%Y-%m-%dT%H:%M:%S")
+        self.posts[post_id]["modified"] = stamp
+        self.posts[post_id]["modified_gmt"] = stamp
+
+    # ── Request handling ────────────────────────────────────────────────
+
+    def _send(self, handler, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, str(value))
+        handler.end_headers()
+        handler.wfile.write(data)
+        with self._lock:
+            self.stats["bytes_sent"] += len(data)
+
+    def _handle(self, handler, method):
+        with self._lock:
+            self.stats["requests"] += 1
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            with self._lock:
+                fault = self._faults.pop(0) if self._faults else None
+                self.stats["faults"] += bool(fault)
+            if fault:
+                status, headers = fault
+                return self._send(handler, status, {"code": "stub_fault", "message": f"HTTP {status}"}, headers)
+            parsed = urlparse(handler.path)
+            query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            path = parsed.path.rstrip("/")
+
+            single = re.fullmatch(r"/wp-json/wp/v2/posts/(\d+)", path)
+            if single:
+                return self._single(handler, method, int(single.group(1)), query)
+            if path == "/wp-json/wp/v2/posts" and method == "GET":
+                return self._collection(handler, query)
+            if path == "/wp-json/batch/v1" and method == "POST" and self.batch:
+                return self._batch(handler)
+            self._send(handler, 404, {"code": "rest_no_route"})
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _collection(self, handler, query):
+        per_page = min(100, int(query.get("per_page", 10)))
+        page = int(query.get("page", 1))
+        if self.page_delays.get(page):
+            time.sleep(self.page_delays[page])
+        rows = sorted(self.posts.values(), key=lambda p: p["id"])
+        if query.get("orderby") == "modified":
+            rows.sort(key=lambda p: (p["modified_gmt"], p["id"]), reverse=query.get("order") == "desc")
+        if query.get("modified_after"):
+            rows = [p for p in rows if p["modified"] > query["modified_after"]]
+        if query.get("include"):
+            ids = {int(i) for i in query["include"].split(",") if i}
+            rows = [p for p in rows if p["id"] in ids]
+        if query.get("slug"):
+            slugs = set(query["slug"].split(","))
+            rows = [p for p in rows if p["slug"] in slugs]
+        total = len(rows)
+        total_pages = max(1, math.ceil(total / per_page))
+        if page > total_pages:
+            return self._send(handler, 400, {"code": "rest_post_invalid_page_number"})
+        window = rows[(page - 1) * per_page: page * per_page]
+        body = [shape(p, query) for p in window]
+        headers = {"X-WP-Total": total, "X-WP-TotalPages": total_pages}
+        etag = '"%s"' % hashlib.sha1(json.dumps(body).encode("utf-8")).hexdigest()
+        if handler.headers.get("If-None-Match") == etag:
+            with self._lock:
+                self.stats["not_modified"] += 1
+            handler.send_response(304)
+            handler.send_header("ETag", etag)
+            handler.end_headers()
+            return
+        headers["ETag"] = etag
+        self._send(handler, 200, body, headers)
+
+    def _write(self, post_id, payload):
+        """Apply one post update; returns the saved post or None."""
+        post = self.posts.get(post_id)
+        if post is None:
+            return None
+        if self.write_latency:
+            time.sleep(self.write_latency)
+        if "content" in payload:
+            post["content"] = {"rendered": payload["content"], "raw": payload["content"], "protected": False}
+        if "title" in payload:
+            post["title"] = {"rendered": payload["title"], "raw": payload["title"]}
+        if "excerpt" in payload:
+            post["excerpt"] = {"rendered": f"<p>{payload['excerpt']}</p>", "raw": payload["excerpt"],
+                               "protected": False}
+        if isinstance(payload.get("meta"), dict):
+            post.setdefault("meta", {}).update(payload["meta"])
+        self.touch(post_id)
+        return post
+
+    def _read_json(self, handler):
+        length = int(handler.headers.get("Content-Length") or 0)
+        return json.loads(handler.rfile.read(length) or b"{}")
+
+    def _single(self, handler, method, post_id, query):
+        post = self.posts.get(post_id)
+        if post is None:
+            return self._send(handler, 404, {"code": "rest_post_invalid_id", "message": "Invalid post ID."})
+        if method == "POST":
+            with self._lock:
+                self.stats["writes"] += 1
+            post = self._write(post_id, self._read_json(handler))
+        self._send(handler, 200, shape(post, query))
+
+    def _batch(self, handler):
+        payload = self._read_json(handler)
+        requests_ = payload.get("requests", [])
+        if len(requests_) > 25:
+            return self._send(handler, 400, {"code": "rest_batch_too_many_requests",
+                                             "message": "Too many requests."})
+        responses = []
+        for item in requests_:
+            match = re.fullmatch(r"/wp/v2/posts/(\d+)", item.get("path", "").rstrip("/"))
+            post = self._write(int(match.group(1)), item.get("body") or {}) if match else None
+            if post is None:
+                responses.append({"body": {"code": "rest_post_invalid_id", "message": "Invalid post ID.",
+                                           "data": {"status": 404}}, "status": 404, "headers": {}})
+            else:
+                responses.append({"body": in_context(post, "view"), "status": 200, "headers": {}})
+        with self._lock:
+            self.stats["writes"] += len(requests_)
+            self.stats["batches"] += 1
+        self._send(handler, 207, {"responses": responses})
+
+if __name__ == "__main__":
+    with WPStub(posts=250, latency=0.0) as stub:
+        print(f"WordPress stub serving 250 posts at {stub.url} (Ctrl-C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -5,65 +5,47 @@ Analyzes high-authority posts and injects contextual links to orphaned content.
 """
 
 import os
+import sys
 import json
-import requests
-from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared', 'scripts'))
+from content_cache import site_slug
+from wp_client import WPClient, WPPost
+
 load_dotenv()
 
-WP_URL = os.getenv('WP_URL').rstrip('/')
-WP_USERNAME = os.getenv('WP_USERNAME')
-WP_APP_PASS = os.getenv('WP_APP_PASS')
 REQUEST_TIMEOUT = int(os.getenv('HTTP_TIMEOUT_SECONDS', '30'))
 
 class OrphanRescue:
     def __init__(self):
-        self.base_url = f"{WP_URL}/wp-json/wp/v2"
-        self.auth = HTTPBasicAuth(WP_USERNAME, WP_APP_PASS)
+        # Same SITE_PREFIX for the client and the audit results
+        self.wp = WPClient.from_env(timeout=REQUEST_TIMEOUT)
         self.root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-        # Load orphan and authority data from robust candidate paths.
-        candidates = [
-            os.path.join(self.root_dir, "seo_kickstart_results.json"),
-            os.path.join(self.root_dir, "data", "seo_kickstart_results.json"),
-        ]
-        data = None
-        used_path = None
-        for path in candidates:
-            if os.path.exists(path):
-                with open(path, "r") as f:
-                    data = json.load(f)
-                used_path = path
-                break
-
-        if not data:
-            raise FileNotFoundError(
-                "Could not find seo_kickstart_results.json in expected locations: "
-                + ", ".join(candidates)
-            )
+        # Orphans and authorities from this site's latest seo_audit run
+        self.results_path = os.path.join(self.root_dir, "data", f"seo_audit_{site_slug()}.json")
+        data = {}
+        if os.path.exists(self.results_path):
+            with open(self.results_path, "r") as f:
+                data = json.load(f)
+            print(f"Loaded SEO snapshot from: {self.results_path} ({data.get('generated_at', 'unknown time')})")
 
         self.orphans = data.get('orphaned_posts', [])
         self.authorities = data.get('high_authority_posts', [])
-        print(f"Loaded SEO snapshot from: {used_path}")
     
     def fetch_full_post(self, url):
         """Fetch complete post data including full content."""
         slug = url.rstrip('/').split('/')[-1]
-        api_url = f"{self.base_url}/posts?slug={slug}&_fields=id,title,content,link,slug"
-        
-        response = requests.get(api_url, auth=self.auth, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        posts = response.json()
-        
-        return posts[0] if posts else None
+        posts = self.wp.get_json('wp/v2/posts', params={'slug': slug, '_fields': 'id,title,content,link,slug'})
+        return WPPost.from_api(posts[0]) if posts else None
     
     def find_link_opportunities(self, authority_post, orphans_subset):
         """
         Analyze authority post content and match with relevant orphans.
         Returns list of injection opportunities.
         """
-        content = authority_post['content']['rendered']
+        content = authority_post.content
         opportunities = []
         
         # Keyword matching logic
@@ -110,7 +92,7 @@ class OrphanRescue:
         if not authority:
             return {'error': 'Authority post not found'}
         
-        print(f"✅ Loaded: {authority['title']['rendered']}")
+        print(f"✅ Loaded: {authority.title}")
         
         # Find opportunities (limit to first 10 orphans for efficiency)
         opportunities = self.find_link_opportunities(
@@ -148,7 +130,7 @@ class OrphanRescue:
         
         return {
             'success': True,
-            'authority_post': authority['title']['rendered'],
+            'authority_post': authority.title,
             'opportunities': opportunities,
             'action_required': 'manual_insertion'
         }
@@ -159,7 +141,7 @@ def main():
     if not rescue.authorities:
         result = {
             "success": False,
-            "message": "No high_authority_posts available in seo_kickstart_results.json",
+            "message": f"No high_authority_posts in {os.path.basename(rescue.results_path)}",
             "action_required": "run_seo_audit_first",
         }
         print(json.dumps(result, indent=2))
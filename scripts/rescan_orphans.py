@@ -5,47 +5,50 @@ Generates fresh data for continued link injection campaign.
 """
 
 import os
+import sys
 import json
 import requests
-from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared', 'scripts'))
+from content_cache import ContentCache, load_posts, site_slug
+from link_graph import LinkGraph
+from wp_client import WPClient
+
 load_dotenv()
 
-WP_URL = os.getenv('WP_URL').rstrip('/')
-WP_USERNAME = os.getenv('WP_USERNAME')
-WP_APP_PASS = os.getenv('WP_APP_PASS')
 REQUEST_TIMEOUT = int(os.getenv('HTTP_TIMEOUT_SECONDS', '30'))
+AUTHORITY_THRESHOLD = 1.0  # PageRank scaled to a site mean of 1.0
 
 class OrphanScanner:
     def __init__(self):
-        self.base_url = f"{WP_URL}/wp-json/wp/v2"
-        self.auth = HTTPBasicAuth(WP_USERNAME, WP_APP_PASS)
+        # Same SITE_PREFIX for the client and the cache, so both refer to one site
+        self.wp = WPClient.from_env(timeout=REQUEST_TIMEOUT)
+        self.cache = ContentCache(site_slug())
         self.posts = []
         self.link_graph = {}
     
     def fetch_all_posts(self):
-        """Fetch all published posts."""
+        """Load all published posts (content cache first, then WordPress)."""
+        try:
+            cached = load_posts(self.cache, self.wp)
+        except requests.RequestException as e:
+            print(f"   Content cache refresh failed: {e}")
+            cached = None
+        if cached is not None:
+            self.posts = cached
+            print(f"✅ Total posts: {len(self.posts)} (from content cache)")
+            return self.posts
+
         print("🔍 Fetching all posts from WordPress...")
-        page = 1
-        per_page = 100
-        
-        while True:
-            api_url = f"{self.base_url}/posts?per_page={per_page}&page={page}&status=publish"
-            response = requests.get(api_url, auth=self.auth, timeout=REQUEST_TIMEOUT)
-            
-            if response.status_code != 200:
-                break
-            
-            batch = response.json()
-            if not batch:
-                break
-            
-            self.posts.extend(batch)
-            print(f"   Loaded {len(self.posts)} posts...")
-            page += 1
-        
+        try:
+            for _, _, batch in self.wp.iter_post_pages({'status': 'publish'}):
+                self.posts.extend(batch)
+                print(f"   Loaded {len(self.posts)} posts...")
+        except requests.RequestException as e:
+            print(f"   Fetch stopped: {e}")
+
         print(f"✅ Total posts: {len(self.posts)}")
         return self.posts
     
@@ -55,31 +58,36 @@ class OrphanScanner:
         
         # Initialize graph
         for post in self.posts:
-            post_url = post['link']
+            post_url = post.link
             self.link_graph[post_url] = {
-                'id': post['id'],
-                'title': post['title']['rendered'],
+                'id': post.id,
+                'title': post.title,
                 'url': post_url,
                 'inbound_links': [],
-                'outbound_links': []
+                'outbound_links': [],
+                'authority': 0.0
             }
         
-        # Count links
+        # Count links: parse each post's hrefs once, resolve through a URL -> id map
+        graph = LinkGraph({post.id: post.link for post in self.posts}, host=self.wp.base_url or None)
         for post in self.posts:
-            content = post['content']['rendered']
-            post_url = post['link']
-            
-            # Find all internal links in content
-            for other_url, data in self.link_graph.items():
-                if other_url != post_url and other_url in content:
-                    # This post links to other_url
-                    self.link_graph[post_url]['outbound_links'].append(other_url)
-                    self.link_graph[other_url]['inbound_links'].append(post_url)
+            graph.add_content(post.id, post.content)
+        
+        for source_id, target_ids in graph.outbound.items():
+            source_url = graph.urls[source_id]
+            for target_id in sorted(target_ids):
+                target_url = graph.urls[target_id]
+                self.link_graph[source_url]['outbound_links'].append(target_url)
+                self.link_graph[target_url]['inbound_links'].append(source_url)
+        
+        # Internal authority: PageRank over the same edges (site mean = 1.0)
+        for post_id, score in graph.pagerank().items():
+            self.link_graph[graph.urls[post_id]]['authority'] = round(score, 4)
         
         print("✅ Link graph complete")
     
     def identify_orphans_and_authorities(self):
-        """Identify orphan posts (0 inbound) and high-authority posts (many inbound)."""
+        """Identify orphan posts (0 inbound) and high-authority posts (above-average PageRank)."""
         orphans = []
         authorities = []
         
@@ -95,17 +103,18 @@ class OrphanScanner:
                     'outbound_links': outbound_count
                 })
             
-            if inbound_count >= 3:  # High-authority threshold
+            if data['authority'] > AUTHORITY_THRESHOLD:
                 authorities.append({
                     'url': url,
                     'title': data['title'],
                     'id': data['id'],
+                    'authority': data['authority'],
                     'inbound_links': inbound_count,
                     'outbound_links': outbound_count
                 })
         
-        # Sort authorities by inbound link count
-        authorities = sorted(authorities, key=lambda x: x['inbound_links'], reverse=True)
+        # Best link-injection sources first
+        authorities = sorted(authorities, key=lambda x: x['authority'], reverse=True)
         
         return orphans, authorities
     
@@ -143,7 +152,7 @@ def main():
     print(f"📊 ORPHAN ANALYSIS")
     print("=" * 80)
     print(f"🚨 Orphans (0 inbound links): {len(orphans)}")
-    print(f"⭐ High-Authority Posts (3+ inbound): {len(authorities)}")
+    print(f"⭐ High-Authority Posts (above-average PageRank): {len(authorities)}")
     
     # Show top 5 orphans and top 10 authorities
     print(f"\n🚨 Top 10 Orphans:")
@@ -152,7 +161,7 @@ def main():
     
     print(f"\n⭐ Top 10 Authority Posts:")
     for i, auth in enumerate(authorities[:10], 1):
-        print(f"  {i}. {auth['title']} ({auth['inbound_links']} inbound)")
+        print(f"  {i}. {auth['title']} (authority {auth['authority']:.2f}, {auth['inbound_links']} inbound)")
     
     # Step 4: Save results
     scanner.save_results(orphans, authorities)
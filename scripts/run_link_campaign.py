@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Run a declarative internal-link campaign.
+
+A campaign file (JSON, or YAML when PyYAML is installed) lists source posts
+by slug and the links to inject into each:
+
+    {
+        "name": "griddleking-orphan-rescue",
+        "sources": [
+            {
+                "slug": "best-outdoor-griddle",
+                "links": [
+                    {"target_url": "https://site.com/orphan/", "anchor_text": "built-in griddle",
+                     "context_hint": "optional phrase around the anchor"}
+                ]
+            }
+        ]
+    }
+
+Slugs are resolved and their raw markup fetched in bulk slug= listings (100
+per request, run concurrently); links are applied with link_injector, the
+same engine inject_internal_links uses; writes go through
+WPClient.update_posts in chunks of --chunk posts with --workers concurrent
+requests.  After each chunk its changelog entries, content cache
+invalidations and inventory delta are committed, then the per-source
+outcome is saved to
+    state/link_campaign_{name}_{slug}.json
+
+so an interrupted campaign resumes where it stopped (--restart ignores it)
+and every source marked done already has its links in the inventory.
+--dry-run prints a diff per post and writes nothing.
+
+Usage:
+    SITE_PREFIX=WP_GRIDDLEKING python3 scripts/run_link_campaign.py scripts/campaigns/griddleking_orphan_rescue.json [--dry-run]
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared', 'scripts'))
+from changelog import Changelog
+from content_cache import ContentCache, site_slug
+from inventory_store import InventoryDelta
+from link_injector import Injection, inject_links
+from tool_protocol import ProgressReporter, emit_result
+from wp_client import EDIT_FIELDS, MAX_HOST_CONCURRENCY, WPClient
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+load_dotenv()
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+STATE_DIR = os.path.join(ROOT_DIR, 'state')
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+REQUEST_TIMEOUT = int(os.getenv('HTTP_TIMEOUT_SECONDS', '30'))
+
+SLUG = site_slug()
+CHANGELOG_PATH = os.path.join(DATA_DIR, f"link_inject_changelog_{SLUG}.jsonl")
+WRITE_CHUNK = 25
+DONE_STATUSES = {"ok", "no_change"}
+
+
+def load_campaign(path):
+    """Parse a campaign file into (name, {source slug: [link dicts]})."""
+    with open(path, 'r') as f:
+        if path.endswith(('.yaml', '.yml')):
+            if yaml is None:
+                raise SystemExit("PyYAML is not installed; use a JSON campaign file.")
+            campaign = yaml.safe_load(f)
+        else:
+            campaign = json.load(f)
+
+    name = campaign.get('name') or os.path.splitext(os.path.basename(path))[0]
+    sources = {}
+    for source in campaign.get('sources', []):
+        slug = (source.get('slug') or '').strip('/').split('/')[-1]
+        if slug:
+            sources.setdefault(slug, []).extend(source.get('links', []))
+    return name, sources
+
+
+def progress_path(name):
+    safe = re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+    return os.path.join(STATE_DIR, f"link_campaign_{safe}_{SLUG}.json")
+
+
+def load_progress(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('sources', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def save_progress(path, name, sources):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'campaign': name, 'updated_at': datetime.now().isoformat(), 'sources': sources}, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def apply_links(post, links):
+    """(new_content, per-link results) for one source post."""
+    requested = [
+        Injection(link.get('target_url', ''), link.get('anchor_text', ''), link.get('context_hint', ''))
+        for link in links
+    ]
+    content, outcomes = inject_links(post.editable_content, requested, base_url=post.link)
+    items = [{
+        'target_url': o.target_url,
+        'anchor_text': o.anchor_text,
+        'status': 'injected' if o.applied else 'skipped',
+        **({'linked_text': o.linked_text} if o.applied else {'reason': o.reason}),
+    } for o in outcomes]
+    return content, items
+
+
+def print_diff(slug, before, after):
+    print(f"\n--- {slug}")
+    diff = difflib.unified_diff(before.splitlines(), after.splitlines(), lineterm='', n=0)
+    for line in list(diff)[2:]:
+        print(f"  {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inject the links listed in a campaign file.")
+    parser.add_argument('campaign', help="Campaign file (.json, or .yaml/.yml with PyYAML)")
+    parser.add_argument('--dry-run', action='store_true', help="Print diffs without writing")
+    parser.add_argument('--restart', action='store_true', help="Ignore saved progress and run every source")
+    parser.add_argument('--workers', type=int, default=MAX_HOST_CONCURRENCY, help="Concurrent write requests")
+    parser.add_argument('--chunk', type=int, default=WRITE_CHUNK, help="Posts written between progress saves")
+    args = parser.parse_args()
+
+    wp = WPClient.from_env(timeout=REQUEST_TIMEOUT)
+    if not wp.base_url:
+        print("WordPress credentials missing.")
+        sys.exit(1)
+
+    name, sources = load_campaign(args.campaign)
+    state_path = progress_path(name)
+    progress = {} if args.restart else load_progress(state_path)
+    pending = [slug for slug in sources if progress.get(slug, {}).get('status') not in DONE_STATUSES]
+    print(f"Campaign {name}: {len(sources)} sources, {len(sources) - len(pending)} already done")
+
+    posts = wp.get_posts_by_slugs(pending, fields=EDIT_FIELDS, context='edit')
+    print(f"Resolved {len(posts)}/{len(pending)} slugs ({wp.requests_made} requests)")
+
+    edits = []  # (slug, post, new content, items)
+    for slug in pending:
+        post = posts.get(slug)
+        if post is None:
+            progress[slug] = {'status': 'not_found', 'links': []}
+            continue
+        content, items = apply_links(post, sources[slug])
+        if content == post.editable_content:
+            progress[slug] = {'status': 'no_change', 'post_id': post.id, 'links': items}
+            continue
+        edits.append((slug, post, content, items))
+        if args.dry_run:
+            print_diff(slug, post.editable_content, content)
+
+    if not args.dry_run:
+        changelog = Changelog(CHANGELOG_PATH)
+        content_cache = ContentCache(SLUG)
+        inventory_delta = InventoryDelta()
+        reporter = ProgressReporter('write_posts', unit='posts')
+        for start in range(0, len(edits), max(1, args.chunk)):
+            chunk = edits[start:start + max(1, args.chunk)]
+            written = {r.post_id: r for r in wp.update_posts(
+                [(post.id, {'content': content}) for _, post, content, _ in chunk], workers=args.workers)}
+            for slug, post, _, items in chunk:
+                outcome = written[post.id]
+                if not outcome.ok:
+                    progress[slug] = {'status': 'error', 'post_id': post.id, 'error': outcome.error[:200], 'links': items}
+                    print(f"  {slug} FAILED: {outcome.error}")
+                    continue
+                content_cache.invalidate(post.id)
+                now = datetime.now().isoformat()
+                for item in items:
+                    if item['status'] != 'injected':
+                        continue
+                    changelog.append({
+                        'source_post_id': post.id,
+                        'source_url': post.link,
+                        'target_url': item['target_url'],
+                        'anchor_text': item['linked_text'],
+                        'campaign': name,
+                        'at': now,
+                    })
+                    inventory_delta.increment(post.id, 'internal_links_out', 1)
+                    inventory_delta.add_link(post.id, item['target_url'])
+                inventory_delta.set(post.id, last_audited_at=now)
+                progress[slug] = {'status': 'ok', 'post_id': post.id, 'links': items}
+            # Record the chunk everywhere before marking its sources done
+            changelog.commit()
+            content_cache.save()
+            inventory_delta.commit(SLUG)
+            save_progress(state_path, name, progress)
+            reporter.update(start + len(chunk), total=len(edits))
+        reporter.finish(len(edits))
+        save_progress(state_path, name, progress)
+
+    run = {slug: progress[slug] for slug in pending if slug in progress}
+    if args.dry_run:
+        for slug, _, _, items in edits:
+            run[slug] = {'status': 'would_update', 'links': items}
+    link_items = [item for entry in run.values() for item in entry.get('links', [])]
+    statuses = [entry['status'] for entry in run.values()]
+    output = {
+        'success': 'error' not in statuses,
+        'campaign': name,
+        'dry_run': args.dry_run,
+        'sources': len(sources),
+        'already_done': len(sources) - len(pending),
+        'updated': statuses.count('would_update' if args.dry_run else 'ok'),
+        'unchanged': statuses.count('no_change'),
+        'not_found': statuses.count('not_found'),
+        'failed': statuses.count('error'),
+        'links_injected': sum(1 for item in link_items if item['status'] == 'injected'),
+        'links_skipped': sum(1 for item in link_items if item['status'] == 'skipped'),
+        'progress_file': None if args.dry_run else os.path.basename(state_path),
+        'details': run,
+    }
+    print(f"\nCampaign {name}: {output['updated']} posts updated, {output['links_injected']} links injected, "
+          f"{output['links_skipped']} skipped, {output['not_found']} not found, {output['failed']} failed")
+    emit_result(output)
+    print(json.dumps({k: v for k, v in output.items() if k != 'details'}))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'benchmarks'))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+import build_site_inventory
+import wp_client
+from inventory_store import Inventory
+from wp_stub import WPStub
+
+
+def configure(monkeypatch, stub, state_dir):
+    monkeypatch.setattr(wp_client, "MIN_REQUEST_INTERVAL", 0.0)
+    for name, value in (("WP_URL", stub.url), ("WP_USERNAME", "user"), ("WP_APP_PASS", "pass"),
+                        ("SLUG", "stub"), ("STATE_DIR", str(state_dir)),
+                        ("INVENTORY_PATH", str(state_dir / "inventory_stub.json"))):
+        monkeypatch.setattr(build_site_inventory, name, value)
+
+
+def sync(stub):
+    stub.reset_stats()
+    build_site_inventory.main()
+    with Inventory.open("stub", build_site_inventory.STATE_DIR) as inv:
+        return inv.get_meta()["last_run"], {int(pid) for pid in inv.all_posts()}
+
+
+def test_incremental_sync_fetches_changes_and_drops_deleted_posts(tmp_path, monkeypatch):
+    with WPStub(posts=120, latency=0) as stub:
+        configure(monkeypatch, stub, tmp_path)
+        run, ids = sync(stub)
+        assert run["mode"] == "full" and run["fetched"] == 120
+        assert ids == set(range(1, 121))
+
+        # Nothing changed: the cursor window only returns the newest post,
+        # which is already synced at the same (modified_gmt, id)
+        run, _ = sync(stub)
+        assert run["mode"] == "incremental" and run["fetched"] == 0 and run["removed"] == 0
+
+        for key in ("raw", "rendered"):
+            stub.posts[5]["content"][key] += "<p>One more paragraph.</p>"
+        stub.touch(5, datetime(2026, 1, 1))
+        stub.touch(9, datetime(2026, 1, 1))  # same second as 5: the tie-break on id keeps both
+        del stub.posts[40]
+        run, ids = sync(stub)
+        assert run["mode"] == "incremental"
+        assert (run["fetched"], run["reparsed"], run["removed"]) == (2, 1, 1)  # 9's body is unchanged
+        assert ids == set(range(1, 121)) - {40}
+        with Inventory.open("stub", str(tmp_path)) as inv:
+            assert inv.get(9)["last_modified_gmt"] == "2026-01-01T00:00:00"
+            assert inv.get_meta()["sync_cursor"]["id"] == 9
+
+        stub.touch(7, datetime(2026, 1, 1))  # lands behind the cursor's id, same second
+        run, _ = sync(stub)
+        assert run["fetched"] == 1
+
+
+def test_full_reconcile_when_cadence_is_due(tmp_path, monkeypatch):
+    with WPStub(posts=30, latency=0) as stub:
+        configure(monkeypatch, stub, tmp_path)
+        sync(stub)
+        monkeypatch.setattr(build_site_inventory, "FULL_RECONCILE_HOURS", 24)
+        run, _ = sync(stub)
+        assert run["mode"] == "incremental"
+
+        with Inventory.open("stub", str(tmp_path)) as inv:
+            inv.set_meta({"last_full_crawl": (datetime.now() - timedelta(hours=25)).isoformat()},
+                         replace=False)
+        run, ids = sync(stub)
+        assert run["mode"] == "full"
+        # Unchanged listing pages come back 304 and carry their entries over
+        assert run["fetched"] == 0 and run["not_modified_pages"] == 1
+        assert ids == set(range(1, 31))
+        with Inventory.open("stub", str(tmp_path)) as inv:
+            assert datetime.fromisoformat(inv.get_meta()["last_full_crawl"]) > datetime.now() - timedelta(hours=1)
+
+
+if __name__ == "__main__":
+    import pytest
+    sys.exit(pytest.main([__file__, "-q"]))
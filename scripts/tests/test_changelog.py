@@ -0,0 +1,85 @@
+import gzip
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from changelog import Changelog
+
+
+def write_entries(log, start, count):
+    for i in range(start, start + count):
+        log.append({"n": i, "at": datetime.now().isoformat()})
+    return log.commit()
+
+
+def test_entries_buffer_until_commit(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    with Changelog(path) as log:
+        log.append({"n": 0})
+        assert len(log) == 1 and not os.path.exists(path)
+    assert Changelog(path).tail(5) == [{"n": 0}]
+
+
+def test_size_rotation_and_tail_across_archives(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    log = Changelog(path, max_bytes=200, keep=100)
+    for batch in range(8):
+        assert write_entries(log, batch * 5, 5) == 5
+    archives = log.archives()
+    assert len(archives) >= 3
+    assert all(a.endswith(".jsonl.gz") for a in archives)
+    with gzip.open(archives[-1], "rt") as f:
+        assert json.loads(f.readline())["n"] == 0  # oldest archive holds the first entries
+
+    assert [e["n"] for e in log.tail(12)] == list(range(39, 27, -1))
+    assert [e["n"] for e in log.iter_reverse()] == list(range(39, -1, -1))
+
+
+def test_keep_prunes_oldest_archives(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    log = Changelog(path, max_bytes=1, keep=2)
+    for batch in range(6):
+        write_entries(log, batch * 2, 2)
+    assert len(log.archives()) == 2
+    # Live file plus the two newest archives: the last three batches, in order
+    assert [e["n"] for e in log.iter_reverse()] == [11, 10, 9, 8, 7, 6]
+
+
+def test_age_rotation(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    with open(path, "w") as f:
+        f.write(json.dumps({"n": 0, "at": (datetime.now() - timedelta(days=40)).isoformat()}) + "\n")
+    log = Changelog(path, max_age_days=30)
+    write_entries(log, 1, 1)
+    assert len(log.archives()) == 1
+    with open(path) as f:
+        assert [json.loads(line)["n"] for line in f] == [1]
+    assert [e["n"] for e in log.tail(5)] == [1, 0]
+
+
+def test_legacy_json_list_is_migrated_once(tmp_path):
+    path = str(tmp_path / "meta_changelog_x.jsonl")
+    legacy = tmp_path / "meta_changelog_x.json"
+    legacy.write_text(json.dumps([{"n": 2}, {"n": 1}, {"n": 0}]))  # newest first
+    log = Changelog(path)
+    assert not legacy.exists() and (tmp_path / "meta_changelog_x.json.migrated").exists()
+    assert log.tail(10) == [{"n": 2}, {"n": 1}, {"n": 0}]
+    with open(path) as f:
+        assert [json.loads(line)["n"] for line in f] == [0, 1, 2]  # appended oldest first
+
+    legacy.write_text(json.dumps([{"n": 99}]))
+    assert Changelog(path).tail(10) == [{"n": 2}, {"n": 1}, {"n": 0}]  # live file exists: no re-import
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            with tempfile.TemporaryDirectory() as tmp:
+                fn(Path(tmp))
+            print(f"{name}: ok")
@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from content_cache import ContentCache
+from wp_client import WPPost
+
+
+def post(pid, content="<p>body</p>"):
+    return WPPost(id=pid, link=f"https://site.com/p{pid}/", title=f"Post {pid}", content=content)
+
+
+def test_round_trip_and_superseded_bodies_removed():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ContentCache("t", state_dir=tmp)
+        assert cache.put(post(1))
+        assert not cache.put(post(1))  # same hash: no new body
+        cache.save(complete=True)
+        assert cache.put(post(1, "<p>edited</p>"))
+        cache.save()
+        reopened = ContentCache("t", state_dir=tmp)
+        assert reopened.is_warm()
+        assert reopened.get(1).content == "<p>edited</p>"
+        assert len(os.listdir(reopened.bodies_dir)) == 1
+
+
+def test_concurrent_saves_merge_instead_of_overwriting():
+    with tempfile.TemporaryDirectory() as tmp:
+        seed = ContentCache("t", state_dir=tmp)
+        for pid in (1, 2, 3):
+            seed.put(post(pid))
+        seed.save(complete=True)
+
+        writer, reader = ContentCache("t", state_dir=tmp), ContentCache("t", state_dir=tmp)
+        assert writer.ids() == reader.ids() == {1, 2, 3}  # both load the index
+        writer.invalidate(2)
+        reader.put(post(4))
+        reader.remove(3)
+        writer.save()
+        reader.save()  # its stale copy must not drop the invalidation
+
+        merged = ContentCache("t", state_dir=tmp)
+        assert merged.ids() == {1, 2, 4}
+        assert merged.stale_ids() == [2]
+        assert merged.is_warm()
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
@@ -0,0 +1,29 @@
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from fix_affiliate_links import set_query_param
+
+
+def test_retag_leaves_other_query_segments_untouched():
+    url = "https://www.amazon.com/s?keywords=cast%20iron&tag=old-20&ref=a,b#reviews"
+    assert set_query_param(url, "tag", "new-20") == \
+        "https://www.amazon.com/s?keywords=cast%20iron&tag=new-20&ref=a,b#reviews"
+    assert set_query_param("https://www.amazon.com/dp/B01?th=1&psc=", "tag", "new-20") == \
+        "https://www.amazon.com/dp/B01?th=1&psc=&tag=new-20"
+    assert set_query_param("https://www.amazon.com/dp/B01", "tag", "new-20") == \
+        "https://www.amazon.com/dp/B01?tag=new-20"
+
+
+def test_duplicate_tags_collapse_to_the_first():
+    url = "https://www.amazon.com/dp/B01?tag=a-20&x=1+2&%74ag=b-20"
+    assert set_query_param(url, "tag", "new-20") == "https://www.amazon.com/dp/B01?tag=new-20&x=1+2"
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from inventory_store import Inventory, InventoryDelta
+
+SITE = "https://site.com"
+
+
+def entry(pid, **fields):
+    return {"post_id": pid, "url": f"{SITE}/p{pid}/", "title": f"Post {pid}", "word_count": 800, **fields}
+
+
+def seed(inv, count=3):
+    for pid in range(1, count + 1):
+        inv.upsert(entry(pid))
+
+
+def test_link_graph_maintained_incrementally():
+    with tempfile.TemporaryDirectory() as tmp, Inventory.open("t", tmp) as inv:
+        seed(inv)
+        inv.set_links(1, internal=["site.com/p2", "site.com/p2", "site.com/gone-post"], amazon=["https://amzn.to/x"])
+        inv.add_link(3, f"{SITE}/p2/")
+        assert inv.get(2)["internal_links_in"] == 2
+        assert [e["post_id"] for e in inv.orphans()] == [1, 3]
+        assert inv.dead_links() == [(1, "site.com/gone-post")]
+
+        inv.remove_link(3, "site.com/p2")
+        assert inv.get(2)["internal_links_in"] == 1
+        # A post published at the dead URL picks up its inbound link
+        inv.upsert(entry(4, url=f"{SITE}/gone-post/"))
+        assert inv.get(4)["internal_links_in"] == 1 and inv.dead_links() == []
+        inv.delete(1)
+        assert inv.get(2)["internal_links_in"] == 0 and inv.get(4)["internal_links_in"] == 0
+
+
+def test_upsert_never_overwrites_graph_columns():
+    with tempfile.TemporaryDirectory() as tmp, Inventory.open("t", tmp) as inv:
+        seed(inv, 2)
+        inv.set_links(1, internal=["site.com/p2"])
+        inv.upsert(entry(2, internal_links_in=0, authority=9.0, word_count=120))
+        row = inv.get(2)
+        assert row["internal_links_in"] == 1 and row["word_count"] == 120
+        assert [e["post_id"] for e in inv.short_posts()] == [2]
+        scores = inv.update_authority()
+        assert scores[2] > scores[1]
+        assert inv.authorities(1)[0]["post_id"] == 2
+
+
+def test_delta_commits_once_and_exports_json():
+    with tempfile.TemporaryDirectory() as tmp:
+        with Inventory.open("t", tmp) as inv:
+            seed(inv)
+        delta = InventoryDelta()
+        delta.increment(1, "internal_links_out")
+        delta.add_link(1, f"{SITE}/p3/")
+        delta.set(2, meta_description="New meta", last_audited_at="2026-01-01")
+        assert delta.commit("t", tmp) == 2
+        assert not len(delta)
+        assert delta.commit("t", tmp) == 0
+
+        with Inventory.open("t", tmp) as inv:
+            assert inv.get(1)["internal_links_out"] == 1
+            assert inv.get(3)["internal_links_in"] == 1
+            assert inv.get(2)["meta_description"] == "New meta"
+            assert [e["post_id"] for e in inv.missing_meta()] == [1, 3]
+        with open(os.path.join(tmp, "inventory_t.json")) as f:
+            assert "2" in json.load(f)["posts"]
+
+        # Sites without an inventory are left alone
+        assert InventoryDelta().commit("none", tmp) == 0
+        other = InventoryDelta()
+        other.set(1, title="x")
+        assert other.commit("none", tmp) == 0
+        assert not Inventory.exists("none", tmp)
+
+
+def test_unknown_fields_rejected():
+    delta = InventoryDelta()
+    for call in (lambda: delta.set(1, bogus=1), lambda: delta.increment(1, "title")):
+        try:
+            call()
+        except KeyError:
+            continue
+        raise AssertionError("expected KeyError")
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
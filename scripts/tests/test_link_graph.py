@@ -0,0 +1,50 @@
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from link_graph import LinkGraph, is_post_candidate, normalize_url, pagerank
+
+SITE = "https://site.com"
+
+
+def test_normalize_url_folds_spellings():
+    key = "site.com/griddle-guide"
+    for url in ("https://site.com/griddle-guide/", "http://www.site.com/griddle-guide",
+                "https://site.com/griddle-guide/#faq", "https://site.com/griddle-guide/?utm_source=x"):
+        assert normalize_url(url) == key
+    assert normalize_url("../../griddle-guide/", base="https://site.com/recipes/eggs/") == key
+
+
+def test_archive_paths_match_whole_segments():
+    for path in ("/tag/x/", "/feed/", "/feed", "/page/2/", "/author/bob/", "/wp-login.php", "/category/a/"):
+        assert not is_post_candidate(normalize_url(SITE + path), "site.com"), path
+    for path in ("/feeding-guide/", "/tagine-recipe/", "/pages-of-x/", "/authority-cooking/"):
+        assert is_post_candidate(normalize_url(SITE + path), "site.com"), path
+
+
+def test_graph_inbound_orphans_and_dead_links():
+    graph = LinkGraph({1: f"{SITE}/a/", 2: f"{SITE}/b/", 3: f"{SITE}/c/"})
+    graph.add_content(1, '<p><a href="/b/">b</a> <a href="https://www.site.com/b#x">again</a> '
+                         '<a href="/missing-post/">gone</a> <a href="/tag/eggs/">tag</a> '
+                         '<a href="https://other.com/c/">external</a> https://site.com/c/</p>')
+    graph.add_content(2, '<a href="/a/">self-ish</a><a href="/b/">self</a>')
+    assert graph.inbound_counts() == {1: 1, 2: 1, 3: 0}
+    assert graph.orphans() == [3]
+    assert graph.dead == [(1, "site.com/missing-post")]
+
+
+def test_pagerank_mean_is_one_and_hub_ranks_highest():
+    edges = [(1, 4), (2, 4), (3, 4), (4, 1)]
+    scores = pagerank([1, 2, 3, 4], edges)
+    assert abs(sum(scores.values()) / len(scores) - 1.0) < 1e-6
+    assert max(scores, key=scores.get) == 4
+    assert pagerank([1, 2], []) == {1: 1.0, 2: 1.0}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
@@ -0,0 +1,93 @@
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from link_injector import AhoCorasick, Injection, inject_links, replace_href, scan_html
+
+SITE = "https://site.com"
+
+
+def inject(html, *injections):
+    new_html, results = inject_links(html, [Injection(*i) for i in injections], base_url=f"{SITE}/post/")
+    return new_html, results
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    automaton = AhoCorasick(["he", "she", "hers", "his"])
+    found = sorted((s, e, automaton.patterns[i]) for s, e, i in automaton.find_all("ushers"))
+    assert found == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+    assert list(AhoCorasick([]).find_all("anything")) == []
+
+
+def test_scan_skips_links_headings_and_collects_hrefs():
+    html = '<h2>Cast iron</h2><p>Use <a href="/x/?a=1&amp;b=2">cast iron</a> here</p><!-- <a href="/c/"> -->'
+    runs, hrefs = scan_html(html)
+    text = "".join(html[s:e] for s, e in runs)
+    assert "Cast iron" not in text and "cast iron" not in text
+    assert "Use " in text and " here" in text
+    assert hrefs == ["/x/?a=1&b=2"]
+
+
+def test_script_style_and_textarea_bodies_are_not_tags():
+    html = '<script>var s="<a>";</script><p>cast iron</p><style>a:after{content:"<h2>"}</style><p>tail</p>'
+    runs, _ = scan_html(html)
+    text = "".join(html[s:e] for s, e in runs)
+    assert "cast iron" in text and "tail" in text
+    assert "var s" not in text
+    new_html, (result,) = inject(html, (f"{SITE}/cast-iron/", "cast iron"))
+    assert result.applied
+    assert new_html.startswith('<script>var s="<a>";</script><p><a href=')
+
+
+def test_anchor_matches_across_whitespace_and_entities():
+    html = "<p>Season the cast\n  iron with Salt &amp;\npepper.</p>"
+    new_html, (iron, salt) = inject(html, (f"{SITE}/cast-iron/", "Cast iron"),
+                                    (f"{SITE}/seasoning/", "salt & pepper"))
+    assert iron.applied and iron.linked_text == "cast\n  iron"
+    assert salt.applied and salt.linked_text == "Salt &amp;\npepper"
+    assert f'<a href="{SITE}/seasoning/">Salt &amp;\npepper</a>.' in new_html
+
+
+def test_whole_words_only_and_existing_targets_skipped():
+    html = '<p>Skillets and a skillet. See <a href="http://www.site.com/pans">pans</a>.</p>'
+    new_html, (skillet, pans) = inject(html, (f"{SITE}/skillet/", "skillet"), (f"{SITE}/pans/", "skillets"))
+    assert skillet.linked_text == "skillet" and "a <a href" in new_html
+    assert not pans.applied and pans.reason == "target already linked"
+
+
+def test_overlapping_anchors_take_disjoint_spans():
+    html = "<p>A cast iron skillet beats a cast iron pan.</p>"
+    new_html, (first, second) = inject(html, (f"{SITE}/skillet/", "cast iron skillet"),
+                                       (f"{SITE}/cast-iron/", "cast iron"))
+    assert first.applied and second.applied
+    assert new_html.count("<a href") == 2
+    assert f'a <a href="{SITE}/cast-iron/">cast iron</a> pan' in new_html
+
+
+def test_context_hint_prefers_later_occurrence():
+    html = "<p>Oil the griddle.</p><p>Clean the griddle\nafter   cooking &amp; cool it.</p>"
+    new_html, (result,) = inject(html, (f"{SITE}/griddle/", "griddle", "clean the griddle after cooking & cool"))
+    assert result.applied
+    assert new_html.startswith("<p>Oil the griddle.</p><p>Clean the <a href=")
+
+
+def test_replace_href_only_touches_anchor_hrefs():
+    old = "https://amazon.com/dp/B01?tag=a&th=1"
+    html = (f'<a href="https://amazon.com/dp/B01?tag=a&amp;th=1">x</a> {old} '
+            f'<img src="{old}"><script>var u="<a href=\'{old}\'>";</script>'
+            f"<a title=y href='https://amazon.com/dp/B01?tag=a&amp;th=1'>y</a>")
+    new_html, count = replace_href(html, old, "https://amazon.com/dp/B01?tag=b")
+    assert count == 2
+    assert new_html.count("tag=b") == 2
+    assert "href='https://amazon.com/dp/B01?tag=b'" in new_html
+    assert f'<img src="{old}">' in new_html and f"<a href='{old}'>" in new_html
+    assert replace_href(html, "https://nowhere.com/", "x") == (html, 0)
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
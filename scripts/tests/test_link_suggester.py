@@ -0,0 +1,96 @@
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from link_injector import Injection, inject_links
+from link_suggester import LINKS_PER_SOURCE, LinkSuggester, phrase_candidates, phrase_pattern
+from wp_client import WPPost
+
+SITE = "https://site.com"
+
+
+def post(pid, title, content, slug=""):
+    return WPPost(id=pid, link=f"{SITE}/{slug or pid}/", slug=slug, title=title, content=content)
+
+
+def test_phrase_candidates_longest_first_without_edge_stopwords():
+    phrases = phrase_candidates("How to Season a Cast Iron Skillet", "season-cast-iron")
+    assert phrases[0] == ("season", "a", "cast", "iron", "skillet")
+    assert ("cast", "iron") in phrases
+    assert all(p[0] not in ("how", "to", "a") and p[-1] not in ("how", "to", "a") for p in phrases)
+
+
+def test_context_hint_is_raw_markup_the_injector_finds():
+    content = ("<h2>Cast iron skillet</h2><p>Tom&#8217;s tip: heat the <b>pan</b> first &amp; then "
+               "oil your cast iron skillet lightly before cooking.</p>")
+    suggester = LinkSuggester([post(1, "Tips", content), post(2, "Cast Iron Skillet", "<p>x</p>", "cast-iron-skillet")],
+                              host=SITE)
+    phrases = [(p, phrase_pattern(p)) for p in phrase_candidates("Cast Iron Skillet")]
+    anchor, hint = suggester.find_anchor(1, phrases)
+    assert anchor == "cast iron skillet"
+    assert hint in content and "<" not in hint  # one text run, entities left whole
+    assert hint.startswith("first &amp; then")
+
+    html, (result,) = inject_links(content, [Injection(f"{SITE}/cast-iron-skillet/", anchor, hint)])
+    assert result.applied
+    assert f'oil your <a href="{SITE}/cast-iron-skillet/">cast iron skillet</a> lightly' in html
+
+
+def skillet_site(extra=()):
+    target = post(10, "Cast Iron Skillet", "<p>Seasoning guide.</p>", "cast-iron-skillet")
+    sources = [post(pid, f"Griddle notes {pid}", f"<p>Preheat the cast iron skillet before searing, note {pid}.</p>")
+               for pid in (1, 2, 3)]
+    return [target, *sources, *extra]
+
+
+def test_cooldown_urls_are_never_sources():
+    suggester = LinkSuggester(skillet_site(), host=SITE)
+    assert {s["source_post_id"] for s in suggester.suggest(10)} == {1, 2, 3}
+
+    suggester = LinkSuggester(skillet_site(), host=SITE, cooldown_urls=[f"{SITE}/2/"])
+    assert suggester.cooldown_ids == {2}
+    assert {s["source_post_id"] for s in suggester.suggest(10)} == {1, 3}
+
+
+def test_posts_already_linking_to_the_target_are_skipped():
+    linker = post(4, "Griddle notes 4", f'<p>Our <a href="{SITE}/cast-iron-skillet/">skillet guide</a> says '
+                                        "preheat the cast iron skillet first.</p>")
+    suggester = LinkSuggester(skillet_site([linker]), host=SITE)
+    suggestions = suggester.suggest(10, sources=5)
+    assert {s["source_post_id"] for s in suggestions} == {1, 2, 3}
+    assert all(s["anchor_text"] == "cast iron skillet" for s in suggestions)
+
+
+def test_sources_capped_across_targets():
+    titles = ["Cast Iron Skillet", "Carbon Steel Wok", "Pizza Stone Care", "Propane Tank Gauge"]
+    targets = [post(10 + i, title, "<p>x</p>", title.lower().replace(" ", "-")) for i, title in enumerate(titles)]
+    hub = post(1, "Outdoor kitchen", "<p>" + " ".join(f"Keep the {t.lower()} handy." for t in titles) + "</p>")
+    suggester = LinkSuggester([hub, *targets], host=SITE)
+    suggestions = suggester.suggest_all(targets=[10, 11, 12, 13])
+    assert [s["target_post_id"] for s in suggestions] == [10, 11, 12]
+    assert len(suggestions) == LINKS_PER_SOURCE
+    assert len({s["anchor_text"] for s in suggestions}) == LINKS_PER_SOURCE
+
+
+def test_instructions_round_robin_across_orphans():
+    def suggestion(target, source):
+        return {"target_post_id": target, "target_url": f"{SITE}/{target}/", "source_post_id": source,
+                "anchor_text": f"anchor {source}", "context_hint": ""}
+
+    suggestions = [suggestion(10, 1), suggestion(10, 2), suggestion(10, 3),
+                   suggestion(11, 4),
+                   suggestion(12, 5), suggestion(12, 6)]
+    order = [(i["target_url"], i["source_post_id"]) for i in LinkSuggester.instructions(suggestions)["injections"]]
+    assert order == [(f"{SITE}/10/", 1), (f"{SITE}/11/", 4), (f"{SITE}/12/", 5),
+                     (f"{SITE}/10/", 2), (f"{SITE}/12/", 6), (f"{SITE}/10/", 3)]
+    capped = LinkSuggester.instructions(suggestions, limit=3)["injections"]
+    assert [i["source_post_id"] for i in capped] == [1, 4, 5]  # one link per orphan first
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
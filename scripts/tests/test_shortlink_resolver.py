@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'benchmarks'))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from redirect_stub import RedirectStub
+from shortlink_resolver import ShortlinkCache, ShortlinkResolver
+
+STUB_HOSTS = ("127.0.0.1",)
+
+
+def make_resolver(cache_path, **kwargs):
+    return ShortlinkResolver(ShortlinkCache(cache_path), hosts=STUB_HOSTS, min_interval=0.0, **kwargs)
+
+
+def test_resolves_multi_hop_redirects():
+    with tempfile.TemporaryDirectory() as tmp, RedirectStub(links=30, hops=3) as stub:
+        resolver = make_resolver(os.path.join(tmp, "cache.json"))
+        resolved = resolver.resolve_many(list(stub.links))
+        assert resolved == stub.links
+        assert resolver.stats["resolved"] == 30
+        # Three hops per link; the Amazon destination itself is never requested
+        assert stub.stats["requests"] == 90
+        assert stub.stats["head"] == 90
+
+
+def test_persistent_cache_skips_requests():
+    with tempfile.TemporaryDirectory() as tmp, RedirectStub(links=20) as stub:
+        cache_path = os.path.join(tmp, "cache.json")
+        first = make_resolver(cache_path)
+        first.resolve_many(list(stub.links))
+        first.save()
+        stub.reset_stats()
+
+        second = make_resolver(cache_path)
+        resolved = second.resolve_many(list(stub.links))
+        assert resolved == stub.links
+        assert second.stats["cached"] == 20
+        assert stub.stats["requests"] == 0
+
+
+def test_head_rejected_falls_back_to_get():
+    with tempfile.TemporaryDirectory() as tmp, RedirectStub(links=5, head=False) as stub:
+        resolver = make_resolver(os.path.join(tmp, "cache.json"))
+        assert resolver.resolve_many(list(stub.links)) == stub.links
+        assert stub.stats["get"] == 5
+
+
+def test_throttled_requests_are_retried():
+    with tempfile.TemporaryDirectory() as tmp, RedirectStub(links=12, throttle_every=4) as stub:
+        resolver = make_resolver(os.path.join(tmp, "cache.json"), workers=2)
+        assert resolver.resolve_many(list(stub.links)) == stub.links
+        assert stub.stats["throttled"] > 0
+
+
+def test_failures_are_reported_not_cached():
+    with tempfile.TemporaryDirectory() as tmp, RedirectStub(links=2) as stub:
+        cache_path = os.path.join(tmp, "cache.json")
+        resolver = make_resolver(cache_path)
+        missing = f"{stub.url}/doesnotexist"
+        resolved = resolver.resolve_many([missing, *stub.links, "https://www.amazon.com/dp/B01?tag=x"])
+        assert resolved[missing] is None
+        assert "404" in resolver.errors[missing]
+        assert len(resolved) == 3  # non-short links are ignored
+        resolver.save()
+        assert ShortlinkCache(cache_path).get(missing) is None
+        assert len(ShortlinkCache(cache_path)) == 2
+
+
+def test_concurrent_saves_merge_entries():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "cache.json")
+        first, second = ShortlinkCache(cache_path), ShortlinkCache(cache_path)
+        assert len(first) == len(second) == 0  # both load before either saves
+        first.put("https://amzn.to/a", "https://www.amazon.com/dp/A?tag=x-20", 1)
+        second.put("https://amzn.to/b", "https://www.amazon.com/dp/B?tag=x-20", 1)
+        first.save()
+        second.save()  # its stale copy must not drop first's entry
+        assert len(second) == 2
+
+        merged = ShortlinkCache(cache_path)
+        assert merged.get("https://amzn.to/a") == "https://www.amazon.com/dp/A?tag=x-20"
+        assert merged.get("https://amzn.to/b") == "https://www.amazon.com/dp/B?tag=x-20"
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
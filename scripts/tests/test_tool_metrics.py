@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..'))
+
+from core.tool_metrics import METRICS_PER_TOOL_LIMIT, ToolMetricsStore, percentile, summarize_samples
+
+
+def test_percentile_is_nearest_rank():
+    values = [5, 1, None, 4, 2, 3]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 0) == 1
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([None], 50) is None and percentile([], 95) is None
+
+
+def test_summarize_samples():
+    samples = [
+        {"at": "2026-01-02T10:00:00", "wall_seconds": 4.0, "success": True,
+         "cpu_user_seconds": 1.0, "cpu_sys_seconds": 0.5, "max_rss_kb": 2048},
+        {"at": "2026-01-03T10:00:00", "wall_seconds": 1.0, "success": False},
+        {"at": "2026-01-01T10:00:00", "wall_seconds": 2.5, "success": True,
+         "cpu_user_seconds": 0.5, "cpu_sys_seconds": None, "max_rss_kb": 4096},
+    ]
+    assert summarize_samples(samples) == {
+        "runs": 3,
+        "failures": 1,
+        "failure_rate_pct": 33.3,
+        "p50_seconds": 2.5,
+        "p95_seconds": 4.0,
+        "total_seconds": 7.5,
+        "avg_cpu_seconds": 1.0,
+        "max_rss_kb": 4096,
+        "last_run_at": "2026-01-03T10:00:00",
+    }
+    assert summarize_samples([]) is None
+
+
+def test_store_keeps_newest_samples_per_tool():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ToolMetricsStore(tmp)
+        for i in range(METRICS_PER_TOOL_LIMIT + 20):
+            store.record("site", "audit", {"wall_seconds": float(i), "success": True})
+        store.record("site", "inventory", {"wall_seconds": 1.0, "success": False})
+
+        rows = store.samples("site", tool_name="audit")["audit"]
+        assert len(rows) == METRICS_PER_TOOL_LIMIT
+        assert rows[0]["wall_seconds"] == METRICS_PER_TOOL_LIMIT + 19  # newest first
+        assert rows[-1]["wall_seconds"] == 20.0
+        assert store.summarize("site")["inventory"]["failures"] == 1
+        assert store.slugs() == ["site"]
+        with open(os.path.join(tmp, "tool_metrics_site.json")) as f:
+            assert set(json.load(f)["tools"]) == {"audit", "inventory"}
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'benchmarks'))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+import wp_client
+from wp_client import HostRateLimiter, ValidatorCache, WPClient
+from wp_stub import WPStub
+
+LISTING = {"orderby": "modified", "order": "asc"}
+
+
+def make_client(stub):
+    wp = WPClient(stub.url, "user", "pass")
+    wp.limiter = HostRateLimiter(min_interval=0.0)
+    return wp
+
+
+def test_repeated_listing_is_answered_not_modified():
+    with WPStub(posts=250, latency=0) as stub:
+        wp = make_client(stub)
+        first = ValidatorCache()
+        assert len(wp.fetch_all_posts(LISTING, fields=("id", "modified_gmt"), validators=first)) == 250
+
+        stub.reset_stats()
+        second = ValidatorCache(first.to_dict())
+        assert wp.fetch_all_posts(LISTING, fields=("id", "modified_gmt"), validators=second) == []
+        assert stub.stats["not_modified"] == 3 == second.not_modified_pages
+        assert sorted(second.not_modified_ids) == list(range(1, 251))
+
+
+def test_incremental_validators_survive_a_moving_cursor():
+    with WPStub(posts=50, latency=0) as stub:
+        wp = make_client(stub)
+        full = ValidatorCache()
+        wp.fetch_all_posts(LISTING, fields=("id", "modified_gmt"), validators=full)
+
+        stub.touch(7)
+        cursor = stub.posts[7]["modified"]
+        first = ValidatorCache(full.to_dict())
+        changed = wp.fetch_all_posts({**LISTING, "modified_after": "2025-06-01T00:00:00"},
+                                     fields=("id", "modified_gmt"), validators=first)
+        assert [p.id for p in changed] == [7]
+
+        # Next run: the cursor moved, nothing else changed
+        stub.reset_stats()
+        second = ValidatorCache(first.to_dict())
+        assert wp.fetch_all_posts({**LISTING, "modified_after": cursor[:-2] + "00"},
+                                  fields=("id", "modified_gmt"), validators=second) == []
+        assert stub.stats["not_modified"] == 1 and second.not_modified_ids == [7]
+        # The full crawl's validators were kept through the incremental runs
+        assert set(full.to_dict()) <= set(second.to_dict())
+
+
+def test_concurrent_pages_reassembled_in_order():
+    with WPStub(posts=350, latency=0.05) as stub:
+        wp = make_client(stub)
+        stub.page_delays[2] = 0.3
+        arrived = []
+        posts = wp.fetch_all_posts(LISTING, fields=("id", "modified_gmt"), workers=4,
+                                   on_page=lambda page, total, batch: arrived.append(page))
+        assert arrived[0] == 1 and arrived[-1] == 2  # the slow page lands last
+        assert sorted(arrived) == [1, 2, 3, 4]
+        assert [p.id for p in posts] == list(range(1, 351))
+        assert stub.stats["max_in_flight"] > 1
+
+
+def test_throttled_requests_retry_after_the_server_says():
+    with WPStub(posts=3, latency=0) as stub:
+        wp = make_client(stub)
+        wp.limiter = HostRateLimiter(min_interval=0.0, max_interval=0.25)
+        stub.fail_next(429, count=2, retry_after="0.2")
+        started = time.monotonic()
+        assert wp.get_json("wp/v2/posts/1")["id"] == 1
+        assert time.monotonic() - started >= 0.4
+        assert stub.stats["requests"] == 3 and stub.stats["faults"] == 2
+        assert 0 < wp.limiter.interval < 0.25  # penalized by the 429s, decaying since
+
+        stub.fail_next(502, retry_after="0")
+        assert wp.request("GET", "wp/v2/posts/2").status_code == 200
+
+        stub.fail_next(503, count=5, retry_after="0")
+        assert wp.request("GET", "wp/v2/posts/3", retries=2).status_code == 503
+        assert stub.stats["faults"] == 6  # retries exhausted: two queued faults left over
+
+
+def test_retry_after_is_capped():
+    class Response:
+        def __init__(self, value):
+            self.headers = {"Retry-After": value}
+
+    assert WPClient._retry_delay(0, Response("3")) == 3.0
+    assert WPClient._retry_delay(0, Response("3600")) == wp_client.BACKOFF_MAX_SECONDS
+    assert WPClient._retry_delay(0, Response("-1")) == 0.0
+
+
+def test_rate_limiter_backs_off_and_recovers():
+    limiter = HostRateLimiter(min_interval=0.1, max_interval=2.0)
+    limiter.penalize()
+    assert limiter.interval == 0.5
+    limiter.penalize()
+    assert limiter.interval == 1.0
+    limiter.penalize()
+    limiter.penalize()
+    assert limiter.interval == 2.0  # ceiling
+    limiter.reward()
+    assert abs(limiter.interval - 1.8) < 1e-9
+    for _ in range(100):
+        limiter.reward()
+    assert limiter.interval == 0.1  # floor
+
+
+def test_batch_writes_report_each_item():
+    with WPStub(posts=40, latency=0) as stub:
+        wp = make_client(stub)
+        updates = [(pid, {"title": f"Renamed {pid}"}) for pid in range(1, 31)] + [(999, {"title": "x"})]
+        results = wp.update_posts(updates)
+        assert [r.post_id for r in results] == [pid for pid, _ in updates]
+        assert stub.stats["batches"] == 2 and stub.stats["writes"] == 31
+        assert all(r.ok and r.via == "batch" for r in results[:30])
+        missing = results[-1]
+        assert not missing.ok and missing.status == 404 and missing.via == "batch"
+        assert missing.error == "404 rest_post_invalid_id: Invalid post ID."
+
+
+def test_missing_batch_route_falls_back_to_single_writes():
+    with WPStub(posts=5, latency=0, batch=False) as stub:
+        wp = make_client(stub)
+        results = wp.update_posts([(1, {"title": "A"}), (999, {"title": "B"}), (2, {"title": "C"})])
+        assert not wp.batch_supported
+        assert [(r.post_id, r.ok, r.status, r.via) for r in results] == [
+            (1, True, 200, "single"), (999, False, 404, "single"), (2, True, 200, "single")]
+        assert results[1].error == "404 rest_post_invalid_id: Invalid post ID."
+        assert stub.posts[1]["title"]["raw"] == "A"
+
+        stub.reset_stats()
+        wp.update_posts([(3, {"title": "D"})])
+        assert stub.stats["requests"] == 1  # batch route not probed again
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
@@ -0,0 +1,120 @@
+import os
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'shared', 'scripts'))
+
+from changelog import Changelog
+from inventory_store import InventoryDelta
+from wp_client import WPPost, WriteResult
+from write_stage import WriteStage, structural_diff
+
+
+class FakeWP:
+    """In-memory stand-in for WPClient.get_posts / update_posts."""
+
+    def __init__(self, posts):
+        self.posts = posts  # post_id -> REST object (context=edit)
+        self.fetched = []
+        self.updates = []
+
+    def get_posts(self, ids, fields=None, context=None):
+        self.fetched.append(sorted(ids))
+        return {pid: WPPost.from_api(self.posts[pid]) for pid in ids if pid in self.posts}
+
+    def update_posts(self, updates, **kwargs):
+        for post_id, data in updates:
+            self.updates.append((post_id, data))
+            yield WriteResult(post_id, True, via="single")
+
+
+def make_post(pid, content="<p>Hello</p>", title="Title", excerpt="Old meta", meta=None):
+    return {
+        "id": pid,
+        "link": f"https://site.com/p{pid}/",
+        "title": {"raw": title, "rendered": title},
+        "content": {"raw": content, "rendered": content},
+        "excerpt": {"raw": excerpt, "rendered": f"<p>{excerpt}</p>\n"},
+        "meta": meta if meta is not None else {"_yoast_wpseo_metadesc": excerpt},
+    }
+
+
+def test_noop_fields_are_not_written():
+    wp = FakeWP({1: make_post(1), 2: make_post(2, meta=[])})
+    stage = WriteStage(wp)
+    stage.fetch([1, 2])
+    stage.stage(1, "update_post_meta", title="Title", excerpt="Old meta",
+                meta={"_yoast_wpseo_metadesc": "Old meta"})
+    stage.stage(2, "update_post_meta", excerpt="Old meta", meta={"_yoast_wpseo_metadesc": "Old meta"})
+    results = stage.flush()
+    assert results[1].via == "noop"
+    # Post 2 has no stored meta key yet, so only meta is written
+    assert wp.updates == [(2, {"meta": {"_yoast_wpseo_metadesc": "Old meta"}})]
+    assert stage.summary()["noop_writes_skipped"] == 1
+
+
+def test_edits_merge_into_one_write_and_posts_fetch_once():
+    wp = FakeWP({1: make_post(1)})
+    stage = WriteStage(wp)
+    stage.fetch([1])
+    stage.fetch([1])
+    assert wp.fetched == [[1]]
+    stage.stage(1, "inject_internal_links", content=stage.current(1) + '<p><a href="/x/">x</a></p>')
+    stage.stage(1, "fix_affiliate_links", content=stage.current(1).replace("Hello", "Hi"))
+    stage.stage(1, "update_post_meta", meta={"a": "1"})
+    stage.stage(1, "update_post_meta", meta={"b": "2"})
+    stage.flush()
+    assert len(wp.updates) == 1
+    post_id, data = wp.updates[0]
+    assert data["content"] == '<p>Hi</p><p><a href="/x/">x</a></p>'
+    assert data["meta"] == {"a": "1", "b": "2"}
+    assert stage.summary()["edits_merged"] == 3
+    # The written values become the base, meta merged with what was stored
+    assert stage.base[1]["meta"] == {"_yoast_wpseo_metadesc": "Old meta", "a": "1", "b": "2"}
+
+
+def test_plan_stage_defers_records_until_applied():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "plan_stage.json")
+        changelog_path = os.path.join(tmp, "changelog.jsonl")
+        wp = FakeWP({1: make_post(1), 2: make_post(2)})
+
+        stage = WriteStage.load(path, wp, defer=True)
+        stage.fetch([1, 2])
+        stage.stage(1, "inject_internal_links", content="<p>Hello <a href='/y/'>y</a></p>")
+        stage.stage(2, "inject_internal_links", content="<p>Hello</p>")
+        assert {pid: r.via for pid, r in stage.flush().items()} == {1: "staged", 2: "noop"}
+        changelog = Changelog(changelog_path)
+        delta = InventoryDelta()
+        stage.log_change(1, changelog, {"post_id": 1})
+        stage.update_inventory(1, delta, "add_link", "https://site.com/y/")
+        stage.finish()
+        changelog.commit()
+        assert not os.path.exists(changelog_path)
+        assert not len(delta) and not wp.updates
+
+        committed = WriteStage.load(path, wp)
+        committed.flush()
+        assert [pid for pid, _ in wp.updates] == [1]
+        delta = InventoryDelta()
+        assert committed.apply_records([1], delta) == 1
+        assert delta.links == [(True, 1, "https://site.com/y/", "internal")]
+        with open(changelog_path) as f:
+            assert len(f.readlines()) == 1
+
+
+def test_structural_diff_counts_changed_tokens():
+    before = "<p>Cast iron pans</p><p>Keep</p>"
+    after = '<p><a href="/c/">Cast iron</a> pans</p><p>Keep</p>'
+    diff = structural_diff(before, after)
+    assert diff["hunks"] == 1
+    assert diff["tokens_removed"] == 1 and diff["tokens_added"] == 4
+    assert structural_diff(before, before)["hunks"] == 0
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"{name}: ok")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tool telemetry report — which tools dominate tick time, memory and failures.
+
+Reads the rolling per-site metrics ToolRegistry records in
+state/tool_metrics_{slug}.json.
+
+Usage:
+    python3 scripts/tool_stats.py                     # all sites, 24h vs 7d
+    python3 scripts/tool_stats.py --site griddleking  # one site
+    python3 scripts/tool_stats.py --tool build_inventory --days 14
+"""
+
+import argparse
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from core.tool_metrics import ToolMetricsStore
+
+
+def _fmt(value, suffix="s"):
+    return "-" if value is None else f"{value:.1f}{suffix}"
+
+
+def print_daily(store, slug, tool_name, days):
+    print(f"\n{slug} / {tool_name} — last {days} days")
+    print(f"{'day':<12}{'runs':>6}{'p50':>9}{'p95':>9}{'fail%':>7}{'cpu':>8}{'rss MB':>8}")
+    for row in store.daily_series(slug, tool_name, days=days):
+        st = row["stats"]
+        if not st:
+            print(f"{row['day']:<12}{0:>6}")
+            continue
+        rss = st["max_rss_kb"] / 1024.0 if st.get("max_rss_kb") else None
+        print(
+            f"{row['day']:<12}{st['runs']:>6}{_fmt(st['p50_seconds']):>9}"
+            f"{_fmt(st['p95_seconds']):>9}{st['failure_rate_pct']:>7.0f}"
+            f"{_fmt(st['avg_cpu_seconds']):>8}{_fmt(rss, ''):>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-tool execution telemetry report")
+    parser.add_argument("--site", help="Site slug (e.g. griddleking); default: all sites")
+    parser.add_argument("--tool", help="Show a per-day series for one tool")
+    parser.add_argument("--days", type=int, default=7, help="Days for the per-day series")
+    args = parser.parse_args()
+
+    store = ToolMetricsStore(os.path.join(ROOT_DIR, "state"))
+    slugs = [args.site] if args.site else store.slugs()
+
+    print(store.format_report(slugs=slugs).replace("*", "").replace("`", ""))
+
+    if args.tool:
+        for slug in slugs:
+            print_daily(store, slug, args.tool, args.days)
+
+
+if __name__ == "__main__":
+    main()
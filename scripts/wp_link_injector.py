@@ -7,10 +7,11 @@ Adds contextual internal links from high-authority posts to orphaned content.
 import os
 import sys
 import json
-import requests
-from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'shared', 'scripts'))
+from wp_client import WPClient
+
 # Load environment variables
 load_dotenv()
 
@@ -21,16 +22,11 @@ REQUEST_TIMEOUT = int(os.getenv('HTTP_TIMEOUT_SECONDS', '30'))
 
 class WordPressAPI:
     def __init__(self):
-        self.base_url = f"{WP_URL}/wp-json/wp/v2"
-        self.auth = HTTPBasicAuth(WP_USERNAME, WP_APP_PASS)
+        self.wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=REQUEST_TIMEOUT)
     
     def get_post_by_slug(self, slug):
         """Fetch post by slug."""
-        url = f"{self.base_url}/posts?slug={slug}"
-        response = requests.get(url, auth=self.auth, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        posts = response.json()
-        return posts[0] if posts else None
+        return self.wp.get_post_by_slug(slug)
     
     def get_post_by_url(self, post_url):
         """Fetch post by full URL."""
@@ -40,14 +36,11 @@ class WordPressAPI:
     
     def update_post(self, post_id, content, title=None):
         """Update post content."""
-        url = f"{self.base_url}/posts/{post_id}"
         data = {'content': content}
         if title:
             data['title'] = title
         
-        response = requests.post(url, json=data, auth=self.auth, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
-        return response.json()
+        return self.wp.update_post(post_id, data)
     
     def inject_links(self, source_post_url, target_links):
         """
@@ -58,7 +51,7 @@ class WordPressAPI:
         if not post:
             return {'error': f'Post not found: {source_post_url}'}
         
-        content = post['content']['rendered']
+        content = post.content
         original_content = content
         links_added = []
         
@@ -89,10 +82,10 @@ class WordPressAPI:
         
         # Update post if changes were made
         if content != original_content:
-            result = self.update_post(post['id'], content)
+            result = self.update_post(post.id, content)
             return {
                 'success': True,
-                'post_id': post['id'],
+                'post_id': post.id,
                 'post_url': source_post_url,
                 'links_added': links_added,
                 'updated_at': result['modified']
@@ -119,11 +112,11 @@ def main():
         post = api.get_post_by_url(url)
         if post:
             print(json.dumps({
-                'id': post['id'],
-                'title': post['title']['rendered'],
-                'slug': post['slug'],
-                'content': post['content']['rendered'][:500] + '...',
-                'url': post['link']
+                'id': post.id,
+                'title': post.title,
+                'slug': post.slug,
+                'content': post.content[:500] + '...',
+                'url': post.link
             }, indent=2))
         else:
             print(f"Post not found: {url}")
@@ -2,26 +2,28 @@
 """
 Affiliate Revenue Engine - Link Auditor
 Scans WordPress posts for Amazon/Impact/AvantLink links.
-- Identifies untagged links.
+- Identifies untagged links (amzn.to short links are expanded first).
 - Identifies missing affiliate disclosures.
 - Reports potential revenue leaks.
 """
 
 import os
 import sys
-import re
-import time
 import json
-import requests
+from dataclasses import replace
 from dotenv import load_dotenv
-from urllib.parse import urlparse, parse_qs
 
 # Load root .env
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
 
 # Add current directory to path so we can import telegram_utils
 sys.path.append(os.path.dirname(__file__))
+from content_cache import ContentCache, load_posts
+from link_extractor import extract_links
+from shortlink_resolver import ShortlinkResolver
 from telegram_utils import send_telegram_alert
+from tool_protocol import ProgressReporter, emit_result
+from wp_client import AFFILIATE_FIELDS, WPClient
 
 # Configuration
 # Usage: SITE_PREFIX=PHOTO python3 affiliate_audit.py
@@ -47,100 +49,108 @@ if not WP_USERNAME or not WP_APP_PASS:
     exit(1)
 
 def get_all_posts():
-    """Fetch all published posts from WordPress."""
-    wp_auth = (WP_USERNAME, WP_APP_PASS)
-    all_posts = []
-    page = 1
-    
+    """Published posts from the shared content cache, or a live crawl if it's cold."""
+    wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=30)
+    cached = load_posts(ContentCache.for_site(), wp)
+    if cached is not None:
+        print(f"✅ Loaded {len(cached)} posts from content cache ({wp.requests_made} requests).")
+        return cached
+
+    fetched = {'pages': 0, 'posts': 0}
+
     print("Fetching posts...", end="", flush=True)
-    while True:
-        try:
-            response = requests.get(
-                f"{WP_URL}/wp-json/wp/v2/posts",
-                params={'per_page': 100, 'page': page, 'status': 'publish'},
-                auth=wp_auth,
-                timeout=30
-            )
-            if response.status_code != 200:
-                break
-            posts = response.json()
-            if not posts:
-                break
-            all_posts.extend(posts)
-            print(".", end="", flush=True)
-            page += 1
-            time.sleep(0.2)
-        except Exception as e:
-            print(f"\n❌ Fetch error: {e}")
-            break
-            
+    progress = ProgressReporter("fetch_posts", unit="pages")
+
+    def on_page(page, total_pages, batch):
+        fetched['pages'] += 1
+        fetched['posts'] += len(batch)
+        print(".", end="", flush=True)
+        progress.update(fetched['pages'], total=total_pages, posts=fetched['posts'])
+
+    try:
+        all_posts = wp.fetch_all_posts(on_page=on_page, fields=AFFILIATE_FIELDS)
+    except Exception as e:
+        print(f"\n❌ Fetch error: {e}")
+        all_posts = []
+
+    progress.finish(fetched['pages'], posts=len(all_posts))
     print(f"\n✅ Fetched {len(all_posts)} posts.")
     return all_posts
 
+def resolve_short_links(posts):
+    """{amzn.to URL: expanded URL or None} for every short link on the site."""
+    short_urls = [link.url for post in posts
+                  for link in extract_links(post.content, WP_URL, base=post.link) if link.kind == 'amzn_to']
+    if not short_urls:
+        return {}
+    resolver = ShortlinkResolver()
+    progress = ProgressReporter("resolve_short_links", unit="links")
+    resolved = resolver.resolve_many(short_urls, on_progress=lambda done, total: progress.update(done, total=total))
+    resolver.save()
+    progress.finish(len(resolved))
+    stats = resolver.stats
+    print(f"🔗 Short links: {len(resolved)} unique, {stats['cached']} cached, "
+          f"{stats['resolved']} resolved ({stats['requests']} requests), {stats['failed']} unresolved")
+    return resolved
+
 def analyze_links(posts):
     """Analyze links in posts for affiliate compliance."""
     issues = []
     total_amazon_links = 0
     tagged_amazon_links = 0
     untagged_amazon_links = 0
-    
-    amazon_regex = r"(amazon\.com|amzn\.to)[/a-zA-Z0-9\-\.]+"
-    
+    unresolved_short_links = 0
+
     print("\n🔍 Scanning links...")
-    
+    resolved = resolve_short_links(posts)
+
     for post in posts:
-        content = post['content']['rendered']
-        title = post['title']['rendered']
-        link = post['link']
-        post_id = post['id']
-        
-        # Find Amazon Links
-        # This is a simple regex, a proper HTML parser (BeautifulSoup) is better but requires external lib
-        # We'll use regex for speed and simplicity in this MVP script
-        found_links = re.findall(r'href=[\'"]?([^\'" >]+)', content)
-        
         post_issues = []
-        
-        for url in found_links:
-            if 'amazon.com' in url or 'amzn.to' in url:
-                total_amazon_links += 1
-                if AMAZON_TAG and AMAZON_TAG in url:
-                    tagged_amazon_links += 1
-                elif 'amzn.to' not in url: # Bit.ly/Amzn.to might hide tags, ignore for now
-                     # Check if it has ANY tag
-                    if 'tag=' not in url:
-                        untagged_amazon_links += 1
-                        post_issues.append({
-                            'type': 'untagged_amazon',
-                            'url': url
-                        })
-                    elif AMAZON_TAG and AMAZON_TAG not in url:
-                         post_issues.append({
-                            'type': 'wrong_tag_amazon',
-                            'url': url
-                        })
+
+        for link in extract_links(post.content, WP_URL, base=post.link):
+            if link.kind not in ('amazon', 'amzn_to'):
+                continue
+            total_amazon_links += 1
+            issue = {'url': link.href}
+            if link.kind == 'amzn_to':
+                # Check the tag on the page the short link redirects to
+                if not resolved.get(link.url):
+                    unresolved_short_links += 1
+                    post_issues.append({'type': 'unresolved_short_link', **issue})
+                    continue
+                issue['resolved_url'] = resolved[link.url]
+                link = replace(link, url=resolved[link.url])
+            tag = link.param('tag')
+            if AMAZON_TAG and tag == AMAZON_TAG:
+                tagged_amazon_links += 1
+            elif not tag:
+                untagged_amazon_links += 1
+                post_issues.append({'type': 'untagged_amazon', **issue})
+            elif AMAZON_TAG:
+                post_issues.append({'type': 'wrong_tag_amazon', **issue})
 
         if post_issues:
             issues.append({
-                'post_title': title,
-                'post_url': link,
+                'post_title': post.title,
+                'post_url': post.link,
                 'issues': post_issues
             })
-            
-    return issues, total_amazon_links, tagged_amazon_links, untagged_amazon_links
+
+    return issues, total_amazon_links, tagged_amazon_links, untagged_amazon_links, unresolved_short_links
 
 def main():
     if not AMAZON_TAG:
         print("⚠️  No Amazon Tag configured. Skipping tag verification.")
     
     posts = get_all_posts()
-    issues, total, tagged, untagged = analyze_links(posts)
+    issues, total, tagged, untagged, unresolved = analyze_links(posts)
     
     print("\n📊 AUDIT RESULTS")
     print("=" * 40)
     print(f"Total Amazon Links: {total}")
     print(f"Properly Tagged:    {tagged}")
     print(f"Untagged/Wrong Tag: {untagged}")
+    print(f"Unresolved amzn.to: {unresolved}")
     print(f"Posts with Issues:  {len(issues)}")
     
     if issues:
@@ -162,9 +172,21 @@ def main():
             send_telegram_alert(msg)
 
     # Save details
-    with open('affiliate_audit_report.json', 'w') as f:
-        json.dump(issues, f, indent=2)
-    print("\n✅ Validated report saved to affiliate_audit_report.json")
+    report = {
+        'site': WP_URL,
+        'total_amazon_links': total,
+        'tagged_amazon_links': tagged,
+        'untagged_amazon_links': untagged,
+        'unresolved_short_links': unresolved,
+        'posts_with_issues': len(issues),
+        'issues': issues,
+    }
+    if emit_result(report):
+        print("\n✅ Validated report sent to tool registry")
+    else:
+        with open('affiliate_audit_report.json', 'w') as f:
+            json.dump(report, f, indent=2)
+        print("\n✅ Validated report saved to affiliate_audit_report.json")
 
 if __name__ == "__main__":
     main()
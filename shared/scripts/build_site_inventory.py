@@ -4,7 +4,19 @@ Site Inventory Builder — crawls all posts for a site, builds a persistent
 inventory with internal link counts, affiliate link status, word counts, etc.
 
 Supports incremental updates: after the first full crawl, subsequent runs only
-fetch posts modified since the last run.
+fetch posts modified past the sync cursor (max modified_gmt seen, tie-broken
+on post id), plus a cheap id-only listing to drop deleted or unpublished
+posts.  A full reconcile runs every INVENTORY_FULL_RECONCILE_HOURS.  Listing pages are requested with
+stored ETag/Last-Modified validators, and each entry keeps a content hash so
+unchanged posts skip link re-parsing and word counting.
+
+Every fetched body also lands in the shared content cache
+(state/content_cache_{slug}/), which the audit tools read instead of
+re-crawling the site.
+
+The inventory itself lives in SQLite (state/inventory_{slug}.db, see
+inventory_store.py): changed posts are upserted, removed posts deleted, and
+state/inventory_{slug}.json is re-exported for older readers.
 
 Usage:
     SITE_PREFIX=WP_GRIDDLEKING python3 build_site_inventory.py
@@ -14,13 +26,17 @@ import os
 import sys
 import re
 import json
-import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from html import unescape
 
-import requests
 from dotenv import load_dotenv
 
+from content_cache import ContentCache, content_hash
+from inventory_store import Inventory, inventory_lock
+from link_extractor import extract_links as extract_post_links
+from tool_protocol import ProgressReporter, emit_result
+from wp_client import INVENTORY_FIELDS, ValidatorCache, WPClient
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "../../.env"))
 
 # ── Config ──────────────────────────────────────────────────────────────────
@@ -39,6 +55,7 @@ STATE_DIR = os.path.join(ROOT_DIR, "state")
 raw_prefix = os.getenv("SITE_PREFIX", "")
 SLUG = raw_prefix.lower().replace("wp_", "").replace("_", "") if raw_prefix else "default"
 INVENTORY_PATH = os.path.join(STATE_DIR, f"inventory_{SLUG}.json")
+FULL_RECONCILE_HOURS = float(os.getenv("INVENTORY_FULL_RECONCILE_HOURS", "168"))
 
 
 def strip_html(html):
@@ -52,133 +69,187 @@ def count_words(html):
     return len(strip_html(html).split())
 
 
-def extract_links(html, site_domain):
-    """Extract internal and external links from HTML content."""
-    href_pattern = re.compile(r'href=[\'"]([^\'"]+)[\'"]', re.IGNORECASE)
+def extract_links(html, site_domain, base=None, digest=None):
+    """Split a post's links into (internal, amazon, other_affiliate).
+
+    Internal links (absolute or relative to base) come back normalized
+    (see link_graph.normalize_url) so they key straight into the post map;
+    affiliate links are kept as written.  Parsing is link_extractor's.
+    """
     internal = []
     amazon = []
     other_affiliate = []
-
-    for url in href_pattern.findall(html or ""):
-        url_lower = url.lower()
-        if site_domain in url_lower:
-            internal.append(url)
-        elif "amazon.com" in url_lower or "amzn.to" in url_lower:
-            amazon.append(url)
-        elif any(d in url_lower for d in ("impact.com", "avantlink.com", "shareasale.com")):
-            other_affiliate.append(url)
-
+    for link in extract_post_links(html, site_domain, base=base, digest=digest):
+        if link.kind == "internal":
+            internal.append(link.key)
+        elif link.kind in ("amazon", "amzn_to"):
+            amazon.append(link.href)
+        elif link.is_affiliate:
+            other_affiliate.append(link.href)
     return internal, amazon, other_affiliate
 
 
 def extract_meta_description(post):
     """Try to get meta description from Yoast or Rank Math meta fields."""
-    meta = post.get("yoast_head_json", {})
-    if meta:
-        return (meta.get("description") or "")[:300]
+    if post.raw.get("yoast_head_json"):
+        return post.yoast_description[:300]
     # Fallback: excerpt
-    excerpt = strip_html(post.get("excerpt", {}).get("rendered", ""))
-    return excerpt[:300]
+    return strip_html(post.excerpt)[:300]
 
 
-def fetch_all_posts(wp_auth, modified_after=None):
+def fetch_all_posts(wp, modified_after=None, validators=None):
     """Fetch published posts, optionally filtering by modified date."""
-    all_posts = []
-    page = 1
-    params = {"per_page": 100, "page": page, "status": "publish", "orderby": "modified", "order": "desc"}
+    params = {"orderby": "modified", "order": "asc"}
     if modified_after:
         params["modified_after"] = modified_after
 
     print(f"Fetching posts from {WP_URL}...", end="", flush=True)
-    while True:
-        params["page"] = page
-        try:
-            resp = requests.get(
-                f"{WP_URL}/wp-json/wp/v2/posts",
-                params=params,
-                auth=wp_auth,
-                timeout=TIMEOUT,
-            )
-            if resp.status_code == 400:
-                break
-            if resp.status_code != 200:
-                print(f"\nHTTP {resp.status_code}: {resp.text[:200]}")
-                break
-            posts = resp.json()
-            if not posts:
-                break
-            all_posts.extend(posts)
-            print(".", end="", flush=True)
-            page += 1
-            time.sleep(0.3)
-        except Exception as e:
-            print(f"\nFetch error: {e}")
-            break
-
+    progress = ProgressReporter("fetch_posts", unit="pages")
+    fetched = {"pages": 0, "posts": 0}
+
+    def on_page(page, total_pages, batch):
+        fetched["pages"] += 1
+        fetched["posts"] += len(batch)
+        print(".", end="", flush=True)
+        progress.update(fetched["pages"], total=total_pages, posts=fetched["posts"])
+
+    ok = True
+    try:
+        all_posts = wp.fetch_all_posts(
+            params, on_page=on_page, fields=INVENTORY_FIELDS, validators=validators
+        )
+    except Exception as e:
+        print(f"\nFetch error: {e}")
+        all_posts = []
+        ok = False
+
+    progress.finish(fetched["pages"], posts=len(all_posts))
     print(f" {len(all_posts)} posts.")
-    return all_posts
+    return all_posts, ok
 
 
-def build_post_entry(post, site_domain):
-    """Build an inventory entry for a single post."""
-    content = post.get("content", {}).get("rendered", "")
-    internal, amazon, other_aff = extract_links(content, site_domain)
+def fetch_live_ids(wp, validators=None):
+    """Ids of every published post via a tiny _fields=id listing.
 
-    return {
-        "post_id": post["id"],
-        "url": post.get("link", ""),
-        "slug": post.get("slug", ""),
-        "title": strip_html(post.get("title", {}).get("rendered", "")),
-        "meta_description": extract_meta_description(post),
-        "word_count": count_words(content),
-        "status": post.get("status", "publish"),
-        "internal_links_out": len(internal),
-        "amazon_links": len(amazon),
-        "other_affiliate_links": len(other_aff),
-        "publish_date": post.get("date", ""),
-        "last_modified": post.get("modified", ""),
-        "last_audited_at": datetime.now().isoformat(),
-    }
+    Returns None if the listing failed, so callers never treat a transport
+    error as "everything was deleted".
+    """
+    before = len(validators.not_modified_ids) if validators else 0
+    try:
+        posts = wp.fetch_all_posts(fields=("id",), validators=validators)
+    except Exception as e:
+        print(f"Id listing error: {e}")
+        return None
+    live = {p.id for p in posts}
+    if validators:
+        live.update(validators.not_modified_ids[before:])
+    return live
+
+
+# ── Sync cursor ─────────────────────────────────────────────────────────────
+
+def cursor_key(modified_gmt, post_id):
+    return (modified_gmt or "", int(post_id))
 
 
-def load_inventory():
-    """Load existing inventory or return empty structure."""
-    if os.path.exists(INVENTORY_PATH):
-        with open(INVENTORY_PATH, "r") as f:
-            return json.load(f)
-    return {"meta": {}, "posts": {}}
-
-
-def save_inventory(inventory):
-    """Atomic write of inventory file."""
-    os.makedirs(os.path.dirname(INVENTORY_PATH), exist_ok=True)
-    tmp = INVENTORY_PATH + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(inventory, f, indent=2, default=str)
-    os.replace(tmp, INVENTORY_PATH)
-
-
-def compute_summary(posts_dict):
-    """Compute aggregate stats from inventory."""
-    posts = list(posts_dict.values())
-    total = len(posts)
-    if total == 0:
-        return {}
-
-    orphans = [p for p in posts if p.get("internal_links_out", 0) == 0]
-    no_amazon = [p for p in posts if p.get("amazon_links", 0) == 0]
-    short = [p for p in posts if (p.get("word_count") or 0) < 500]
-    no_meta = [p for p in posts if not p.get("meta_description")]
-
-    return {
-        "total_posts": total,
-        "orphan_count": len(orphans),
-        "posts_without_amazon_links": len(no_amazon),
-        "short_posts_under_500w": len(short),
-        "posts_missing_meta_description": len(no_meta),
-        "avg_word_count": int(sum(p.get("word_count", 0) for p in posts) / total),
-        "total_amazon_links": sum(p.get("amazon_links", 0) for p in posts),
+def compute_cursor(posts_dict):
+    """Highest (modified_gmt, id) across the inventory, or None."""
+    best = None
+    for pid, entry in posts_dict.items():
+        gmt = entry.get("last_modified_gmt")
+        if not gmt:
+            continue
+        key = cursor_key(gmt, pid)
+        if best is None or key > best[0]:
+            best = (key, entry.get("last_modified", ""))
+    if best is None:
+        return None
+    (gmt, pid), local = best
+    return {"modified_gmt": gmt, "modified": local, "id": pid}
+
+
+def cursor_query_after(cursor):
+    """modified_after value: the cursor's local timestamp minus one second.
+
+    WordPress compares modified_after against post_modified (site-local) at
+    one-second resolution, so query a second early and filter locally.
+    """
+    try:
+        return (datetime.fromisoformat(cursor["modified"]) - timedelta(seconds=1)).isoformat()
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def already_synced(post, cursor, posts_dict):
+    """True for posts at or behind the cursor that the inventory already has."""
+    if cursor_key(post.modified_gmt, post.id) > cursor_key(cursor["modified_gmt"], cursor["id"]):
+        return False
+    entry = posts_dict.get(str(post.id))
+    return bool(entry) and entry.get("last_modified_gmt") == post.modified_gmt
+
+
+def needs_full_reconcile(meta, cursor):
+    """Full crawl when there's no cursor or the reconcile cadence is due."""
+    if not cursor:
+        return True
+    last_full = meta.get("last_full_crawl")
+    if not last_full:
+        return True
+    try:
+        age = datetime.now() - datetime.fromisoformat(last_full)
+    except ValueError:
+        return True
+    return age >= timedelta(hours=FULL_RECONCILE_HOURS)
+
+
+# Entry fields derived from parsing the content body (reused when unchanged)
+CONTENT_DERIVED_FIELDS = ("word_count", "internal_links_out", "amazon_links", "other_affiliate_links")
+
+
+def build_post_entry(post, site_domain, previous=None):
+    """Build an inventory entry for a single post.
+
+    Returns (entry, links): links is (internal, amazon, other_affiliate)
+    when the body was parsed, or None when the previous entry's content
+    hash matched and its counts were carried over.
+    """
+    digest = content_hash(post.content)
+    reparsed = not (
+        previous
+        and previous.get("content_hash") == digest
+        and all(f in previous for f in CONTENT_DERIVED_FIELDS)
+    )
+    links = None
+    if reparsed:
+        links = extract_links(post.content, site_domain, base=post.link, digest=digest)
+        internal, amazon, other_aff = links
+        derived = {
+            "word_count": count_words(post.content),
+            "internal_links_out": len(internal),
+            "amazon_links": len(amazon),
+            "other_affiliate_links": len(other_aff),
+        }
+    else:
+        derived = {f: previous[f] for f in CONTENT_DERIVED_FIELDS}
+
+    entry = {
+        "post_id": post.id,
+        "url": post.link,
+        "slug": post.slug,
+        "title": strip_html(post.title),
+        "meta_description": extract_meta_description(post),
+        "word_count": derived["word_count"],
+        "status": post.status or "publish",
+        "internal_links_out": derived["internal_links_out"],
+        "amazon_links": derived["amazon_links"],
+        "other_affiliate_links": derived["other_affiliate_links"],
+        "publish_date": post.date,
+        "last_modified": post.modified,
+        "last_modified_gmt": post.modified_gmt,
+        "content_hash": digest,
+        "last_audited_at": datetime.now().isoformat(),
     }
+    return entry, links
 
 
 def main():
@@ -187,74 +258,161 @@ def main():
         sys.exit(1)
 
     site_domain = WP_URL.replace("https://", "").replace("http://", "").split("/")[0]
-    wp_auth = (WP_USERNAME, WP_APP_PASS)
-
-    inventory = load_inventory()
-    posts_dict = inventory.get("posts", {})
-    last_full_crawl = inventory.get("meta", {}).get("last_full_crawl")
-
-    # Decide: full crawl or incremental
-    if last_full_crawl and posts_dict:
-        print(f"Incremental update (last full crawl: {last_full_crawl[:16]})")
-        modified_after = last_full_crawl
-        wp_posts = fetch_all_posts(wp_auth, modified_after=modified_after)
+    wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=TIMEOUT)
+
+    inv = Inventory(SLUG, STATE_DIR)
+    meta = inv.get_meta()
+    previous_posts = inv.all_posts()
+    validators = ValidatorCache(meta.get("validators"))
+    cursor = meta.get("sync_cursor") or compute_cursor(previous_posts)
+    cache = ContentCache(SLUG, state_dir=STATE_DIR)
+
+    # A cold or partial content cache, or a store imported from JSON without
+    # link rows, needs every body once: skip the listing validators (304
+    # pages carry no content) and crawl in full.
+    cache_cold = bool(cache.missing(previous_posts)) or not cache.is_warm()
+    links_missing = not meta.get("links_complete", True)
+    if cache_cold or links_missing:
+        validators = ValidatorCache()
+
+    full = needs_full_reconcile(meta, cursor) or not previous_posts or cache_cold or links_missing
+    modified_after = None if full else cursor_query_after(cursor)
+    if not full and not modified_after:
+        full = True
+
+    if full:
+        if not previous_posts:
+            reason = "no existing inventory"
+        elif cache_cold:
+            reason = "content cache cold"
+        elif links_missing:
+            reason = "link table not populated"
+        else:
+            reason = "reconcile cadence due"
+        print(f"Full crawl ({reason})")
+        wp_posts, ok = fetch_all_posts(wp, validators=validators)
     else:
-        print("Full crawl (no existing inventory)")
-        wp_posts = fetch_all_posts(wp_auth)
+        print(f"Incremental sync (cursor: {cursor['modified_gmt']} GMT, id {cursor['id']})")
+        wp_posts, ok = fetch_all_posts(wp, modified_after=modified_after, validators=validators)
+        wp_posts = [p for p in wp_posts if not already_synced(p, cursor, previous_posts)]
+
+    if not ok:
+        # Keep the existing inventory untouched rather than treating a failed
+        # crawl as an empty site.
+        full = False
+        wp_posts = []
+
+    # Full reconcile rebuilds from what the site returned (unchanged 304 pages
+    # carry their entries over); incremental runs patch the existing dict.
+    if full:
+        posts_dict = {
+            str(pid): previous_posts[str(pid)]
+            for pid in validators.not_modified_ids
+            if str(pid) in previous_posts
+        }
+    else:
+        posts_dict = dict(previous_posts)
 
     # Build/update entries
     updated = 0
+    reparsed = 0
+    parsed_links = {}
+    progress = ProgressReporter("process_posts", total=len(wp_posts), unit="posts")
     for post in wp_posts:
-        entry = build_post_entry(post, site_domain)
-        posts_dict[str(post["id"])] = entry
+        entry, links = build_post_entry(post, site_domain, previous_posts.get(str(post.id)))
+        posts_dict[str(post.id)] = entry
+        if links is not None:
+            parsed_links[post.id] = links
+        cache.put(post)
         updated += 1
+        reparsed += links is not None
+        progress.update(updated)
+    progress.finish(updated)
+
+    skipped = (len(wp_posts) - reparsed) + len(validators.not_modified_ids)
+    not_modified_pages = validators.not_modified_pages
+
+    # Deletions / unpublishes: full crawls already rebuilt the dict; incremental
+    # runs diff against a cheap id-only listing.
+    if not full and ok:
+        live_ids = fetch_live_ids(wp, validators)
+        if live_ids is not None:
+            for pid in [pid for pid in posts_dict if int(pid) not in live_ids]:
+                del posts_dict[pid]
+    removed = len(set(previous_posts) - set(posts_dict))
+
+    if ok:
+        cache.retain(posts_dict)
+        cache.save(complete=True, site=WP_URL)
+
+    run_stats = {
+        "mode": "full" if full else "incremental",
+        "fetched": len(wp_posts),
+        "reparsed": reparsed,
+        "skipped": skipped,
+        "removed": removed,
+        "not_modified_pages": not_modified_pages,
+        "requests": wp.requests_made,
+    }
 
-    # Compute inbound link counts across the inventory
-    all_urls = {p["url"]: pid for pid, p in posts_dict.items()}
-    for pid, entry in posts_dict.items():
-        entry["internal_links_in"] = 0
-    # Simple inbound count: for each post, check which other posts link to it
-    for pid, entry in posts_dict.items():
-        # We don't have the raw link URLs stored, but we have outbound counts.
-        # For a full inbound map we'd need to re-parse content.
-        # For now, we mark posts with 0 outbound as orphans.
-        pass
-
-    # Save
-    inventory["posts"] = posts_dict
-    inventory["meta"] = {
+    # Save: upsert what changed, delete what's gone, then export the JSON copy
+    now = datetime.now().isoformat()
+    new_meta = {
         "site": WP_URL,
         "slug": SLUG,
-        "last_full_crawl": datetime.now().isoformat() if not last_full_crawl else last_full_crawl,
-        "last_updated": datetime.now().isoformat(),
+        "last_full_crawl": now if full and ok else meta.get("last_full_crawl"),
+        "last_updated": now,
+        "sync_cursor": compute_cursor(posts_dict) or cursor,
         "posts_updated_this_run": updated,
         "total_posts": len(posts_dict),
+        "last_run": run_stats,
+        "validators": validators.to_dict(),
+        "links_complete": bool(full and ok) or not links_missing,
     }
-    # If this was a full crawl, update last_full_crawl
-    if not last_full_crawl or not inventory.get("posts"):
-        inventory["meta"]["last_full_crawl"] = datetime.now().isoformat()
-
-    summary = compute_summary(posts_dict)
-    inventory["summary"] = summary
-
-    save_inventory(inventory)
+    # Same lock the write tools take for their deltas, so the commit and the
+    # JSON export never interleave with theirs.
+    with inventory_lock(SLUG, STATE_DIR):
+        with inv.transaction():
+            for post in wp_posts:
+                inv.upsert(posts_dict[str(post.id)])
+                if post.id in parsed_links:
+                    inv.set_links(post.id, *parsed_links[post.id])
+            for pid in set(previous_posts) - set(posts_dict):
+                inv.delete(pid)
+            if parsed_links or removed:
+                inv.update_authority()
+            inv.set_meta(new_meta)
+        summary = inv.summary()
+        inv.export_json(INVENTORY_PATH)
+    inv.close()
 
     # Print summary for agent brain to consume
     print(f"\nInventory saved to {INVENTORY_PATH}")
     print(f"Total posts: {summary.get('total_posts', 0)}")
-    print(f"Orphans (0 outbound links): {summary.get('orphan_count', 0)}")
+    print(f"Orphans (0 inbound links): {summary.get('orphan_count', 0)}")
+    print(f"Posts with 0 outbound links: {summary.get('posts_without_outbound_links', 0)}")
+    print(f"Dead internal links: {summary.get('dead_internal_links', 0)}")
     print(f"Missing meta description: {summary.get('posts_missing_meta_description', 0)}")
     print(f"Posts without Amazon links: {summary.get('posts_without_amazon_links', 0)}")
     print(f"Short posts (<500 words): {summary.get('short_posts_under_500w', 0)}")
     print(f"Average word count: {summary.get('avg_word_count', 0)}")
+    print(
+        f"This run ({run_stats['mode']}): {run_stats['fetched']} fetched, "
+        f"{run_stats['reparsed']} re-parsed, {run_stats['skipped']} skipped, "
+        f"{run_stats['removed']} removed ({run_stats['not_modified_pages']} pages not modified)"
+    )
 
-    # Also write summary as JSON to stdout for ToolRegistry
+    # Hand the summary back to ToolRegistry (stdout copy for manual runs)
     result = {
         "success": True,
         "inventory_path": INVENTORY_PATH,
+        "inventory_db": inv.path,
         "updated": updated,
+        "run": run_stats,
+        "meta": {k: v for k, v in new_meta.items() if k != "validators"},
         "summary": summary,
     }
+    emit_result(result)
     print(f"\n{json.dumps(result)}")
 
 
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Append-only JSONL changelog shared by the write tools.
+
+Each tool appends one JSON object per line to data/{name}.jsonl instead of
+re-reading and rewriting a capped JSON list per entry:
+- append() buffers in memory; commit() writes the batch with one write()
+  under an flock, then flush + fsync
+- the live file rotates to {name}.{timestamp}.jsonl.gz once it passes
+  CHANGELOG_MAX_BYTES or its oldest entry is older than
+  CHANGELOG_MAX_AGE_DAYS; the newest CHANGELOG_KEEP_ROTATED archives are
+  kept, so history is bounded by size rather than truncated at 500 entries
+- tail(n) reads the live file backwards in blocks and only opens archives
+  when it needs more, so the latest entries come back without a full scan
+
+A legacy {name}.json list (newest first) is converted on first use.
+
+Usage:
+    from changelog import Changelog
+    log = Changelog(os.path.join(DATA_DIR, f"meta_changelog_{SLUG}.jsonl"))
+    log.append({"post_id": 1, "at": datetime.now().isoformat()})
+    log.commit()
+    latest = log.tail(20)
+"""
+
+import fcntl
+import glob
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+CHANGELOG_MAX_BYTES = int(os.getenv("CHANGELOG_MAX_BYTES", str(5 * 1024 * 1024)))
+CHANGELOG_MAX_AGE_DAYS = float(os.getenv("CHANGELOG_MAX_AGE_DAYS", "30"))
+CHANGELOG_KEEP_ROTATED = int(os.getenv("CHANGELOG_KEEP_ROTATED", "12"))
+
+READ_BLOCK = 64 * 1024
+
+
+class Changelog:
+    """Buffered, rotating JSONL change log."""
+
+    def __init__(self, path, max_bytes=None, max_age_days=None, keep=None, legacy_json=None):
+        self.path = path
+        self.max_bytes = CHANGELOG_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age_days = CHANGELOG_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self.keep = CHANGELOG_KEEP_ROTATED if keep is None else keep
+        self._buffer = []
+        stem = path[:-len(".jsonl")] if path.endswith(".jsonl") else path
+        self._archive_glob = f"{stem}.*.jsonl.gz"
+        self._archive_prefix = stem
+        if legacy_json is None:
+            legacy_json = stem + ".json"
+        self._migrate(legacy_json)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.commit()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    # ── Writing ─────────────────────────────────────────────────────────
+
+    def append(self, entry):
+        """Buffer one entry; nothing touches disk until commit()."""
+        self._buffer.append(entry)
+
+    def commit(self):
+        """Write buffered entries durably (one write + fsync). Returns count."""
+        if not self._buffer:
+            return 0
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = "".join(json.dumps(e, default=str, ensure_ascii=False) + "\n" for e in self._buffer)
+        with open(self.path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                self._rotate_if_needed(f)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        written = len(self._buffer)
+        self._buffer = []
+        return written
+
+    def _oldest_at(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                first = f.readline()
+            return datetime.fromisoformat(json.loads(first).get("at", ""))
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _rotate_if_needed(self, handle):
+        """Rotate the live file (called with its flock held)."""
+        size = os.fstat(handle.fileno()).st_size
+        if not size:
+            return
+        too_big = size >= self.max_bytes
+        oldest = None if too_big else self._oldest_at()
+        too_old = oldest is not None and datetime.now() - oldest > timedelta(days=self.max_age_days)
+        if not (too_big or too_old):
+            return
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        archive = f"{self._archive_prefix}.{stamp}.jsonl.gz"
+        with open(self.path, "rb") as src, gzip.open(archive, "wb") as dst:
+            while True:
+                chunk = src.read(READ_BLOCK)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        # Truncate in place: other writers hold the same inode and flock.
+        handle.seek(0)
+        handle.truncate()
+        for old in self.archives()[self.keep:]:
+            try:
+                os.unlink(old)
+            except OSError:
+                pass
+
+    def _migrate(self, legacy_json):
+        """Convert a legacy newest-first JSON list into the JSONL file."""
+        if not legacy_json or not os.path.exists(legacy_json) or os.path.exists(self.path):
+            return
+        try:
+            with open(legacy_json, "r") as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if isinstance(entries, list):
+            self._buffer = list(reversed(entries)) + self._buffer
+            self.commit()
+        os.replace(legacy_json, legacy_json + ".migrated")
+
+    # ── Reading ─────────────────────────────────────────────────────────
+
+    def archives(self):
+        """Rotated archives, newest first."""
+        return sorted(glob.glob(self._archive_glob), reverse=True)
+
+    def _reverse_lines(self):
+        """Lines of the live file from last to first, reading blocks backwards."""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return
+        with f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b""
+            while position > 0:
+                step = min(READ_BLOCK, position)
+                position -= step
+                f.seek(position)
+                block = f.read(step) + remainder
+                lines = block.split(b"\n")
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if remainder.strip():
+                yield remainder
+
+    def iter_reverse(self):
+        """Every committed entry, newest first (live file, then archives)."""
+        for line in self._reverse_lines():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+        for archive in self.archives():
+            try:
+                with gzip.open(archive, "rb") as f:
+                    lines = f.read().splitlines()
+            except OSError:
+                continue
+            for line in reversed(lines):
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def tail(self, n=50):
+        """The latest n committed entries, newest first."""
+        out = []
+        for entry in self.iter_reverse():
+            out.append(entry)
+            if len(out) >= n:
+                break
+        return out
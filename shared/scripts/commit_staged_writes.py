@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Commit Staged Writes — write a plan's coalesced post updates.
+
+When a plan has several write steps the agent brain runs them with
+WRITE_STAGE_PATH set, so update_post_meta, inject_internal_links and
+fix_affiliate_links only stage their edits (see write_stage.py).  This tool
+then writes every touched post once and maps each post's outcome back to the
+steps whose edits it carried.  The changelog entries and inventory changes
+the tools logged with each post are applied here, only for posts whose write
+succeeded; records of failed or unchanged posts are dropped.
+
+Stage file: WRITE_STAGE_PATH, or state/write_stage_{slug}.json
+Result:
+    {
+        "posts_written": 3, "noop_writes_skipped": 1, "failed": 0,
+        "steps": {"2:inject_internal_links": {"posts": 2, "written": 2, "failed": 0, "errors": []}, ...},
+        "details": [{"post_id": 12, "status": "ok", "steps": [...], "fields": [...]}, ...]
+    }
+
+Usage:
+    SITE_PREFIX=WP_GRIDDLEKING WRITE_STAGE_PATH=state/write_stage_griddleking.json python3 commit_staged_writes.py
+"""
+
+import json
+import os
+import sys
+
+from dotenv import load_dotenv
+
+from content_cache import ContentCache
+from inventory_store import InventoryDelta
+from tool_protocol import emit_result
+from wp_client import WPClient
+from write_stage import WriteStage
+
+load_dotenv(os.path.join(os.path.dirname(__file__), "../../.env"))
+
+# ── Config ──────────────────────────────────────────────────────────────────
+SITE_PREFIX = os.getenv("SITE_PREFIX", "")
+if SITE_PREFIX:
+    SITE_PREFIX += "_"
+
+WP_URL = os.getenv(f"{SITE_PREFIX}URL", os.getenv("WP_URL", "")).rstrip("/")
+WP_USERNAME = os.getenv(f"{SITE_PREFIX}USERNAME", os.getenv("WP_USERNAME"))
+WP_APP_PASS = os.getenv(f"{SITE_PREFIX}PASSWORD", os.getenv("WP_APP_PASS"))
+TIMEOUT = int(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "../..")
+STATE_DIR = os.path.join(ROOT_DIR, "state")
+
+raw_prefix = os.getenv("SITE_PREFIX", "")
+SLUG = raw_prefix.lower().replace("wp_", "").replace("_", "") if raw_prefix else "default"
+STAGE_PATH = os.getenv("WRITE_STAGE_PATH") or os.path.join(STATE_DIR, f"write_stage_{SLUG}.json")
+
+
+def main():
+    if not WP_URL or not WP_USERNAME or not WP_APP_PASS:
+        print("WordPress credentials missing.")
+        sys.exit(1)
+
+    if not os.path.exists(STAGE_PATH):
+        print("No staged writes found. Nothing to do.")
+        output = {"success": True, "posts_written": 0, "message": "No staged writes"}
+        emit_result(output)
+        print(json.dumps(output))
+        return
+
+    wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=TIMEOUT)
+    content_cache = ContentCache(SLUG)
+    stage = WriteStage.load(STAGE_PATH, wp, content_cache)
+    edits = {pid: list(post_edits) for pid, post_edits in stage.edits.items()}
+    print(f"Committing {len(stage.staged)} staged posts ({sum(len(e) for e in edits.values())} edits)")
+
+    written = stage.flush()
+
+    steps = {}
+    details = []
+    for post_id, outcome in sorted(written.items()):
+        post_steps = list(dict.fromkeys(e.step or e.source for e in edits.get(post_id, [])))
+        status = "noop" if outcome.via == "noop" else ("ok" if outcome.ok else "error")
+        detail = {"post_id": post_id, "status": status, "steps": post_steps}
+        if outcome.error:
+            detail["error"] = outcome.error[:200]
+        details.append(detail)
+        for step in post_steps:
+            entry = steps.setdefault(step, {"posts": 0, "written": 0, "failed": 0, "errors": []})
+            entry["posts"] += 1
+            if status == "ok":
+                entry["written"] += 1
+            elif status == "error":
+                entry["failed"] += 1
+                entry["errors"].append(f"post {post_id}: {outcome.error[:200]}")
+        if status == "error":
+            print(f"Post {post_id} FAILED: {outcome.error}")
+
+    inventory_delta = InventoryDelta()
+    records_logged = stage.apply_records([d["post_id"] for d in details if d["status"] == "ok"], inventory_delta)
+    inventory_delta.commit(SLUG)
+
+    os.unlink(STAGE_PATH)
+    content_cache.save()
+
+    summary = stage.summary()
+    failed = sum(1 for d in details if d["status"] == "error")
+    output = {
+        "success": failed == 0,
+        "posts_written": summary["posts_written"],
+        "noop_writes_skipped": summary["noop_writes_skipped"],
+        "edits_merged": summary["edits_merged"],
+        "failed": failed,
+        "changelog_entries": records_logged,
+        "steps": steps,
+        "details": details,
+    }
+    print(f"\nStaged writes: {summary['posts_written']} posts written, "
+          f"{summary['noop_writes_skipped']} no-op, {failed} failed")
+    emit_result(output)
+    print(json.dumps({k: v for k, v in output.items() if k != "details"}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Per-site post content cache — one crawl feeds every audit tool.
+
+build_site_inventory keeps state/content_cache_{slug}/ in sync with the
+site: an index.json with per-post metadata and content hash, plus one
+gzip-compressed body per post (bodies/{id}-{hash}.html.gz).  Read tools
+(affiliate audit, SEO audit, orphan rescan, content audit) load posts from
+here instead of re-crawling, so once the first sync has run a full audit
+needs no HTTP at all.
+
+Write tools mark the posts they change as stale; readers refresh just those
+posts from WordPress (one request per 100 stale posts) before auditing.
+
+Several tools can hold the same cache at once, so save() never writes back
+a whole stale copy: under an flock on index.json.lock it re-reads the index
+on disk, applies only the entries this process put, removed or invalidated,
+and atomically replaces the file.
+
+Usage:
+    from content_cache import ContentCache, load_posts
+    cache = ContentCache.for_site()
+    posts = load_posts(cache, wp)      # None when the cache is cold
+"""
+
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from wp_client import INVENTORY_FIELDS, WPPost
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "../..")
+STATE_DIR = os.path.join(ROOT_DIR, "state")
+
+# Metadata kept in the index (everything but the body)
+INDEX_FIELDS = ("link", "slug", "status", "title", "excerpt", "date", "modified", "modified_gmt",
+                "yoast_description")
+
+
+def content_hash(html):
+    """Stable fingerprint of a post's rendered content."""
+    return hashlib.sha1((html or "").encode("utf-8")).hexdigest()
+
+
+def site_slug(site_prefix=None):
+    """Slug for a SITE_PREFIX, matching the state file naming convention."""
+    raw = os.getenv("SITE_PREFIX", "") if site_prefix is None else site_prefix
+    return raw.lower().replace("wp_", "").replace("_", "") if raw else "default"
+
+
+class ContentCache:
+    """Compressed post bodies keyed by id + content hash, with a JSON index."""
+
+    def __init__(self, slug, state_dir=STATE_DIR):
+        self.slug = slug
+        self.root = os.path.join(state_dir, f"content_cache_{slug}")
+        self.bodies_dir = os.path.join(self.root, "bodies")
+        self.index_path = os.path.join(self.root, "index.json")
+        self._index = None
+        self._changed = {}  # post id (str) -> entry written by this process, None when removed
+        self._garbage = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_site(cls, site_prefix=None, state_dir=STATE_DIR):
+        return cls(site_slug(site_prefix), state_dir=state_dir)
+
+    # ── Index ───────────────────────────────────────────────────────────
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = self._read_index()
+        return self._index
+
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"slug": self.slug, "complete": False, "synced_at": None, "posts": {}}
+
+    @contextmanager
+    def index_lock(self):
+        """Exclusive advisory lock around the index read-merge-replace."""
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.index_path + ".lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def save(self, complete=None, site=None):
+        """Merge this process's changes into the index on disk, then delete superseded bodies."""
+        if complete is None and not self.index.get("posts") and not os.path.exists(self.index_path):
+            return  # never synced: don't leave an empty cache behind
+        with self.index_lock(), self._lock:
+            index = self._read_index()
+            posts = index.setdefault("posts", {})
+            for pid, entry in self._changed.items():
+                if entry is None:
+                    posts.pop(pid, None)
+                else:
+                    posts[pid] = entry
+            if complete is not None:
+                index["complete"] = complete
+                if complete:
+                    index["synced_at"] = datetime.now().isoformat()
+            if site:
+                index["site"] = site
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(index, f, default=str)
+                os.replace(tmp, self.index_path)
+            except Exception:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+            self._index = index
+            self._changed = {}
+        for path in self._garbage:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self._garbage = []
+
+    def is_warm(self):
+        """True once a full sync has populated every post."""
+        return bool(self.index.get("complete")) and bool(self.index.get("synced_at"))
+
+    def ids(self):
+        return {int(pid) for pid in self.index.get("posts", {})}
+
+    def missing(self, post_ids):
+        """Ids from post_ids that have no cached body."""
+        have = self.index.get("posts", {})
+        return [pid for pid in post_ids if str(pid) not in have]
+
+    def stale_ids(self):
+        return [int(pid) for pid, e in self.index.get("posts", {}).items() if e.get("stale")]
+
+    # ── Bodies ──────────────────────────────────────────────────────────
+
+    def _body_path(self, post_id, digest):
+        return os.path.join(self.bodies_dir, f"{post_id}-{digest[:16]}.html.gz")
+
+    def put(self, post):
+        """Store a WPPost.  Returns True if a new body was written."""
+        digest = content_hash(post.content)
+        entry = {f: getattr(post, f) for f in INDEX_FIELDS}
+        entry["hash"] = digest
+        with self._lock:
+            posts = self.index.setdefault("posts", {})
+            previous = posts.get(str(post.id))
+            path = self._body_path(post.id, digest)
+            wrote = False
+            if not (previous and previous.get("hash") == digest and os.path.exists(path)):
+                os.makedirs(self.bodies_dir, exist_ok=True)
+                tmp = path + ".tmp"
+                with gzip.open(tmp, "wb", compresslevel=6) as f:
+                    f.write((post.content or "").encode("utf-8"))
+                os.replace(tmp, path)
+                wrote = True
+                if previous and previous.get("hash") and previous["hash"] != digest:
+                    self._garbage.append(self._body_path(post.id, previous["hash"]))
+            posts[str(post.id)] = entry
+            self._changed[str(post.id)] = entry
+        return wrote
+
+    def remove(self, post_id):
+        with self._lock:
+            entry = self.index.get("posts", {}).pop(str(post_id), None)
+            self._changed[str(post_id)] = None
+            if entry and entry.get("hash"):
+                self._garbage.append(self._body_path(post_id, entry["hash"]))
+
+    def retain(self, post_ids):
+        """Drop every cached post not in post_ids."""
+        keep = {str(pid) for pid in post_ids}
+        for pid in [pid for pid in self.index.get("posts", {}) if pid not in keep]:
+            self.remove(pid)
+
+    def invalidate(self, post_id):
+        """Mark a post stale after a write so readers refresh it."""
+        with self._lock:
+            entry = self.index.get("posts", {}).get(str(post_id))
+            if entry:
+                entry["stale"] = True
+                self._changed[str(post_id)] = entry
+
+    def get_content(self, post_id):
+        """Decompressed body for a post, or None if missing."""
+        entry = self.index.get("posts", {}).get(str(post_id))
+        if not entry:
+            return None
+        try:
+            with gzip.open(self._body_path(post_id, entry["hash"]), "rb") as f:
+                return f.read().decode("utf-8")
+        except OSError:
+            return None
+
+    def get(self, post_id, include_content=True):
+        entry = self.index.get("posts", {}).get(str(post_id))
+        if not entry:
+            return None
+        data = {f: entry.get(f, "") for f in INDEX_FIELDS}
+        post = WPPost(id=int(post_id), **data)
+        if include_content:
+            content = self.get_content(post_id)
+            if content is None:
+                return None
+            post.content = content
+        return post
+
+    def posts(self, include_content=True):
+        """Every cached post as WPPost (bodies decompressed on demand)."""
+        out = []
+        for pid in sorted(self.index.get("posts", {}), key=int):
+            post = self.get(pid, include_content=include_content)
+            if post is not None:
+                out.append(post)
+        return out
+
+
+def load_posts(cache, wp=None, include_content=True):
+    """Posts for a read tool: cache first, refreshing only stale entries.
+
+    Returns None when the cache is cold (caller falls back to crawling).
+    Stale or unreadable entries are re-fetched in one request per 100 posts
+    when a WPClient is given; without one they are returned as cached.
+    """
+    if not cache.is_warm():
+        return None
+    posts = {p.id: p for p in cache.posts(include_content=include_content)}
+    refresh = set(cache.stale_ids())
+    if include_content:
+        refresh.update(cache.ids() - set(posts))
+    if refresh and wp is not None:
+        ids = sorted(refresh)
+        for start in range(0, len(ids), 100):
+            chunk = ids[start:start + 100]
+            fetched = wp.fetch_all_posts(
+                {"include": ",".join(str(i) for i in chunk), "per_page": 100},
+                fields=INVENTORY_FIELDS,
+                workers=1,
+            )
+            live = {p.id for p in fetched}
+            for post in fetched:
+                cache.put(post)
+                posts[post.id] = post
+            for pid in set(chunk) - live:
+                cache.remove(pid)
+                posts.pop(pid, None)
+        cache.save()
+    return [posts[pid] for pid in sorted(posts)]
@@ -27,19 +27,55 @@ Supported actions:
     - retag: Replace broken_url with fixed_url in the post content
     - insert: Add a new affiliate link after a context phrase
 
+Bulk retag: instead of listing fixes, the instruction file may carry a rule
+that is applied site-wide in one job (the 30-fix cap does not apply):
+{
+    "bulk_retag": {
+        "network": "amazon",
+        "tag": "yourtag-20",        # default: AMAZON_ASSOCIATE_TAG
+        "match": "any",             # "missing", "wrong" or "any" (either)
+        "dry_run": false
+    }
+}
+Every post is crawled once (raw markup, 100 per page); each Amazon link the
+rule matches gets its tag query parameter set with urllib.parse (other
+parameters kept, duplicate tags dropped) and only its href is rewritten.
+Changed posts are written BULK_WRITE_CHUNK at a time through /batch/v1 with
+BULK_WORKERS concurrent requests, always directly (a plan's WRITE_STAGE_PATH
+is ignored) and through a fresh write stage per round.  Each written post's original markup is
+appended to a rollback manifest, data/affiliate_retag_rollback_{slug}_{stamp}.jsonl,
+which --rollback restores (posts edited since the retag are left alone).
+amzn.to short links are expanded with shortlink_resolver (persistent cache)
+and their tags checked against the rule; links with a missing or wrong tag
+are reported under "short_links", not rewritten.  A short link's tag is set
+when it is created in the Associates account, so the fix is a new short link
+rather than an href edit.
+
 Usage:
     SITE_PREFIX=WP_GRIDDLEKING python3 fix_affiliate_links.py
+    SITE_PREFIX=WP_GRIDDLEKING python3 fix_affiliate_links.py --bulk-retag [--tag yourtag-20] [--dry-run]
+    SITE_PREFIX=WP_GRIDDLEKING python3 fix_affiliate_links.py --rollback data/affiliate_retag_rollback_griddleking_20250101-120000.jsonl
 """
 
+import argparse
 import os
 import sys
 import json
-import time
 from datetime import datetime
+from urllib.parse import parse_qsl, quote_plus, unquote_plus, urlsplit, urlunsplit
 
-import requests
 from dotenv import load_dotenv
 
+from changelog import Changelog
+from content_cache import ContentCache, content_hash
+from inventory_store import InventoryDelta
+from link_extractor import extract_links
+from link_injector import replace_href
+from shortlink_resolver import ShortlinkResolver
+from tool_protocol import ProgressReporter, emit_result
+from wp_client import EDIT_FIELDS, MAX_HOST_CONCURRENCY, WPClient
+from write_stage import WriteStage
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "../../.env"))
 
 # ── Config ──────────────────────────────────────────────────────────────────
@@ -51,6 +87,13 @@ WP_URL = os.getenv(f"{SITE_PREFIX}URL", os.getenv("WP_URL", "")).rstrip("/")
 WP_USERNAME = os.getenv(f"{SITE_PREFIX}USERNAME", os.getenv("WP_USERNAME"))
 WP_APP_PASS = os.getenv(f"{SITE_PREFIX}PASSWORD", os.getenv("WP_APP_PASS"))
 TIMEOUT = int(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+AMAZON_TAG = os.getenv(f"{SITE_PREFIX}AMAZON_ASSOCIATE_TAG", os.getenv("AMAZON_ASSOCIATE_TAG", ""))
+
+# Bulk retag: changed posts per write round (and manifest append), and
+# concurrent write requests per round.
+BULK_WRITE_CHUNK = int(os.getenv("AFFILIATE_BULK_WRITE_CHUNK", "100"))
+BULK_WORKERS = int(os.getenv("AFFILIATE_BULK_WORKERS", str(MAX_HOST_CONCURRENCY)))
+BULK_DETAIL_LIMIT = 50  # per-post entries echoed in the result
 
 ROOT_DIR = os.path.join(os.path.dirname(__file__), "../..")
 STATE_DIR = os.path.join(ROOT_DIR, "state")
@@ -59,34 +102,34 @@ DATA_DIR = os.path.join(ROOT_DIR, "data")
 raw_prefix = os.getenv("SITE_PREFIX", "")
 SLUG = raw_prefix.lower().replace("wp_", "").replace("_", "") if raw_prefix else "default"
 INSTRUCTION_PATH = os.path.join(STATE_DIR, f"pending_affiliate_fix_{SLUG}.json")
-CHANGELOG_PATH = os.path.join(DATA_DIR, f"affiliate_fix_changelog_{SLUG}.json")
-INVENTORY_PATH = os.path.join(STATE_DIR, f"inventory_{SLUG}.json")
+CHANGELOG_PATH = os.path.join(DATA_DIR, f"affiliate_fix_changelog_{SLUG}.jsonl")
+ROLLBACK_PREFIX = os.path.join(DATA_DIR, f"affiliate_retag_rollback_{SLUG}_")
+
+wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=TIMEOUT)
+content_cache = ContentCache(SLUG)
+changelog = Changelog(CHANGELOG_PATH)  # buffered; committed once at end of run
+inventory_delta = InventoryDelta()  # applied in one locked commit at end of run
+write_stage = WriteStage.from_env(wp, content_cache)  # one diffed write per post (per plan under WRITE_STAGE_PATH)
 
 
-def get_post(post_id):
-    url = f"{WP_URL}/wp-json/wp/v2/posts/{post_id}"
-    resp = requests.get(url, auth=(WP_USERNAME, WP_APP_PASS), timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
+def get_posts(post_ids):
+    """Fetch posts by ID with their stored (raw) markup, 100 per request."""
+    return write_stage.fetch(post_ids)
 
 
-def update_post_content(post_id, content):
-    url = f"{WP_URL}/wp-json/wp/v2/posts/{post_id}"
-    resp = requests.post(
-        url,
-        json={"content": content},
-        auth=(WP_USERNAME, WP_APP_PASS),
-        timeout=TIMEOUT,
-    )
-    resp.raise_for_status()
-    return resp.json()
+def write_posts(new_content):
+    """Stage {post_id: content} and write each changed post once; returns {post_id: WriteResult}."""
+    for pid, content in new_content.items():
+        write_stage.stage(pid, "fix_affiliate_links", content=content)
+    return write_stage.flush()
 
 
 def apply_retag(content, broken_url, fixed_url):
-    """Replace a broken affiliate URL with the fixed one."""
-    if broken_url not in content:
+    """Point links at broken_url to fixed_url (href values only)."""
+    if not fixed_url or fixed_url == broken_url:
         return content, False
-    return content.replace(broken_url, fixed_url), True
+    content, count = replace_href(content, broken_url, fixed_url)
+    return content, count > 0
 
 
 def apply_insert(content, insert_after, affiliate_url, anchor_text):
@@ -97,30 +140,322 @@ def apply_insert(content, insert_after, affiliate_url, anchor_text):
     return content.replace(insert_after, insert_after + link_html, 1), True
 
 
-def append_changelog(entry):
-    os.makedirs(os.path.dirname(CHANGELOG_PATH), exist_ok=True)
-    log = []
-    if os.path.exists(CHANGELOG_PATH):
-        with open(CHANGELOG_PATH, "r") as f:
-            log = json.load(f)
-    log.insert(0, entry)
-    log = log[:500]
-    with open(CHANGELOG_PATH, "w") as f:
-        json.dump(log, f, indent=2, default=str)
+def append_changelog(post_id, entry, stage=None):
+    """Append to changelog (held with the staged post until it is written in a plan)."""
+    (stage or write_stage).log_change(post_id, changelog, entry)
+
+
+def update_inventory_affiliate(post_id, affiliate_url, delta=1):
+    """Queue an inserted affiliate link and count change (committed at end of run)."""
+    write_stage.update_inventory(post_id, inventory_delta, "increment", "amazon_links", delta)
+    write_stage.update_inventory(post_id, inventory_delta, "add_link", affiliate_url, kind="amazon")
+    write_stage.update_inventory(post_id, inventory_delta, "set", last_audited_at=datetime.now().isoformat())
+
+
+def update_inventory_retag(post_id, broken_url, fixed_url, stage=None):
+    """Queue the swapped link edge for a retag (the link count is unchanged)."""
+    stage = stage or write_stage
+    stage.update_inventory(post_id, inventory_delta, "remove_link", broken_url, kind="amazon")
+    stage.update_inventory(post_id, inventory_delta, "add_link", fixed_url, kind="amazon")
+    stage.update_inventory(post_id, inventory_delta, "set", last_audited_at=datetime.now().isoformat())
+
+
+# ── Bulk retag ──────────────────────────────────────────────────────────────
+
+def set_query_param(url, name, value):
+    """url with query parameter name set to value (first occurrence kept in place, duplicates dropped).
+
+    Only that pair is rewritten; every other query segment is copied byte for
+    byte, so existing encodings (%20 vs +, unescaped commas) survive.
+    """
+    parts = urlsplit(url)
+    pair = f"{quote_plus(name)}={quote_plus(value)}"
+    segments = []
+    seen = False
+    for segment in parts.query.split("&") if parts.query else []:
+        if unquote_plus(segment.partition("=")[0]) == name:
+            if not seen:
+                segments.append(pair)
+            seen = True
+        else:
+            segments.append(segment)
+    if not seen:
+        segments.append(pair)
+    return urlunsplit(parts._replace(query="&".join(segments)))
+
+
+def rule_matches(tag, rule_tag, match):
+    """Whether a link with this tag (None when absent) needs rule_tag."""
+    if tag == rule_tag:
+        return False
+    if match == "missing":
+        return not tag
+    if match == "wrong":
+        return bool(tag)
+    return True
+
+
+def retag_post(post, rule_tag, match):
+    """(content before, content after, [{"from", "to", "links"}] swaps, [amzn.to LinkRecord]) for one post."""
+    before = content = post.editable_content
+    swaps = {}
+    short_links = []
+    for link in extract_links(content, WP_URL, base=post.link):
+        if link.kind == "amzn_to":
+            short_links.append(link)
+        elif link.kind == "amazon" and link.href not in swaps and rule_matches(link.param("tag"), rule_tag, match):
+            swaps[link.href] = set_query_param(link.href, "tag", rule_tag)
+    applied = []
+    for old_url, new_url in swaps.items():
+        content, count = replace_href(content, old_url, new_url)
+        if count:
+            applied.append({"from": old_url, "to": new_url, "links": count})
+    return before, content, applied, short_links
+
+
+def append_manifest(path, entries):
+    """Append rollback entries (one JSON line per written post)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def check_short_links(short_links, rule_tag, match):
+    """Expand the amzn.to links found by a bulk scan and check their tags against the rule."""
+    report = {"total": len(short_links), "ok": 0, "needs_new_link": 0, "unresolved": 0, "issues": []}
+    if not short_links:
+        return report
+    resolver = ShortlinkResolver()
+    progress = ProgressReporter("resolve_short_links", unit="links")
+    resolved = resolver.resolve_many([link.url for _, link in short_links],
+                                     on_progress=lambda done, total: progress.update(done, total=total))
+    resolver.save()
+    progress.finish(len(resolved))
+    for post_id, link in short_links:
+        destination = resolved.get(link.url)
+        if not destination:
+            report["unresolved"] += 1
+            issue = {"post_id": post_id, "url": link.href, "issue": "unresolved"}
+        else:
+            tag = dict(parse_qsl(urlsplit(destination).query)).get("tag")
+            if not rule_matches(tag, rule_tag, match):
+                report["ok"] += 1
+                continue
+            report["needs_new_link"] += 1
+            issue = {"post_id": post_id, "url": link.href, "resolved_url": destination,
+                     "issue": "wrong_tag" if tag else "missing_tag"}
+        if len(report["issues"]) < BULK_DETAIL_LIMIT:
+            report["issues"].append(issue)
+    return report
+
+
+def bulk_stage():
+    """A direct WriteStage for one bulk round.
+
+    Bulk jobs always write immediately (a plan's WRITE_STAGE_PATH is ignored)
+    and use a fresh stage per round, so fetched bodies don't pile up in memory.
+    """
+    return WriteStage(wp, content_cache)
+
+
+def add_write_summary(writes, stage):
+    for key, value in stage.summary().items():
+        writes[key] = writes.get(key, 0) + value
+
+
+def write_bulk_chunk(chunk, manifest_path, totals, details):
+    """Write one round of retagged posts; record outcomes, changelog and manifest."""
+    stage = bulk_stage()
+    for post, before, after, swaps in chunk:
+        stage.add_post(post)
+        stage.stage(post.id, "fix_affiliate_links:bulk_retag", content=after)
+    written = stage.flush(workers=BULK_WORKERS)
+    add_write_summary(totals["writes"], stage)
+
+    manifest = []
+    now = datetime.now().isoformat()
+    for post, before, after, swaps in chunk:
+        outcome = written[post.id]
+        links = sum(s["links"] for s in swaps)
+        if not outcome.ok:
+            totals["failed"] += 1
+            print(f"Post {post.id} FAILED: {outcome.error}")
+            details.append({"post_id": post.id, "status": "error", "error": outcome.error[:200]})
+            continue
+        totals["posts_changed"] += 1
+        totals["links_retagged"] += links
+        manifest.append({
+            "post_id": post.id,
+            "url": post.link,
+            "before_hash": content_hash(before),
+            "after_hash": content_hash(after),
+            "swaps": swaps,
+            "before": before,
+        })
+        append_changelog(post.id, {"post_id": post.id, "url": post.link, "action": "bulk_retag", "links": links, "at": now},
+                         stage)
+        for swap in swaps:
+            update_inventory_retag(post.id, swap["from"], swap["to"], stage)
+        if len(details) < BULK_DETAIL_LIMIT:
+            details.append({"post_id": post.id, "status": "ok", "links_retagged": links})
+    append_manifest(manifest_path, manifest)
+    changelog.commit()
+
+
+def run_bulk_retag(rule):
+    """Apply a retag rule to every published post; returns the tool result."""
+    network = rule.get("network", "amazon")
+    rule_tag = rule.get("tag") or AMAZON_TAG
+    match = rule.get("match", "any")
+    dry_run = bool(rule.get("dry_run"))
+    if network != "amazon":
+        return {"success": False, "mode": "bulk_retag", "error": f"Unsupported network: {network}"}
+    if not rule_tag:
+        return {"success": False, "mode": "bulk_retag", "error": "No tag given and AMAZON_ASSOCIATE_TAG is not set"}
+    if match not in ("any", "missing", "wrong"):
+        return {"success": False, "mode": "bulk_retag", "error": f"Unknown match: {match}"}
+
+    started = datetime.now()
+    manifest_path = f"{ROLLBACK_PREFIX}{started.strftime('%Y%m%d-%H%M%S')}.jsonl"
+    print(f"Bulk retag: Amazon links ({match} tag) -> tag={rule_tag}{' [dry run]' if dry_run else ''}")
+
+    totals = {"posts_scanned": 0, "posts_changed": 0, "links_retagged": 0, "failed": 0, "writes": {}}
+    details = []
+    pending = []
+    short_links = []  # (post_id, LinkRecord)
+    would_change = 0
+    progress = ProgressReporter("bulk_retag", unit="pages")
+    page = 0
+    for page, total_pages, batch in wp.iter_post_pages(params={"status": "publish"}, fields=EDIT_FIELDS,
+                                                       context="edit"):
+        for post in batch:
+            totals["posts_scanned"] += 1
+            before, after, swaps, post_short_links = retag_post(post, rule_tag, match)
+            short_links.extend((post.id, link) for link in post_short_links)
+            if not swaps:
+                continue
+            if dry_run:
+                would_change += 1
+                totals["links_retagged"] += sum(s["links"] for s in swaps)
+                if len(details) < BULK_DETAIL_LIMIT:
+                    details.append({"post_id": post.id, "status": "would_update", "swaps": swaps})
+                continue
+            pending.append((post, before, after, swaps))
+        if len(pending) >= BULK_WRITE_CHUNK:
+            write_bulk_chunk(pending, manifest_path, totals, details)
+            pending = []
+        progress.update(page, total=total_pages, posts=totals["posts_scanned"],
+                        changed=totals["posts_changed"] + would_change)
+    if pending:
+        write_bulk_chunk(pending, manifest_path, totals, details)
+    progress.finish(page, posts=totals["posts_scanned"])
+    short_report = check_short_links(short_links, rule_tag, match)
+
+    if dry_run:
+        totals["posts_changed"] = would_change
+    wrote_manifest = os.path.exists(manifest_path)
+    print(f"\nBulk retag: {totals['posts_scanned']} posts scanned, {totals['posts_changed']} "
+          f"{'would change' if dry_run else 'changed'}, {totals['links_retagged']} links retagged, "
+          f"{totals['failed']} failed")
+    print(f"amzn.to links: {short_report['total']} found, {short_report['needs_new_link']} with a missing or wrong tag, "
+          f"{short_report['unresolved']} unresolved")
+    if wrote_manifest:
+        print(f"Rollback manifest: {os.path.relpath(manifest_path, ROOT_DIR)}")
+    return {
+        "success": totals["failed"] == 0,
+        "mode": "bulk_retag",
+        "dry_run": dry_run,
+        "tag": rule_tag,
+        "match": match,
+        **totals,
+        "short_links": short_report,
+        "rollback_manifest": os.path.relpath(manifest_path, ROOT_DIR) if wrote_manifest else None,
+        "details": details,
+    }
 
 
-def update_inventory_affiliate(post_id, delta=1):
-    """Adjust affiliate link count in inventory."""
-    if not os.path.exists(INVENTORY_PATH):
-        return
-    with open(INVENTORY_PATH, "r") as f:
-        inv = json.load(f)
-    entry = inv.get("posts", {}).get(str(post_id))
-    if entry:
-        entry["amazon_links"] = max(0, entry.get("amazon_links", 0) + delta)
-        entry["last_audited_at"] = datetime.now().isoformat()
-        with open(INVENTORY_PATH, "w") as f:
-            json.dump(inv, f, indent=2, default=str)
+def rollback_chunk(entries, details, writes):
+    """Restore one round of manifest entries through a fresh direct stage."""
+    stage = bulk_stage()
+    posts = stage.fetch(entries)
+    restore = {}
+    for post_id, entry in entries.items():
+        if post_id not in posts:
+            details.append({"post_id": post_id, "status": "error", "error": "post not found"})
+        elif content_hash(stage.current(post_id)) != entry["after_hash"]:
+            details.append({"post_id": post_id, "status": "skipped", "reason": "edited since the retag"})
+        else:
+            restore[post_id] = entry
+            stage.stage(post_id, "fix_affiliate_links:rollback", content=entry["before"])
+    written = stage.flush(workers=BULK_WORKERS)
+    add_write_summary(writes, stage)
+
+    now = datetime.now().isoformat()
+    for post_id, entry in restore.items():
+        outcome = written[post_id]
+        if not outcome.ok:
+            details.append({"post_id": post_id, "status": "error", "error": outcome.error[:200]})
+            continue
+        append_changelog(post_id, {"post_id": post_id, "url": entry["url"], "action": "rollback_retag", "at": now},
+                         stage)
+        for swap in entry["swaps"]:
+            update_inventory_retag(post_id, swap["to"], swap["from"], stage)
+        details.append({"post_id": post_id, "status": "ok"})
+    changelog.commit()
+
+
+def run_rollback(manifest_path):
+    """Restore the markup a bulk retag replaced, for posts not edited since."""
+    with open(manifest_path, "r") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    entries = {entry["post_id"]: entry for entry in entries}
+
+    details = []
+    writes = {}
+    ids = list(entries)
+    progress = ProgressReporter("rollback_retag", total=len(ids), unit="posts")
+    for start in range(0, len(ids), BULK_WRITE_CHUNK):
+        rollback_chunk({pid: entries[pid] for pid in ids[start:start + BULK_WRITE_CHUNK]}, details, writes)
+        progress.update(min(start + BULK_WRITE_CHUNK, len(ids)))
+    progress.finish(len(ids))
+
+    statuses = [d["status"] for d in details]
+    print(f"\nRollback: {statuses.count('ok')} posts restored, {statuses.count('skipped')} skipped, "
+          f"{statuses.count('error')} failed")
+    return {
+        "success": "error" not in statuses,
+        "mode": "rollback",
+        "manifest": os.path.basename(manifest_path),
+        "restored": statuses.count("ok"),
+        "skipped": statuses.count("skipped"),
+        "failed": statuses.count("error"),
+        "writes": writes,
+        "details": details,
+    }
+
+
+def finish(output):
+    write_stage.finish()
+    changelog.commit()
+    content_cache.save()
+    inventory_delta.commit(SLUG)
+    emit_result(output)
+    print(json.dumps({k: v for k, v in output.items() if k != "details"}))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fix broken or untagged affiliate links.")
+    parser.add_argument("--bulk-retag", action="store_true",
+                        help="Retag every Amazon link whose tag is not --tag (no instruction file needed)")
+    parser.add_argument("--tag", default="", help="Tag for --bulk-retag (default: AMAZON_ASSOCIATE_TAG)")
+    parser.add_argument("--match", choices=("any", "missing", "wrong"), default="any",
+                        help="Which links --bulk-retag rewrites: missing tag, wrong tag, or either")
+    parser.add_argument("--dry-run", action="store_true", help="Report what --bulk-retag would change")
+    parser.add_argument("--rollback", metavar="MANIFEST", help="Undo a bulk retag from its rollback manifest")
+    return parser.parse_args(argv)
 
 
 def main():
@@ -128,18 +463,36 @@ def main():
         print("WordPress credentials missing.")
         sys.exit(1)
 
+    args = parse_args()
+    if args.rollback:
+        finish(run_rollback(args.rollback))
+        return
+    if args.bulk_retag:
+        finish(run_bulk_retag({"tag": args.tag, "match": args.match, "dry_run": args.dry_run}))
+        return
+
     if not os.path.exists(INSTRUCTION_PATH):
         print("No pending affiliate fixes found. Nothing to do.")
-        print(json.dumps({"success": True, "fixed": 0, "message": "No pending instructions"}))
+        output = {"success": True, "fixed": 0, "message": "No pending instructions"}
+        emit_result(output)
+        print(json.dumps(output))
         return
 
     with open(INSTRUCTION_PATH, "r") as f:
         instructions = json.load(f)
 
+    if instructions.get("bulk_retag"):
+        output = run_bulk_retag(instructions["bulk_retag"])
+        os.unlink(INSTRUCTION_PATH)
+        finish(output)
+        return
+
     fixes = instructions.get("fixes", [])
     if not fixes:
         os.unlink(INSTRUCTION_PATH)
-        print(json.dumps({"success": True, "fixed": 0, "message": "Empty instruction file"}))
+        output = {"success": True, "fixed": 0, "message": "Empty instruction file"}
+        emit_result(output)
+        print(json.dumps(output))
         return
 
     succeeded = 0
@@ -154,10 +507,24 @@ def main():
         if pid:
             by_post.setdefault(pid, []).append(fix)
 
+    try:
+        posts = get_posts(by_post)
+    except Exception as e:
+        print(f"Fetching posts FAILED: {e}")
+        posts = {}
+
+    # Apply every fix locally, then write the changed posts in one pass.
+    pending = {}  # post_id -> (post, new content, changes)
     for post_id, post_fixes in by_post.items():
+        post = posts.get(int(post_id))
+        if post is None:
+            failed += len(post_fixes)
+            print(f"Post {post_id} FAILED: not found")
+            results.append({"post_id": post_id, "status": "error", "error": "post not found"})
+            continue
+
         try:
-            post = get_post(post_id)
-            content = post["content"]["rendered"]
+            content = write_stage.current(post.id)
             original = content
             changes = []
 
@@ -183,32 +550,44 @@ def main():
                     changes.append({"action": action, "fix": fix})
                 else:
                     skipped += 1
-
-            if content != original and changes:
-                update_post_content(post_id, content)
-                succeeded += len(changes)
-                print(f"Post {post_id}: applied {len(changes)} affiliate fixes")
-
-                for ch in changes:
-                    append_changelog({
-                        "post_id": post_id,
-                        "url": post.get("link", ""),
-                        "action": ch["action"],
-                        "at": datetime.now().isoformat(),
-                    })
-                    if ch["action"] == "insert":
-                        update_inventory_affiliate(post_id, delta=1)
-
-                results.append({"post_id": post_id, "fixes_applied": len(changes), "status": "ok"})
-            else:
-                results.append({"post_id": post_id, "fixes_applied": 0, "status": "skipped"})
-
-            time.sleep(0.5)
-
         except Exception as e:
             failed += len(post_fixes)
             print(f"Post {post_id} FAILED: {e}")
             results.append({"post_id": post_id, "status": "error", "error": str(e)[:200]})
+            continue
+
+        if content != original and changes:
+            pending[post_id] = (post, content, changes)
+        else:
+            results.append({"post_id": post_id, "fixes_applied": 0, "status": "skipped"})
+
+    written = write_posts({int(pid): content for pid, (_, content, _) in pending.items()})
+
+    for post_id, (post, _, changes) in pending.items():
+        outcome = written[int(post_id)]
+        if not outcome.ok:
+            failed += len(by_post[post_id])
+            print(f"Post {post_id} FAILED: {outcome.error}")
+            results.append({"post_id": post_id, "status": "error", "error": outcome.error[:200]})
+            continue
+
+        staged = outcome.via == "staged"
+        succeeded += len(changes)
+        print(f"Post {post_id}: {'staged' if staged else 'applied'} {len(changes)} affiliate fixes")
+
+        for ch in changes:
+            append_changelog(post_id, {
+                "post_id": post_id,
+                "url": post.link,
+                "action": ch["action"],
+                "at": datetime.now().isoformat(),
+            })
+            if ch["action"] == "insert":
+                update_inventory_affiliate(post_id, ch["fix"].get("affiliate_url", ""))
+            elif ch["action"] == "retag":
+                update_inventory_retag(post_id, ch["fix"].get("broken_url", ""), ch["fix"].get("fixed_url", ""))
+
+        results.append({"post_id": post_id, "fixes_applied": len(changes), "status": "staged" if staged else "ok"})
 
     os.unlink(INSTRUCTION_PATH)
 
@@ -217,9 +596,15 @@ def main():
         "fixed": succeeded,
         "failed": failed,
         "skipped": skipped,
+        "writes": write_stage.summary(),
         "details": results,
     }
     print(f"\nAffiliate fixes: {succeeded} applied, {skipped} skipped, {failed} failed")
+    write_stage.finish()
+    changelog.commit()
+    content_cache.save()
+    inventory_delta.commit(SLUG)
+    emit_result(output)
     print(json.dumps(output))
 
 
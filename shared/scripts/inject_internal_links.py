@@ -22,14 +22,19 @@ Usage:
 
 import os
 import sys
-import re
 import json
-import time
 from datetime import datetime
 
-import requests
 from dotenv import load_dotenv
 
+from changelog import Changelog
+from content_cache import ContentCache
+from inventory_store import InventoryDelta
+from link_injector import Injection, inject_links
+from tool_protocol import emit_result
+from wp_client import WPClient
+from write_stage import WriteStage
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "../../.env"))
 
 # ── Config ──────────────────────────────────────────────────────────────────
@@ -49,85 +54,52 @@ DATA_DIR = os.path.join(ROOT_DIR, "data")
 raw_prefix = os.getenv("SITE_PREFIX", "")
 SLUG = raw_prefix.lower().replace("wp_", "").replace("_", "") if raw_prefix else "default"
 INSTRUCTION_PATH = os.path.join(STATE_DIR, f"pending_link_inject_{SLUG}.json")
-CHANGELOG_PATH = os.path.join(DATA_DIR, f"link_inject_changelog_{SLUG}.json")
-INVENTORY_PATH = os.path.join(STATE_DIR, f"inventory_{SLUG}.json")
-
-
-def get_post(post_id):
-    """Fetch a post by ID."""
-    url = f"{WP_URL}/wp-json/wp/v2/posts/{post_id}"
-    resp = requests.get(url, auth=(WP_USERNAME, WP_APP_PASS), timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def update_post_content(post_id, content):
-    """Update post content via WordPress REST API."""
-    url = f"{WP_URL}/wp-json/wp/v2/posts/{post_id}"
-    resp = requests.post(
-        url,
-        json={"content": content},
-        auth=(WP_USERNAME, WP_APP_PASS),
-        timeout=TIMEOUT,
-    )
-    resp.raise_for_status()
-    return resp.json()
-
-
-def inject_link(content, target_url, anchor_text, context_hint=""):
-    """Inject an internal link into content. Returns (new_content, success)."""
-    # Don't duplicate — check if target URL already linked
-    if target_url in content:
-        return content, False
-
-    link_tag = f'<a href="{target_url}">{anchor_text}</a>'
-
-    # Strategy 1: If we have a context hint, find it and inject
-    if context_hint and context_hint in content:
-        if anchor_text in context_hint:
-            new_context = context_hint.replace(anchor_text, link_tag, 1)
-            return content.replace(context_hint, new_context, 1), True
-
-    # Strategy 2: Find the anchor text directly in content (not already linked)
-    # Make sure we don't link text that's already inside an <a> tag
-    pattern = re.compile(
-        rf'(?<!<a[^>]*>)(?<!["\'/])\b({re.escape(anchor_text)})\b(?![^<]*</a>)',
-        re.IGNORECASE,
-    )
-    match = pattern.search(content)
-    if match:
-        start, end = match.span()
-        new_content = content[:start] + link_tag + content[end:]
-        return new_content, True
-
-    return content, False
-
-
-def append_changelog(entry):
-    """Append to changelog."""
-    os.makedirs(os.path.dirname(CHANGELOG_PATH), exist_ok=True)
-    log = []
-    if os.path.exists(CHANGELOG_PATH):
-        with open(CHANGELOG_PATH, "r") as f:
-            log = json.load(f)
-    log.insert(0, entry)
-    log = log[:500]
-    with open(CHANGELOG_PATH, "w") as f:
-        json.dump(log, f, indent=2, default=str)
-
-
-def update_inventory_links(source_post_id):
-    """Increment the outbound link count in inventory for the source post."""
-    if not os.path.exists(INVENTORY_PATH):
-        return
-    with open(INVENTORY_PATH, "r") as f:
-        inv = json.load(f)
-    entry = inv.get("posts", {}).get(str(source_post_id))
-    if entry:
-        entry["internal_links_out"] = entry.get("internal_links_out", 0) + 1
-        entry["last_audited_at"] = datetime.now().isoformat()
-        with open(INVENTORY_PATH, "w") as f:
-            json.dump(inv, f, indent=2, default=str)
+CHANGELOG_PATH = os.path.join(DATA_DIR, f"link_inject_changelog_{SLUG}.jsonl")
+
+wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=TIMEOUT)
+content_cache = ContentCache(SLUG)
+changelog = Changelog(CHANGELOG_PATH)  # buffered; committed once at end of run
+inventory_delta = InventoryDelta()  # applied in one locked commit at end of run
+write_stage = WriteStage.from_env(wp, content_cache)  # one diffed write per post (per plan under WRITE_STAGE_PATH)
+
+
+def get_posts(post_ids):
+    """Fetch posts by ID with their stored (raw) markup, 100 per request."""
+    return write_stage.fetch(post_ids)
+
+
+def write_posts(new_content):
+    """Stage {post_id: content} and write each changed post once.
+
+    Returns {post_id: WriteResult}.
+    """
+    for pid, content in new_content.items():
+        write_stage.stage(pid, "inject_internal_links", content=content)
+    return write_stage.flush()
+
+
+def inject_post_links(post, links):
+    """Apply every injection for one post in a single pass.
+
+    Returns (new_content, [Injection]) — see link_injector.inject_links.
+    """
+    requested = [
+        Injection(link.get("target_url", ""), link.get("anchor_text", ""), link.get("context_hint", ""))
+        for link in links
+    ]
+    return inject_links(write_stage.current(post.id), requested, base_url=post.link)
+
+
+def append_changelog(source_post_id, entry):
+    """Append to changelog (held with the staged post until it is written in a plan)."""
+    write_stage.log_change(source_post_id, changelog, entry)
+
+
+def update_inventory_links(source_post_id, target_url):
+    """Queue the new edge and +1 outbound link for the source post (committed at end of run)."""
+    write_stage.update_inventory(source_post_id, inventory_delta, "increment", "internal_links_out", 1)
+    write_stage.update_inventory(source_post_id, inventory_delta, "add_link", target_url)
+    write_stage.update_inventory(source_post_id, inventory_delta, "set", last_audited_at=datetime.now().isoformat())
 
 
 def main():
@@ -137,7 +109,9 @@ def main():
 
     if not os.path.exists(INSTRUCTION_PATH):
         print("No pending link injections found. Nothing to do.")
-        print(json.dumps({"success": True, "injected": 0, "message": "No pending instructions"}))
+        output = {"success": True, "injected": 0, "message": "No pending instructions"}
+        emit_result(output)
+        print(json.dumps(output))
         return
 
     with open(INSTRUCTION_PATH, "r") as f:
@@ -146,7 +120,9 @@ def main():
     injections = instructions.get("injections", [])
     if not injections:
         os.unlink(INSTRUCTION_PATH)
-        print(json.dumps({"success": True, "injected": 0, "message": "Empty instruction file"}))
+        output = {"success": True, "injected": 0, "message": "Empty instruction file"}
+        emit_result(output)
+        print(json.dumps(output))
         return
 
     succeeded = 0
@@ -154,68 +130,82 @@ def main():
     skipped = 0
     results = []
 
-    # Group by source post to batch updates
+    # Group by source post so each post is written once
     by_source = {}
     for inj in injections[:30]:  # Safety cap
         src = inj.get("source_post_id")
         if src:
             by_source.setdefault(src, []).append(inj)
 
+    try:
+        posts = get_posts(by_source)
+    except Exception as e:
+        print(f"Fetching source posts FAILED: {e}")
+        posts = {}
+
+    # Edit every post locally, then write them all in one pass.
+    pending = {}  # source_post_id -> (post, new content, links added, not applied)
     for source_post_id, links in by_source.items():
-        try:
-            post = get_post(source_post_id)
-            content = post["content"]["rendered"]
-            original = content
-            links_added = []
-
-            for link in links:
-                target_url = link.get("target_url", "")
-                anchor_text = link.get("anchor_text", "")
-                context_hint = link.get("context_hint", "")
-
-                if not target_url or not anchor_text:
-                    skipped += 1
-                    continue
-
-                content, was_injected = inject_link(content, target_url, anchor_text, context_hint)
-                if was_injected:
-                    links_added.append({"target": target_url, "anchor": anchor_text})
-
-            if content != original and links_added:
-                update_post_content(source_post_id, content)
-                succeeded += len(links_added)
-                print(f"Post {source_post_id}: injected {len(links_added)} links")
-
-                for la in links_added:
-                    append_changelog({
-                        "source_post_id": source_post_id,
-                        "source_url": post.get("link", ""),
-                        "target_url": la["target"],
-                        "anchor_text": la["anchor"],
-                        "at": datetime.now().isoformat(),
-                    })
-                    update_inventory_links(source_post_id)
-
-                results.append({
-                    "source_post_id": source_post_id,
-                    "links_added": len(links_added),
-                    "status": "ok",
-                })
-            else:
-                skipped += len(links)
-                results.append({
-                    "source_post_id": source_post_id,
-                    "links_added": 0,
-                    "status": "skipped",
-                    "reason": "no suitable injection points or links already exist",
-                })
-
-            time.sleep(0.5)
+        post = posts.get(int(source_post_id))
+        if post is None:
+            failed += len(links)
+            print(f"Post {source_post_id} FAILED: not found")
+            results.append({"source_post_id": source_post_id, "status": "error", "error": "post not found"})
+            continue
 
+        try:
+            content, outcomes = inject_post_links(post, links)
         except Exception as e:
             failed += len(links)
             print(f"Post {source_post_id} FAILED: {e}")
             results.append({"source_post_id": source_post_id, "status": "error", "error": str(e)[:200]})
+            continue
+
+        links_added = [{"target": o.target_url, "anchor": o.linked_text} for o in outcomes if o.applied]
+        not_applied = [{"target": o.target_url, "reason": o.reason} for o in outcomes if not o.applied]
+        if links_added:
+            pending[source_post_id] = (post, content, links_added, not_applied)
+        else:
+            skipped += len(links)
+            results.append({
+                "source_post_id": source_post_id,
+                "links_added": 0,
+                "status": "skipped",
+                "reason": "no suitable injection points or links already exist",
+                "not_applied": not_applied,
+            })
+
+    written = write_posts({int(pid): content for pid, (_, content, _, _) in pending.items()})
+
+    for source_post_id, (post, _, links_added, not_applied) in pending.items():
+        outcome = written[int(source_post_id)]
+        if not outcome.ok:
+            failed += len(by_source[source_post_id])
+            print(f"Post {source_post_id} FAILED: {outcome.error}")
+            results.append({"source_post_id": source_post_id, "status": "error", "error": outcome.error[:200]})
+            continue
+
+        staged = outcome.via == "staged"
+        succeeded += len(links_added)
+        skipped += len(not_applied)
+        print(f"Post {source_post_id}: {'staged' if staged else 'injected'} {len(links_added)} links")
+
+        for la in links_added:
+            append_changelog(source_post_id, {
+                "source_post_id": source_post_id,
+                "source_url": post.link,
+                "target_url": la["target"],
+                "anchor_text": la["anchor"],
+                "at": datetime.now().isoformat(),
+            })
+            update_inventory_links(source_post_id, la["target"])
+
+        results.append({
+            "source_post_id": source_post_id,
+            "links_added": len(links_added),
+            "status": "staged" if staged else "ok",
+            "not_applied": not_applied,
+        })
 
     os.unlink(INSTRUCTION_PATH)
 
@@ -224,9 +214,15 @@ def main():
         "injected": succeeded,
         "failed": failed,
         "skipped": skipped,
+        "writes": write_stage.summary(),
         "details": results,
     }
     print(f"\nLink injection: {succeeded} injected, {skipped} skipped, {failed} failed")
+    write_stage.finish()
+    changelog.commit()
+    content_cache.save()
+    inventory_delta.commit(SLUG)
+    emit_result(output)
     print(json.dumps(output))
 
 
@@ -0,0 +1,669 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed site inventory — indexed posts, links and per-post metrics.
+
+state/inventory_{slug}.db replaces the single state/inventory_{slug}.json
+document as the source of truth:
+- posts:   one row per post (url, title, meta description, dates, hash)
+- metrics: word count, link counts and internal authority (PageRank,
+           mean 1.0) per post, indexed for the usual filters (orphans,
+           short posts, posts without Amazon links, top authorities)
+- links:   outbound link URLs per post, by kind (internal/amazon/affiliate);
+           internal targets are normalized (link_graph.normalize_url) and
+           resolved to target_id through posts.url_key
+- meta:    crawl bookkeeping (sync cursor, last run, validators) as JSON
+
+Write tools collect their changes in an InventoryDelta and commit them in
+one transaction at the end of the run.  Every commit that also re-exports
+the JSON copy holds inventory_lock(slug) (an flock on
+state/inventory_{slug}.lock), the same rule build_site_inventory follows,
+so a crawl and a write tool never interleave their exports.  Deltas are
+relative (counter increments, field sets) and applied against the rows as
+they are at commit time, so a crawl that committed meanwhile keeps its
+results and the tool's change lands on top.
+
+The link graph is maintained incrementally: set_links(), add_link(),
+remove_link(), upsert() and delete() diff a post's resolved outbound edges
+and adjust the targets' internal_links_in counters, so a crawl that
+re-parses a handful of posts (or a write tool adding one link) costs
+O(edges changed) rather than a rebuild of every edge.  update_authority()
+then re-scores the whole graph (a fraction of a second for 50k edges).
+
+build_site_inventory still exports the JSON file after each run so older
+readers (AgentBrain, ad-hoc scripts) keep working.  On first open an
+existing JSON inventory is imported.
+
+Usage:
+    from inventory_store import Inventory
+    with Inventory.open(slug) as inv:
+        for post in inv.orphans():
+            print(post["url"])
+"""
+
+import fcntl
+import json
+import os
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+
+from link_graph import is_post_candidate, normalize_url, pagerank
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "../..")
+STATE_DIR = os.path.join(ROOT_DIR, "state")
+
+SHORT_POST_WORDS = 500
+
+POST_COLUMNS = (
+    "post_id", "url", "slug", "title", "meta_description", "status", "publish_date",
+    "last_modified", "last_modified_gmt", "content_hash", "last_audited_at",
+)
+METRIC_COLUMNS = (
+    "word_count", "internal_links_out", "internal_links_in", "amazon_links", "other_affiliate_links",
+    "authority",
+)
+# Maintained by the link graph, never taken from upserted entries.
+GRAPH_COLUMNS = ("internal_links_in", "authority")
+LINK_KINDS = ("internal", "amazon", "affiliate")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    post_id           INTEGER PRIMARY KEY,
+    url               TEXT NOT NULL DEFAULT '',
+    slug              TEXT NOT NULL DEFAULT '',
+    title             TEXT NOT NULL DEFAULT '',
+    meta_description  TEXT NOT NULL DEFAULT '',
+    status            TEXT NOT NULL DEFAULT 'publish',
+    publish_date      TEXT,
+    last_modified     TEXT,
+    last_modified_gmt TEXT,
+    content_hash      TEXT,
+    last_audited_at   TEXT,
+    url_key           TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_posts_url ON posts(url);
+CREATE INDEX IF NOT EXISTS idx_posts_modified_gmt ON posts(last_modified_gmt, post_id);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    post_id               INTEGER PRIMARY KEY REFERENCES posts(post_id) ON DELETE CASCADE,
+    word_count            INTEGER NOT NULL DEFAULT 0,
+    internal_links_out    INTEGER NOT NULL DEFAULT 0,
+    internal_links_in     INTEGER NOT NULL DEFAULT 0,
+    amazon_links          INTEGER NOT NULL DEFAULT 0,
+    other_affiliate_links INTEGER NOT NULL DEFAULT 0,
+    authority             REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_links_out ON metrics(internal_links_out);
+CREATE INDEX IF NOT EXISTS idx_metrics_links_in ON metrics(internal_links_in);
+CREATE INDEX IF NOT EXISTS idx_metrics_word_count ON metrics(word_count);
+CREATE INDEX IF NOT EXISTS idx_metrics_amazon ON metrics(amazon_links);
+
+CREATE TABLE IF NOT EXISTS links (
+    source_id  INTEGER NOT NULL REFERENCES posts(post_id) ON DELETE CASCADE,
+    target_url TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    count      INTEGER NOT NULL DEFAULT 1,
+    target_id  INTEGER,
+    PRIMARY KEY (source_id, kind, target_url)
+);
+CREATE INDEX IF NOT EXISTS idx_links_target ON links(target_url);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Columns added after the first release: (table, column, declaration).
+# Databases that predate them get an ALTER TABLE and a link graph rebuild.
+ADDED_COLUMNS = (
+    ("posts", "url_key", "TEXT"),
+    ("links", "target_id", "INTEGER"),
+    ("metrics", "authority", "REAL NOT NULL DEFAULT 0"),
+)
+
+GRAPH_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_posts_url_key ON posts(url_key);
+CREATE INDEX IF NOT EXISTS idx_links_target_id ON links(target_id);
+CREATE INDEX IF NOT EXISTS idx_metrics_authority ON metrics(authority);
+"""
+
+HUB_COUNT = 10
+DEAD_LINK_SAMPLES = 20
+
+
+def lock_path_for(slug, state_dir=STATE_DIR):
+    return os.path.join(state_dir, f"inventory_{slug}.lock")
+
+
+@contextmanager
+def inventory_lock(slug, state_dir=STATE_DIR):
+    """Exclusive advisory lock around inventory commits and JSON exports."""
+    os.makedirs(state_dir, exist_ok=True)
+    with open(lock_path_for(slug, state_dir), "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def db_path_for(slug, state_dir=STATE_DIR):
+    return os.path.join(state_dir, f"inventory_{slug}.db")
+
+
+def json_path_for(slug, state_dir=STATE_DIR):
+    return os.path.join(state_dir, f"inventory_{slug}.json")
+
+
+class Inventory:
+    """Point-updatable, queryable inventory for one site."""
+
+    def __init__(self, slug, state_dir=STATE_DIR):
+        self.slug = slug
+        self.path = db_path_for(slug, state_dir)
+        self.json_path = json_path_for(slug, state_dir)
+        os.makedirs(state_dir, exist_ok=True)
+        fresh = not os.path.exists(self.path)
+        # Autocommit unless inside transaction(); WAL lets readers run during a crawl.
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        if fresh and os.path.exists(self.json_path):
+            self.import_json(self.json_path)
+
+    def _migrate(self):
+        """Add columns missing from databases created by older versions."""
+        added = False
+        for table, column, declaration in ADDED_COLUMNS:
+            columns = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+                added = True
+        self.conn.executescript(GRAPH_INDEXES)
+        if added:
+            self.rebuild_link_graph()
+
+    @classmethod
+    def open(cls, slug, state_dir=STATE_DIR):
+        return cls(slug, state_dir=state_dir)
+
+    @staticmethod
+    def exists(slug, state_dir=STATE_DIR):
+        """True if the site has an inventory (SQLite or legacy JSON)."""
+        return os.path.exists(db_path_for(slug, state_dir)) or os.path.exists(json_path_for(slug, state_dir))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one atomic commit (BEGIN IMMEDIATE; re-entrant)."""
+        if self.conn.in_transaction:
+            yield self
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ── Rows ────────────────────────────────────────────────────────────
+
+    _SELECT = (
+        "SELECT " + ", ".join(f"p.{c}" for c in POST_COLUMNS) + ", "
+        + ", ".join(f"COALESCE(m.{c}, 0) AS {c}" for c in METRIC_COLUMNS)
+        + " FROM posts p LEFT JOIN metrics m ON m.post_id = p.post_id"
+    )
+
+    @staticmethod
+    def _entry(row):
+        return {key: row[key] for key in row.keys()}
+
+    def _query(self, where="", params=(), order="p.post_id"):
+        sql = self._SELECT + (f" WHERE {where}" if where else "") + f" ORDER BY {order}"
+        return [self._entry(row) for row in self.conn.execute(sql, params)]
+
+    def get(self, post_id):
+        rows = self._query("p.post_id = ?", (int(post_id),))
+        return rows[0] if rows else None
+
+    def all_posts(self):
+        """Every entry as the legacy {str(post_id): entry} dict."""
+        return {str(entry["post_id"]): entry for entry in self._query()}
+
+    def ids(self):
+        return {row[0] for row in self.conn.execute("SELECT post_id FROM posts")}
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def upsert(self, entry):
+        """Insert or replace one post entry (posts + metrics columns).
+
+        internal_links_in is owned by the link graph and never taken from
+        the entry (nor is authority); a new or moved URL re-resolves the
+        links pointing at it.
+        """
+        post = {c: entry.get(c) for c in POST_COLUMNS}
+        post["post_id"] = int(entry["post_id"])
+        for c in ("url", "slug", "title", "meta_description"):
+            post[c] = post[c] or ""
+        post["status"] = post["status"] or "publish"
+        columns = POST_COLUMNS + ("url_key",)
+        url_key = normalize_url(post["url"])
+        previous = self.conn.execute(
+            "SELECT url_key FROM posts WHERE post_id = ?", (post["post_id"],)
+        ).fetchone()
+        with self.transaction():
+            self.conn.execute(
+                f"INSERT INTO posts ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(post_id) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in columns[1:]),
+                [post[c] for c in POST_COLUMNS] + [url_key],
+            )
+            metric_columns = [c for c in METRIC_COLUMNS if c not in GRAPH_COLUMNS]
+            self.conn.execute(
+                f"INSERT INTO metrics (post_id, {', '.join(metric_columns)}) "
+                f"VALUES (?, {', '.join('?' * len(metric_columns))}) "
+                f"ON CONFLICT(post_id) DO UPDATE SET "
+                + ", ".join(f"{c} = excluded.{c}" for c in metric_columns),
+                [post["post_id"]] + [int(entry.get(c) or 0) for c in metric_columns],
+            )
+            if previous is None or previous[0] != url_key:
+                self._attach_url(post["post_id"], url_key)
+
+    def delete(self, post_id):
+        """Remove a post, its outbound edges and the inbound counts they gave."""
+        post_id = int(post_id)
+        with self.transaction():
+            self._adjust_inbound(self._link_targets(post_id), -1)
+            self.conn.execute("UPDATE links SET target_id = NULL WHERE target_id = ?", (post_id,))
+            self.conn.execute("DELETE FROM posts WHERE post_id = ?", (post_id,))
+
+    def update_post(self, post_id, **fields):
+        """Point update of any post or metrics columns; False if no such post."""
+        post_fields = {k: v for k, v in fields.items() if k in POST_COLUMNS and k != "post_id"}
+        metric_fields = {k: v for k, v in fields.items() if k in METRIC_COLUMNS}
+        unknown = set(fields) - set(post_fields) - set(metric_fields)
+        if unknown:
+            raise KeyError(f"Unknown inventory fields: {', '.join(sorted(unknown))}")
+        found = False
+        if post_fields:
+            cur = self.conn.execute(
+                f"UPDATE posts SET {', '.join(f'{k} = ?' for k in post_fields)} WHERE post_id = ?",
+                list(post_fields.values()) + [int(post_id)],
+            )
+            found = cur.rowcount > 0
+        if metric_fields:
+            cur = self.conn.execute(
+                f"UPDATE metrics SET {', '.join(f'{k} = ?' for k in metric_fields)} WHERE post_id = ?",
+                list(metric_fields.values()) + [int(post_id)],
+            )
+            found = found or cur.rowcount > 0
+        return found
+
+    def increment(self, post_id, column, delta=1):
+        """Adjust a metrics counter in place (floored at zero)."""
+        if column not in METRIC_COLUMNS:
+            raise KeyError(f"Not a metrics column: {column}")
+        cur = self.conn.execute(
+            f"UPDATE metrics SET {column} = MAX(0, {column} + ?) WHERE post_id = ?",
+            (int(delta), int(post_id)),
+        )
+        return cur.rowcount > 0
+
+    # ── Links ───────────────────────────────────────────────────────────
+
+    def _resolve(self, kind, target_url):
+        """Post id an internal link target points at, or None."""
+        if kind != "internal":
+            return None
+        row = self.conn.execute("SELECT post_id FROM posts WHERE url_key = ?", (target_url,)).fetchone()
+        return row[0] if row else None
+
+    def _link_targets(self, source_id):
+        """Distinct other posts a post links to."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT target_id FROM links WHERE source_id = ? AND target_id IS NOT NULL "
+            "AND target_id != source_id",
+            (int(source_id),),
+        )
+        return {row[0] for row in rows}
+
+    def _adjust_inbound(self, post_ids, delta):
+        self.conn.executemany(
+            "UPDATE metrics SET internal_links_in = MAX(0, internal_links_in + ?) WHERE post_id = ?",
+            [(delta, pid) for pid in post_ids],
+        )
+
+    def _attach_url(self, post_id, url_key):
+        """Point links at a post's (new) URL key and recount its inbound links."""
+        self.conn.execute("UPDATE links SET target_id = NULL WHERE target_id = ?", (post_id,))
+        if url_key:
+            self.conn.execute(
+                "UPDATE links SET target_id = ? WHERE kind = 'internal' AND target_url = ?",
+                (post_id, url_key),
+            )
+        self.conn.execute(
+            "UPDATE metrics SET internal_links_in = (SELECT COUNT(DISTINCT source_id) FROM links "
+            "WHERE target_id = ? AND source_id != ?) WHERE post_id = ?",
+            (post_id, post_id, post_id),
+        )
+
+    def _link_key(self, kind, target_url):
+        return (normalize_url(target_url) or target_url) if kind == "internal" else target_url
+
+    def set_links(self, post_id, internal=(), amazon=(), affiliate=()):
+        """Replace a post's stored outbound links, diffing its inbound edges.
+
+        Internal targets should already be normalized (extract_links does).
+        Returns (targets added, targets removed) as post id sets.
+        """
+        post_id = int(post_id)
+        counts = {}
+        for kind, urls in zip(LINK_KINDS, (internal, amazon, affiliate)):
+            for url in urls:
+                counts[(kind, url)] = counts.get((kind, url), 0) + 1
+        with self.transaction():
+            before = self._link_targets(post_id)
+            self.conn.execute("DELETE FROM links WHERE source_id = ?", (post_id,))
+            self.conn.executemany(
+                "INSERT INTO links (source_id, kind, target_url, count, target_id) VALUES (?, ?, ?, ?, ?)",
+                [(post_id, kind, url, n, self._resolve(kind, url)) for (kind, url), n in counts.items()],
+            )
+            after = self._link_targets(post_id)
+            self._adjust_inbound(after - before, 1)
+            self._adjust_inbound(before - after, -1)
+        return after - before, before - after
+
+    def add_link(self, post_id, target_url, kind="internal", count=1):
+        """Record one more link from a post (write tools push these directly)."""
+        post_id = int(post_id)
+        target_url = self._link_key(kind, target_url)
+        with self.transaction():
+            before = self._link_targets(post_id)
+            self.conn.execute(
+                "INSERT INTO links (source_id, kind, target_url, count, target_id) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(source_id, kind, target_url) DO UPDATE SET count = count + excluded.count",
+                (post_id, kind, target_url, count, self._resolve(kind, target_url)),
+            )
+            self._adjust_inbound(self._link_targets(post_id) - before, 1)
+
+    def remove_link(self, post_id, target_url, kind="internal", count=None):
+        """Drop a link from a post (count=None removes every occurrence)."""
+        post_id = int(post_id)
+        target_url = self._link_key(kind, target_url)
+        key = (post_id, kind, target_url)
+        with self.transaction():
+            before = self._link_targets(post_id)
+            if count is not None:
+                self.conn.execute(
+                    "UPDATE links SET count = count - ? WHERE source_id = ? AND kind = ? AND target_url = ?",
+                    (count,) + key,
+                )
+            self.conn.execute(
+                "DELETE FROM links WHERE source_id = ? AND kind = ? AND target_url = ?"
+                + (" AND count <= 0" if count is not None else ""),
+                key,
+            )
+            self._adjust_inbound(before - self._link_targets(post_id), -1)
+
+    def rebuild_link_graph(self):
+        """Re-resolve every internal link and recount internal_links_in from scratch."""
+        with self.transaction():
+            missing = self.conn.execute("SELECT post_id, url FROM posts WHERE url_key IS NULL").fetchall()
+            self.conn.executemany(
+                "UPDATE posts SET url_key = ? WHERE post_id = ?",
+                [(normalize_url(url), pid) for pid, url in missing],
+            )
+            self.conn.execute(
+                "UPDATE links SET target_id = (SELECT post_id FROM posts WHERE posts.url_key = links.target_url) "
+                "WHERE kind = 'internal'"
+            )
+            self.conn.execute(
+                "UPDATE metrics SET internal_links_in = (SELECT COUNT(DISTINCT source_id) FROM links "
+                "WHERE links.target_id = metrics.post_id AND links.source_id != metrics.post_id)"
+            )
+            self.update_authority()
+
+    def update_authority(self):
+        """Re-score every post's internal authority (PageRank, mean 1.0)."""
+        edges = self.conn.execute(
+            "SELECT DISTINCT source_id, target_id FROM links "
+            "WHERE target_id IS NOT NULL AND target_id != source_id"
+        ).fetchall()
+        scores = pagerank(sorted(self.ids()), edges)
+        with self.transaction():
+            self.conn.executemany(
+                "UPDATE metrics SET authority = ? WHERE post_id = ?",
+                [(round(score, 4), pid) for pid, score in scores.items()],
+            )
+        return scores
+
+    def links_from(self, post_id, kind=None):
+        sql = "SELECT target_url, kind, count FROM links WHERE source_id = ?"
+        params = [int(post_id)]
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        return [dict(row) for row in self.conn.execute(sql + " ORDER BY kind, target_url", params)]
+
+    def links_to(self, target_url):
+        """Source post ids linking to target_url."""
+        rows = self.conn.execute(
+            "SELECT DISTINCT source_id FROM links WHERE kind = 'internal' AND target_url = ?",
+            (target_url,),
+        )
+        return [row[0] for row in rows]
+
+    def hubs(self, n=HUB_COUNT):
+        """Most-linked-to posts, highest internal_links_in first."""
+        return self._query("COALESCE(m.internal_links_in, 0) > 0", order="m.internal_links_in DESC, p.post_id")[:n]
+
+    def authorities(self, n=HUB_COUNT):
+        """Posts with the highest internal authority (best link sources)."""
+        return self._query("COALESCE(m.authority, 0) > 0", order="m.authority DESC, p.post_id")[:n]
+
+    def dead_links(self):
+        """(source_id, target) for internal links to post-like URLs that match no post."""
+        rows = self.conn.execute(
+            "SELECT source_id, target_url FROM links WHERE kind = 'internal' AND target_id IS NULL "
+            "ORDER BY source_id, target_url"
+        )
+        return [
+            (source_id, target) for source_id, target in rows
+            if is_post_candidate(target, target.split("/", 1)[0])
+        ]
+
+    # ── Queries ─────────────────────────────────────────────────────────
+
+    def orphans(self):
+        """Posts no other post links to (zero inbound internal links)."""
+        return self._query("COALESCE(m.internal_links_in, 0) = 0")
+
+    def dead_ends(self):
+        """Posts with no internal links out."""
+        return self._query("COALESCE(m.internal_links_out, 0) = 0")
+
+    def short_posts(self, max_words=SHORT_POST_WORDS):
+        return self._query("COALESCE(m.word_count, 0) < ?", (max_words,), order="m.word_count, p.post_id")
+
+    def missing_meta(self):
+        return self._query("p.meta_description = ''")
+
+    def without_amazon_links(self):
+        return self._query("COALESCE(m.amazon_links, 0) = 0")
+
+    def summary(self):
+        """Aggregate stats (same keys as the JSON inventory's summary)."""
+        row = self.conn.execute(
+            f"""
+            SELECT COUNT(*) AS total,
+                   SUM(COALESCE(m.internal_links_in, 0) = 0) AS orphans,
+                   SUM(COALESCE(m.internal_links_out, 0) = 0) AS dead_ends,
+                   SUM(COALESCE(m.amazon_links, 0) = 0) AS no_amazon,
+                   SUM(COALESCE(m.word_count, 0) < {SHORT_POST_WORDS}) AS short,
+                   SUM(p.meta_description = '') AS no_meta,
+                   SUM(COALESCE(m.word_count, 0)) AS words,
+                   SUM(COALESCE(m.amazon_links, 0)) AS amazon
+            FROM posts p LEFT JOIN metrics m ON m.post_id = p.post_id
+            """
+        ).fetchone()
+        total = row["total"]
+        if not total:
+            return {}
+        dead = self.dead_links()
+        return {
+            "total_posts": total,
+            "orphan_count": row["orphans"],
+            "posts_without_outbound_links": row["dead_ends"],
+            "hubs": [
+                {"post_id": hub["post_id"], "url": hub["url"], "internal_links_in": hub["internal_links_in"]}
+                for hub in self.hubs()
+            ],
+            "top_authority_posts": [
+                {
+                    "post_id": post["post_id"],
+                    "url": post["url"],
+                    "title": post["title"],
+                    "authority": post["authority"],
+                    "internal_links_in": post["internal_links_in"],
+                }
+                for post in self.authorities()
+            ],
+            "dead_internal_links": len(dead),
+            "dead_internal_link_samples": [
+                {"source_post_id": source_id, "target": target}
+                for source_id, target in dead[:DEAD_LINK_SAMPLES]
+            ],
+            "posts_without_amazon_links": row["no_amazon"],
+            "short_posts_under_500w": row["short"],
+            "posts_missing_meta_description": row["no_meta"],
+            "avg_word_count": int(row["words"] / total),
+            "total_amazon_links": row["amazon"],
+        }
+
+    # ── Meta ────────────────────────────────────────────────────────────
+
+    def get_meta(self):
+        return {row["key"]: json.loads(row["value"]) for row in self.conn.execute("SELECT key, value FROM meta")}
+
+    def set_meta(self, meta, replace=True):
+        if replace:
+            self.conn.execute("DELETE FROM meta")
+        self.conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(key, json.dumps(value, default=str)) for key, value in meta.items()],
+        )
+
+    # ── JSON compatibility ──────────────────────────────────────────────
+
+    def import_json(self, path):
+        """Load a legacy JSON inventory (links aren't in it; the next crawl fills them)."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        posts = data.get("posts", {})
+        meta = dict(data.get("meta", {}))
+        meta["links_complete"] = False
+        with self.transaction():
+            for entry in posts.values():
+                # No hash: the next crawl re-parses each body and fills links.
+                self.upsert({**entry, "content_hash": None})
+            self.set_meta(meta)
+        return len(posts)
+
+    def to_dict(self, meta_exclude=()):
+        meta = {k: v for k, v in self.get_meta().items() if k not in meta_exclude}
+        return {"meta": meta, "posts": self.all_posts(), "summary": self.summary()}
+
+    def export_json(self, path=None):
+        """Atomically write the legacy JSON document; returns its path."""
+        path = path or self.json_path
+        data = self.to_dict()
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2, default=str)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return path
+
+
+class InventoryDelta:
+    """Inventory changes gathered during a tool run, committed once."""
+
+    def __init__(self):
+        self.increments = {}  # post_id -> {column: delta}
+        self.fields = {}  # post_id -> {column: value}
+        self.links = []  # (add: bool, post_id, target_url, kind)
+
+    def __len__(self):
+        return len(set(self.increments) | set(self.fields) | {link[1] for link in self.links})
+
+    def increment(self, post_id, column, delta=1):
+        if column not in METRIC_COLUMNS:
+            raise KeyError(f"Not a metrics column: {column}")
+        counters = self.increments.setdefault(int(post_id), {})
+        counters[column] = counters.get(column, 0) + delta
+
+    def set(self, post_id, **fields):
+        unknown = set(fields) - set(POST_COLUMNS + METRIC_COLUMNS) - {"post_id"}
+        if unknown:
+            raise KeyError(f"Unknown inventory fields: {', '.join(sorted(unknown))}")
+        self.fields.setdefault(int(post_id), {}).update(fields)
+
+    def add_link(self, post_id, target_url, kind="internal"):
+        """Queue a new outbound edge (updates the target's inbound count)."""
+        self.links.append((True, int(post_id), target_url, kind))
+
+    def remove_link(self, post_id, target_url, kind="internal"):
+        self.links.append((False, int(post_id), target_url, kind))
+
+    def commit(self, slug, state_dir=STATE_DIR, export=True):
+        """Apply every change in one transaction, then re-export the JSON.
+
+        Returns the number of posts touched (0 when there is no inventory).
+        """
+        if not len(self) or not Inventory.exists(slug, state_dir):
+            return 0
+        with inventory_lock(slug, state_dir), Inventory.open(slug, state_dir) as inv:
+            with inv.transaction():
+                for post_id, counters in self.increments.items():
+                    for column, delta in counters.items():
+                        if delta:
+                            inv.increment(post_id, column, delta)
+                for post_id, fields in self.fields.items():
+                    inv.update_post(post_id, **fields)
+                for add, post_id, target_url, kind in self.links:
+                    if add:
+                        inv.add_link(post_id, target_url, kind)
+                    else:
+                        inv.remove_link(post_id, target_url, kind, count=1)
+                if any(kind == "internal" for _, _, _, kind in self.links):
+                    inv.update_authority()
+            if export:
+                inv.export_json()
+        touched = len(self)
+        self.increments.clear()
+        self.fields.clear()
+        self.links.clear()
+        return touched
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Shared link extractor — one definition of "a link" for every tool.
+
+extract_links() parses the <a> tags in a post body with compiled patterns
+and returns typed LinkRecord tuples:
+- href as written (entities decoded) and the absolute URL (relative links
+  resolve against the post URL, or the site root)
+- kind, decided by host: internal, amazon, amzn_to, impact, avantlink,
+  shareasale or external; mailto:/tel:/#fragment/javascript: are not links
+- key: the normalized "host/path" (link_graph.normalize_url) for internal links
+- rel tokens (nofollow, sponsored, ugc...) and the visible anchor text
+
+Results are memoized by content hash (plus site and base URL), so the
+inventory, link graph, audits and suggester share one parse per post body
+within a process.
+
+Usage:
+    from link_extractor import extract_links
+    for link in extract_links(post.content, WP_URL, base=post.link):
+        if link.kind == "amazon" and link.param("tag") != AMAZON_TAG:
+            ...
+"""
+
+import html as html_lib
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+from content_cache import content_hash
+from link_graph import is_internal, normalize_url, site_host
+
+LINK_KINDS = ("internal", "amazon", "amzn_to", "impact", "avantlink", "shareasale", "external")
+AFFILIATE_KINDS = frozenset({"amazon", "amzn_to", "impact", "avantlink", "shareasale"})
+
+# Host suffixes per affiliate network (Impact also serves tracking links
+# from its sjv.io / pxf.io / 7eer.net redirect domains).
+AFFILIATE_HOSTS = (
+    ("amzn_to", ("amzn.to",)),
+    ("impact", ("impact.com", "sjv.io", "pxf.io", "7eer.net")),
+    ("avantlink", ("avantlink.com",)),
+    ("shareasale", ("shareasale.com",)),
+)
+AMAZON_HOST_RE = re.compile(r"(?:^|\.)amazon\.(?:com|ca|co\.uk|de|fr|it|es|com\.au|com\.mx|in|co\.jp)$")
+
+ANCHOR_RE = re.compile(
+    r"<a\b((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>(.*?)(?:</a\s*>|(?=<a\b)|$)",
+    re.IGNORECASE | re.DOTALL,
+)
+HREF_ATTR_RE = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+REL_ATTR_RE = re.compile(r"""\brel\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+TAG_RE = re.compile(r"<[^>]+>")
+NOT_LINK_PREFIXES = ("#", "mailto:", "tel:", "javascript:", "data:", "sms:")
+
+MEMO_SIZE = 4096  # parsed bodies kept per process
+
+_memo = OrderedDict()
+_stats = {"hits": 0, "misses": 0}
+
+
+@dataclass(frozen=True)
+class LinkRecord:
+    """One <a href> in a post body."""
+
+    href: str          # attribute value, entities decoded
+    url: str           # absolute URL
+    kind: str          # one of LINK_KINDS
+    key: str = ""      # normalized host/path (internal links only)
+    rel: tuple = ()    # lowercased rel tokens
+    text: str = ""     # visible anchor text
+
+    @property
+    def is_affiliate(self):
+        return self.kind in AFFILIATE_KINDS
+
+    @property
+    def nofollow(self):
+        return "nofollow" in self.rel
+
+    @property
+    def sponsored(self):
+        return "sponsored" in self.rel
+
+    @cached_property
+    def params(self):
+        return parse_qs(urlsplit(self.url).query, keep_blank_values=True)
+
+    def param(self, name, default=None):
+        """First value of a query parameter (e.g. Amazon's tag), or default."""
+        values = self.params.get(name)
+        return values[0] if values else default
+
+
+def _attr(pattern, attrs):
+    found = pattern.search(attrs)
+    if not found:
+        return None
+    return html_lib.unescape(next(g for g in found.groups() if g is not None)).strip()
+
+
+def classify(url, host):
+    """Link kind for an absolute URL on a site with the given bare host."""
+    link_host = (urlsplit(url).hostname or "").lower()
+    if link_host.startswith("www."):
+        link_host = link_host[4:]
+    if host and link_host == host:
+        return "internal"
+    if AMAZON_HOST_RE.search(link_host):
+        return "amazon"
+    for kind, suffixes in AFFILIATE_HOSTS:
+        if any(link_host == s or link_host.endswith("." + s) for s in suffixes):
+            return kind
+    return "external"
+
+
+def _parse(html, host, base):
+    records = []
+    for match in ANCHOR_RE.finditer(html):
+        attrs = match.group(1)
+        href = _attr(HREF_ATTR_RE, attrs)
+        if not href or href.lower().startswith(NOT_LINK_PREFIXES):
+            continue
+        url = urljoin(base, href)
+        if urlsplit(url).scheme not in ("http", "https"):
+            continue
+        key = normalize_url(url)
+        kind = "internal" if host and is_internal(key, host) else classify(url, host)
+        rel = tuple((_attr(REL_ATTR_RE, attrs) or "").lower().split())
+        text = " ".join(html_lib.unescape(TAG_RE.sub(" ", match.group(2))).split())
+        records.append(LinkRecord(href, url, kind, key if kind == "internal" else "", rel, text))
+    return tuple(records)
+
+
+def extract_links(html, site, base=None, digest=None):
+    """Every link in html as LinkRecords, in document order (memoized).
+
+    site: the site URL or domain (decides what is internal).  base: the
+    post's URL for resolving relative links (defaults to the site root).
+    digest: content_hash(html) if the caller already has it.
+    """
+    html = html or ""
+    host = site_host(site) if site else ""
+    base = base or (f"https://{host}/" if host else "")
+    memo_key = (digest or content_hash(html), host, base)
+    records = _memo.get(memo_key)
+    if records is not None:
+        _memo.move_to_end(memo_key)
+        _stats["hits"] += 1
+        return records
+    _stats["misses"] += 1
+    records = _parse(html, host, base)
+    _memo[memo_key] = records
+    if len(_memo) > MEMO_SIZE:
+        _memo.popitem(last=False)
+    return records
+
+
+def links_by_kind(records):
+    """{kind: [LinkRecord]} with every kind present (possibly empty)."""
+    grouped = {kind: [] for kind in LINK_KINDS}
+    for record in records:
+        grouped[record.kind].append(record)
+    return grouped
+
+
+def memo_stats():
+    return {**_stats, "cached": len(_memo)}
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Internal link graph — URL normalization and inbound/outbound link counts.
+
+Posts link to each other with many spellings of the same URL (http vs
+https, www vs bare host, trailing slash or not, #fragments, ?utm tags,
+relative paths).  normalize_url() folds them into one key so a plain dict
+maps link targets to post ids, and LinkGraph computes inbound counts,
+orphans (zero inbound links), hubs and dead internal links in
+O(posts + links).  Only href values count as links (parsed by
+link_extractor), so a URL that merely appears in the text, or is a prefix
+of another post's URL, is not an edge.
+
+pagerank() scores internal authority by sparse power iteration over the
+post-to-post edges (NumPy when installed, pure Python otherwise).  Scores
+are scaled so the site average is 1.0: a post at 3.0 passes three times the
+link equity of a typical post.
+
+Usage:
+    from link_graph import LinkGraph, normalize_url
+    graph = LinkGraph({post_id: url, ...})
+    graph.add_links(source_id, ["https://site.com/a/", "/b"])
+    graph.add_content(other_id, html)
+    graph.inbound_counts()
+    graph.pagerank()
+"""
+
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import numpy as np
+except ImportError:  # optional; pagerank() falls back to pure Python
+    np = None
+
+# Internal paths that are real pages but never posts, so a link to them is
+# neither an edge in the post graph nor a dead link.
+NON_POST_PREFIXES = (
+    "/category/", "/tag/", "/author/", "/page/", "/feed/", "/wp-content/", "/wp-admin/",
+    "/wp-json/", "/wp-login.php", "/search/", "/comments/",
+)
+
+HUB_COUNT = 10
+DEAD_LINK_SAMPLES = 20
+
+PAGERANK_DAMPING = 0.85
+PAGERANK_TOLERANCE = 1e-6
+PAGERANK_MAX_ITERATIONS = 100
+
+def site_host(url_or_domain):
+    """Bare lowercase host for a site URL or domain (no scheme, port or www.)."""
+    value = url_or_domain if "//" in url_or_domain else f"//{url_or_domain}"
+    host = (urlsplit(value).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def normalize_url(url, base=None):
+    """Canonical "host/path" key for a link, or None if it isn't a page link.
+
+    Relative links resolve against base.  Scheme, www., port, query string,
+    fragment and trailing slash are dropped; the host is lowercased.
+    """
+    if not url:
+        return None
+    url = url.strip()
+    if url.startswith(("#", "mailto:", "tel:", "javascript:", "data:")):
+        return None
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url if "//" in url else f"//{url}")
+    if parts.scheme and parts.scheme not in ("http", "https"):
+        return None
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if not host:
+        return None
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return f"{host}{path}"
+
+
+def is_internal(normalized, host):
+    """True if a normalized URL belongs to the site host."""
+    return bool(normalized) and (normalized == host or normalized.startswith(host + "/"))
+
+
+def is_post_candidate(normalized, host):
+    """Internal URLs that should resolve to a post (home, archives etc. excluded)."""
+    path = normalized[len(host):] or "/"
+    if path == "/":
+        return False
+    # Whole path segments only: /tag/x is an archive, /tagine-recipe is a post.
+    return not any(path == p.rstrip("/") or path.startswith(p.rstrip("/") + "/") for p in NON_POST_PREFIXES)
+
+
+def pagerank(nodes, edges, damping=PAGERANK_DAMPING, tol=PAGERANK_TOLERANCE,
+             max_iter=PAGERANK_MAX_ITERATIONS, use_numpy=None):
+    """PageRank over (source, target) edges, scaled so the mean score is 1.0.
+
+    nodes: every post id (posts without links still get a score).  Duplicate
+    edges and self-links are ignored.  Dangling posts (no outbound links)
+    spread their rank evenly, as in the standard formulation.  Iterates
+    until the L1 change drops below tol.  Returns {node: score}.
+    """
+    nodes = list(dict.fromkeys(nodes))
+    n = len(nodes)
+    if not n:
+        return {}
+    index = {node: i for i, node in enumerate(nodes)}
+    pairs = {(index[s], index[t]) for s, t in edges if s != t and s in index and t in index}
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        ranks = _pagerank_numpy(n, pairs, damping, tol, max_iter)
+    else:
+        ranks = _pagerank_python(n, pairs, damping, tol, max_iter)
+    return {node: ranks[i] * n for i, node in enumerate(nodes)}
+
+
+def _pagerank_python(n, pairs, damping, tol, max_iter):
+    out_degree = [0] * n
+    inbound = [[] for _ in range(n)]
+    for s, t in pairs:
+        out_degree[s] += 1
+        inbound[t].append(s)
+    dangling = [i for i in range(n) if not out_degree[i]]
+    rank = [1.0 / n] * n
+    for _ in range(max_iter):
+        share = [rank[i] / out_degree[i] if out_degree[i] else 0.0 for i in range(n)]
+        base = (1.0 - damping) / n + damping * sum(rank[i] for i in dangling) / n
+        new = [base + damping * sum(share[s] for s in sources) for sources in inbound]
+        delta = sum(abs(a - b) for a, b in zip(new, rank))
+        rank = new
+        if delta < tol:
+            break
+    return rank
+
+
+def _pagerank_numpy(n, pairs, damping, tol, max_iter):
+    if pairs:
+        src, dst = (np.fromiter(col, dtype=np.int64, count=len(pairs)) for col in zip(*pairs))
+    else:
+        src = dst = np.zeros(0, dtype=np.int64)
+    out_degree = np.bincount(src, minlength=n).astype(float)
+    dangling = out_degree == 0
+    weight = 1.0 / out_degree[src]
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        base = (1.0 - damping) / n + damping * rank[dangling].sum() / n
+        new = base + damping * np.bincount(dst, weights=rank[src] * weight, minlength=n)
+        delta = np.abs(new - rank).sum()
+        rank = new
+        if delta < tol:
+            break
+    return rank.tolist()
+
+
+class LinkGraph:
+    """Directed post-to-post link graph keyed by normalized URL."""
+
+    def __init__(self, posts, host=None):
+        """posts: {post_id: url}.  host: site host (derived from URLs if omitted)."""
+        self.url_to_id = {}
+        self.urls = {}
+        for post_id, url in posts.items():
+            key = normalize_url(url)
+            if key:
+                self.url_to_id[key] = int(post_id)
+                self.urls[int(post_id)] = url
+        if host is None and self.url_to_id:
+            host = next(iter(self.url_to_id)).split("/", 1)[0]
+        self.host = site_host(host) if host else ""
+        self.outbound = {pid: set() for pid in self.urls}
+        self.inbound = {pid: set() for pid in self.urls}
+        self.dead = []  # (source_id, normalized target)
+
+    def resolve(self, url, base=None):
+        """Post id a URL points at, or None."""
+        return self.url_to_id.get(normalize_url(url, base))
+
+    def add_links(self, source_id, targets):
+        """Record a post's internal link targets (raw or normalized URLs)."""
+        source_id = int(source_id)
+        base = self.urls.get(source_id)
+        for target in targets:
+            # Targets stored by the inventory are already normalized keys.
+            key = target if is_internal(target, self.host) else normalize_url(target, base)
+            if not key or not is_internal(key, self.host):
+                continue
+            target_id = self.url_to_id.get(key)
+            if target_id is None:
+                if is_post_candidate(key, self.host):
+                    self.dead.append((source_id, key))
+                continue
+            if target_id == source_id:
+                continue
+            self.outbound.setdefault(source_id, set()).add(target_id)
+            self.inbound.setdefault(target_id, set()).add(source_id)
+
+    def add_content(self, source_id, html):
+        """Record the internal links found in a post's HTML."""
+        from link_extractor import extract_links  # link_extractor imports this module
+
+        base = self.urls.get(int(source_id))
+        self.add_links(source_id, [link.key for link in extract_links(html, self.host, base=base)
+                                   if link.kind == "internal"])
+
+    def inbound_counts(self):
+        """{post_id: distinct posts linking in}."""
+        return {pid: len(sources) for pid, sources in self.inbound.items()}
+
+    def orphans(self):
+        return sorted(pid for pid, sources in self.inbound.items() if not sources)
+
+    def hubs(self, n=HUB_COUNT):
+        """Most-linked-to posts as [(post_id, inbound)], highest first."""
+        ranked = sorted(self.inbound.items(), key=lambda item: (-len(item[1]), item[0]))
+        return [(pid, len(sources)) for pid, sources in ranked[:n] if sources]
+
+    def pagerank(self, **kwargs):
+        """{post_id: authority score} (mean 1.0), see pagerank()."""
+        edges = [(s, t) for s, targets in self.outbound.items() for t in targets]
+        return pagerank(self.urls, edges, **kwargs)
+
+    def summary(self):
+        return {
+            "orphan_count": len(self.orphans()),
+            "hubs": [
+                {"post_id": pid, "url": self.urls.get(pid, ""), "internal_links_in": count}
+                for pid, count in self.hubs()
+            ],
+            "dead_internal_links": len(self.dead),
+            "dead_internal_link_samples": [
+                {"source_post_id": src, "target": target}
+                for src, target in self.dead[:DEAD_LINK_SAMPLES]
+            ],
+        }
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Single-pass internal link injection into post HTML.
+
+inject_links() applies every requested link for a post at once:
+- the markup is tokenized once by a streaming tag tokenizer that tracks
+  whether the cursor is inside <a>, a heading, a caption, code or a
+  script, and collects the text runs outside them plus every existing href;
+  script, style and textarea bodies are skipped whole, so markup inside
+  them is never taken for tags
+- each run is matched as text: entities decoded, whitespace collapsed and
+  lowercased, with an offset map back to the source, so "salt & pepper"
+  finds "Salt &amp;\npepper"
+- all anchor phrases are matched over those runs by one Aho-Corasick
+  automaton (case-insensitive, whole words only)
+- each injection takes the first free occurrence of its anchor, preferring
+  one inside its context_hint; chosen spans never overlap
+- the output is assembled in one left-to-right copy, keeping the post's
+  own casing for the linked text
+
+A target that the post already links to (compared as normalized URLs, see
+link_graph.normalize_url) is skipped rather than linked twice.
+
+replace_href() uses the same tokenizer to repoint existing anchors, touching
+only their href values.
+
+Usage:
+    from link_injector import Injection, inject_links
+    html, results = inject_links(html, [Injection(url, "cast iron skillet")], base_url=post.link)
+"""
+
+import html as html_lib
+import re
+from dataclasses import dataclass
+
+from link_extractor import HREF_ATTR_RE
+from link_graph import normalize_url
+
+# Text inside these elements is never linked.
+SKIP_TAGS = frozenset({
+    "a", "h1", "h2", "h3", "h4", "h5", "h6", "figcaption", "caption",
+    "script", "style", "code", "pre", "button", "textarea", "select", "title",
+})
+
+# Elements whose bodies are raw text: nothing inside them is a tag.
+RAW_TEXT_TAGS = frozenset({"script", "style", "textarea"})
+
+ENTITY_RE = re.compile(r"&(?:#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);")
+
+TOKEN_RE = re.compile(
+    r"<!--.*?-->"
+    r"|<!\[CDATA\[.*?\]\]>"
+    r"|<(/?)([a-zA-Z][\w:-]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*)>",
+    re.DOTALL,
+)
+
+
+@dataclass
+class Injection:
+    """One requested link and, after inject_links(), its outcome."""
+
+    target_url: str
+    anchor_text: str
+    context_hint: str = ""
+    applied: bool = False
+    reason: str = ""
+    linked_text: str = ""
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher: every occurrence of every pattern in one scan."""
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(index)
+        # Breadth-first failure links; outputs inherit along them.
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def find_all(self, text):
+        """Yield (start, end, pattern index) for every occurrence, by end offset."""
+        state = 0
+        goto, fail, out, patterns = self.goto, self.fail, self.out, self.patterns
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield position + 1 - len(patterns[index]), position + 1, index
+
+
+def _lower_aligned(text):
+    """Lowercase without changing length, so offsets map back to the source."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def normalize_text(text):
+    """Entities decoded, whitespace collapsed, lowercased: how anchors and hints are compared."""
+    return _lower_aligned(" ".join(html_lib.unescape(text or "").split()))
+
+
+def text_view(html, start, end):
+    """(normalized text of html[start:end], [source (start, end) per character]).
+
+    Each entity becomes its decoded character(s) and each whitespace run a
+    single space; the spans map every normalized character back to the
+    source markup it came from.
+    """
+    chars = []
+    spans = []
+    position = start
+    while position < end:
+        entity = ENTITY_RE.match(html, position, end) if html[position] == "&" else None
+        if entity:
+            decoded = html_lib.unescape(entity.group())
+            source = (position, entity.end())
+        else:
+            decoded = html[position]
+            source = (position, position + 1)
+        position = source[1]
+        for char in decoded:
+            if char.isspace():
+                if chars and chars[-1] == " ":
+                    spans[-1] = (spans[-1][0], source[1])
+                    continue
+                char = " "
+            chars.append(char)
+            spans.append(source)
+    return _lower_aligned("".join(chars)), spans
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def iter_tags(html):
+    """TOKEN_RE matches in document order, jumping over raw-text element bodies."""
+    position = 0
+    while True:
+        match = TOKEN_RE.search(html, position)
+        if not match:
+            return
+        yield match
+        position = match.end()
+        name = (match.group(2) or "").lower()
+        if name in RAW_TEXT_TAGS and not match.group(1) and not (match.group(3) or "").rstrip().endswith("/"):
+            close = re.compile(rf"</{name}\s*>", re.IGNORECASE).search(html, position)
+            position = close.start() if close else len(html)
+
+
+def scan_html(html):
+    """(text runs outside skipped elements as (start, end), [hrefs]) in one pass."""
+    runs = []
+    hrefs = []
+    depth = 0  # open skipped elements
+    position = 0
+    for match in iter_tags(html):
+        if match.start() > position and not depth:
+            runs.append((position, match.start()))
+        position = match.end()
+        name = (match.group(2) or "").lower()
+        if not name:
+            continue  # comment or CDATA
+        closing = bool(match.group(1))
+        attrs = match.group(3) or ""
+        if name == "a" and not closing:
+            found = HREF_ATTR_RE.search(attrs)
+            if found:
+                hrefs.append(html_lib.unescape(next(g for g in found.groups() if g is not None)))
+        if name in SKIP_TAGS and not attrs.rstrip().endswith("/"):
+            depth = max(0, depth - 1) if closing else depth + 1
+    if position < len(html) and not depth:
+        runs.append((position, len(html)))
+    return runs, hrefs
+
+
+def replace_href(html, old_url, new_url):
+    """Point every <a href="old_url"> at new_url; returns (new_html, count).
+
+    Only href attribute values of anchor tags are rewritten (compared after
+    entity decoding), so the same URL in text, scripts or other attributes
+    is left alone.  The attribute keeps its original quoting.
+    """
+    html = html or ""
+    if not old_url or old_url not in html_lib.unescape(html):
+        return html, 0
+    out = []
+    position = 0
+    count = 0
+    for match in iter_tags(html):
+        if (match.group(2) or "").lower() != "a" or match.group(1):
+            continue
+        found = HREF_ATTR_RE.search(match.group(3) or "")
+        if not found:
+            continue
+        group = next(i for i, g in enumerate(found.groups(), 1) if g is not None)
+        if html_lib.unescape(found.group(group)) != old_url:
+            continue
+        start = match.start(3) + found.start(group)
+        end = match.start(3) + found.end(group)
+        out.append(html[position:start])
+        out.append(html_lib.escape(new_url, quote=True))
+        position = end
+        count += 1
+    out.append(html[position:])
+    return "".join(out), count
+
+
+def find_hint(html, views, hint):
+    """Source (start, end) of a context hint: within one text run (normalized), else verbatim; None if absent."""
+    key = normalize_text(hint)
+    if not key:
+        return None
+    for text, spans in views:
+        at = text.find(key)
+        if at != -1:
+            return spans[at][0], spans[at + len(key) - 1][1]
+    at = html.find(hint)
+    return (at, at + len(hint)) if at != -1 else None
+
+
+def inject_links(html, injections, base_url=None):
+    """Apply every injection to html in one pass; returns (new_html, injections).
+
+    injections: Injection objects (or dicts with target_url / anchor_text /
+    context_hint); each comes back with applied, reason and linked_text set.
+    """
+    html = html or ""
+    injections = [i if isinstance(i, Injection) else Injection(
+        target_url=i.get("target_url", ""),
+        anchor_text=i.get("anchor_text", ""),
+        context_hint=i.get("context_hint", ""),
+    ) for i in injections]
+
+    runs, hrefs = scan_html(html)
+    linked = {normalize_url(href, base_url) for href in hrefs}
+    linked.discard(None)
+
+    views = [text_view(html, start, end) for start, end in runs]
+
+    anchors = {}
+    for injection in injections:
+        key = normalize_text(injection.anchor_text)
+        if key:
+            anchors.setdefault(key, len(anchors))
+    automaton = AhoCorasick(anchors)
+    occurrences = [[] for _ in anchors]  # pattern index -> [(start, end)] in the source, document order
+    for text, spans in views:
+        for start, end, index in automaton.find_all(text):
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end < len(text) and _is_word_char(text[end]):
+                continue
+            occurrences[index].append((spans[start][0], spans[end - 1][1]))
+
+    chosen = []  # (start, end, injection)
+    for injection in injections:
+        key = normalize_text(injection.anchor_text)
+        target = normalize_url(injection.target_url, base_url)
+        if not key or not injection.target_url:
+            injection.reason = "missing target_url or anchor_text"
+            continue
+        if target in linked:
+            injection.reason = "target already linked"
+            continue
+        spans = [s for s in occurrences[anchors[key]]
+                 if not any(s[0] < end and start < s[1] for start, end, _ in chosen)]
+        if not spans:
+            injection.reason = "anchor text not found outside links and headings"
+            continue
+        hint = find_hint(html, views, injection.context_hint)
+        if hint:
+            spans = [s for s in spans if hint[0] <= s[0] and s[1] <= hint[1]] or spans
+        start, end = spans[0]
+        chosen.append((start, end, injection))
+        linked.add(target)
+        injection.applied = True
+        injection.linked_text = html[start:end]
+
+    out = []
+    position = 0
+    for start, end, injection in sorted(chosen, key=lambda item: item[0]):
+        out.append(html[position:start])
+        out.append(f'<a href="{html_lib.escape(injection.target_url, quote=True)}">{html[start:end]}</a>')
+        position = end
+    out.append(html[position:])
+    return "".join(out), injections
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Internal link suggestions — TF-IDF inverted index over post titles and text.
+
+For each orphan (a post no other post links to) LinkSuggester ranks
+candidate source posts and picks an anchor phrase for each:
+- every post's unlinked body text and title are tokenized once into a term
+  inverted index (term -> [(post_id, tf-idf weight)], heaviest first)
+- the orphan's query is its top TF-IDF terms, title terms weighted up;
+  scoring walks the first POSTINGS_PER_TERM postings of each query term, so
+  a query costs O(query terms) rather than O(posts)
+- similarity is scaled by sqrt of the source's internal authority
+  (PageRank, mean 1.0), folded into the posting weights at index time, so
+  strong pages are preferred as link sources
+- the anchor is a 2-5 word phrase from the orphan's title or slug that
+  already occurs verbatim in the source's unlinked text (never inside an
+  existing link or heading), returned with the source's own casing; a set
+  of adjacent word pairs per source rejects most phrases before any regex
+- the context hint is cut from the single run of raw markup text holding
+  the anchor (at whitespace, so entities stay whole), which the injector
+  can find again in the post
+- sources inside an active URL impact window (agent cooldown list) and
+  sources that already link to the orphan are skipped
+
+Usage:
+    from link_suggester import LinkSuggester, load_cooldown_urls
+    suggester = LinkSuggester(posts, host=WP_URL, cooldown_urls=load_cooldown_urls(host=WP_URL))
+    suggestions = suggester.suggest_all()
+    instructions = suggester.instructions(suggestions, limit=30)
+"""
+
+import glob
+import heapq
+import html as html_lib
+import json
+import math
+import os
+import re
+from datetime import datetime
+
+from link_graph import LinkGraph, normalize_url, site_host
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "../..")
+STATE_DIR = os.path.join(ROOT_DIR, "state")
+
+TITLE_WEIGHT = 3.0
+QUERY_TERMS = 20
+POSTINGS_PER_TERM = 200
+CANDIDATES_PER_TARGET = 25
+SOURCES_PER_TARGET = 3
+LINKS_PER_SOURCE = 3
+MIN_PHRASE_WORDS = 2
+MAX_PHRASE_WORDS = 5
+HINT_CHARS = 80
+
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further get got had
+has have having he her here hers him his how i if in into is it its itself just me more most my
+no nor not now of off on once only or other our ours out over own same she should so some such
+than that the their theirs them then there these they this those through to too under until up
+us very was we were what when where which while who whom why will with would you your yours
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Text that must never become an anchor: existing links, headings, code.
+SKIP_BLOCK_RE = re.compile(
+    r"<(a|h[1-6]|script|style|figcaption|code|pre|button)\b[^>]*>.*?</\1\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+TAG_RE = re.compile(r"<[^>]+>")
+BLOCK_BREAK = "\n"
+
+
+def html_to_text(html):
+    """Plain text of the linkable parts of a post.
+
+    Skipped blocks and every tag become breaks, so a phrase found here is a
+    contiguous run of text in the markup that the injector can wrap.
+    """
+    text = SKIP_BLOCK_RE.sub(BLOCK_BREAK, html or "")
+    text = html_lib.unescape(TAG_RE.sub(BLOCK_BREAK, text))
+    return re.sub(r"[ \t\r\f\v]+", " ", text)
+
+
+def tokenize(text):
+    """Lowercase index terms (stopwords and 1-character tokens dropped)."""
+    return [t for t in TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in STOPWORDS]
+
+
+def phrase_candidates(title, slug=""):
+    """Anchor phrases from a post's title and slug, longest first.
+
+    Contiguous 2-5 word runs that neither start nor end with a stopword.
+    """
+    phrases = []
+    for source in (title, (slug or "").replace("-", " ")):
+        words = TOKEN_RE.findall(html_lib.unescape(source or "").lower())
+        for n in range(min(MAX_PHRASE_WORDS, len(words)), MIN_PHRASE_WORDS - 1, -1):
+            for i in range(len(words) - n + 1):
+                run = words[i:i + n]
+                if run[0] in STOPWORDS or run[-1] in STOPWORDS:
+                    continue
+                phrase = tuple(run)
+                if phrase not in phrases:
+                    phrases.append(phrase)
+    phrases.sort(key=len, reverse=True)
+    return phrases
+
+
+def phrase_pattern(phrase):
+    """Case-insensitive regex for a phrase's words separated by spaces."""
+    return re.compile(
+        r"(?<![\w'])" + r"[ \t]+".join(re.escape(w) for w in phrase) + r"(?![\w'])",
+        re.IGNORECASE,
+    )
+
+
+def markup_runs(html):
+    """Raw text between tags, outside skipped blocks, exactly as it appears in the markup."""
+    return [run for run in TAG_RE.split(SKIP_BLOCK_RE.sub("<br>", html or "")) if run.strip()]
+
+
+def hint_around(run, match):
+    """Up to HINT_CHARS of run around match, cut at whitespace."""
+    start = max(0, match.start() - HINT_CHARS // 2)
+    end = min(len(run), match.end() + HINT_CHARS // 2)
+    if start:
+        space = re.search(r"\s", run[start:match.start()])
+        start = start + space.end() if space else match.start()
+    if end < len(run):
+        spaces = list(re.finditer(r"\s", run[match.end():end]))
+        end = match.end() + spaces[-1].start() if spaces else match.end()
+    return run[start:end].strip()
+
+
+def word_pairs(text):
+    """Adjacent lowercase word pairs within each text block."""
+    pairs = set()
+    for block in text.split(BLOCK_BREAK):
+        words = TOKEN_RE.findall(block.lower())
+        pairs.update(zip(words, words[1:]))
+    return pairs
+
+
+def load_cooldown_urls(state_dir=STATE_DIR, host=None, now=None):
+    """Normalized URLs still inside an agent's impact window (review_not_before).
+
+    Reads recent_url_actions from every state/agent_*.json; host limits the
+    result to one site.
+    """
+    now = now or datetime.now()
+    host = site_host(host) if host else None
+    urls = set()
+    for path in glob.glob(os.path.join(state_dir, "agent_*.json")):
+        try:
+            with open(path, "r") as f:
+                actions = json.load(f).get("recent_url_actions", [])
+        except (OSError, ValueError, AttributeError):
+            continue
+        for item in actions:
+            try:
+                if datetime.fromisoformat(item.get("review_not_before", "")) <= now:
+                    continue
+            except (TypeError, ValueError):
+                continue
+            key = normalize_url(item.get("url", ""))
+            if key and (host is None or key.split("/", 1)[0] == host):
+                urls.add(key)
+    return urls
+
+
+class LinkSuggester:
+    """Inverted-index link source and anchor suggestions for orphan posts."""
+
+    def __init__(self, posts, host=None, authority=None, cooldown_urls=()):
+        """posts: WPPost objects (id, link, title, slug, content).
+
+        authority: {post_id: score} (computed with PageRank when omitted).
+        cooldown_urls: normalized URLs that must not be edited as sources.
+        """
+        self.posts = {post.id: post for post in posts}
+        self.graph = LinkGraph({pid: post.link for pid, post in self.posts.items()}, host=host)
+        self.text = {}
+        self.terms = {}
+        self._pairs = {}  # source_id -> word_pairs(), built on first anchor search
+        self._runs = {}  # source_id -> markup_runs(), built on first anchor found
+        for pid, post in self.posts.items():
+            self.graph.add_content(pid, post.content)
+            self.text[pid] = html_to_text(post.content)
+            self.terms[pid] = self._term_counts(tokenize(self.text[pid]))
+        self.authority = authority if authority is not None else self.graph.pagerank()
+        self.boost = {pid: math.sqrt(max(self.authority.get(pid, 0.0), 0.01)) for pid in self.posts}
+        cooldown = {key for key in (normalize_url(u) for u in cooldown_urls) if key}
+        self.cooldown_ids = {pid for pid, post in self.posts.items() if normalize_url(post.link) in cooldown}
+        self._build_index()
+
+    @staticmethod
+    def _term_counts(tokens):
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        return counts
+
+    def _build_index(self):
+        n = len(self.posts) or 1
+        df = {}
+        for counts in self.terms.values():
+            for term in counts:
+                df[term] = df.get(term, 0) + 1
+        self.idf = {term: math.log(n / count) + 1.0 for term, count in df.items()}
+        index = {}
+        for pid, counts in self.terms.items():
+            weights = {t: (1.0 + math.log(c)) * self.idf[t] for t, c in counts.items()}
+            scale = self.boost[pid] / (math.sqrt(sum(w * w for w in weights.values())) or 1.0)
+            for term, weight in weights.items():
+                index.setdefault(term, []).append((weight * scale, pid))
+        self.index = {}
+        for term, postings in index.items():
+            postings.sort(reverse=True)
+            self.index[term] = [(pid, weight) for weight, pid in postings[:POSTINGS_PER_TERM]]
+
+    def orphans(self):
+        return self.graph.orphans()
+
+    def _query(self, target_id):
+        """Top weighted terms describing a target post."""
+        post = self.posts[target_id]
+        weights = {t: (1.0 + math.log(c)) * self.idf.get(t, 1.0) for t, c in self.terms[target_id].items()}
+        for term in tokenize(html_lib.unescape(post.title or "")):
+            weights[term] = weights.get(term, 0.0) + TITLE_WEIGHT * self.idf.get(term, 1.0)
+        return sorted(weights.items(), key=lambda item: item[1], reverse=True)[:QUERY_TERMS]
+
+    def candidates(self, target_id, limit=CANDIDATES_PER_TARGET, exclude=()):
+        """[(source_id, score)] best first: cosine-ish similarity x sqrt(authority)."""
+        scores = {}
+        for term, q_weight in self._query(target_id):
+            for pid, weight in self.index.get(term, ()):
+                scores[pid] = scores.get(pid, 0.0) + q_weight * weight
+        for skip in ({target_id}, self.graph.inbound.get(target_id, ()), self.cooldown_ids, exclude):
+            for pid in skip:
+                scores.pop(pid, None)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def find_anchor(self, source_id, phrases, used=()):
+        """(anchor, context_hint) for the first phrase found in the source text.
+
+        phrases: [(word tuple, phrase_pattern())], longest first.  used:
+        phrases already taken as anchors in this source.  The hint is a
+        substring of one raw text run of the source markup; it is empty when
+        the phrase only matches once entities are decoded.
+        """
+        pairs = self._pairs.get(source_id)
+        if pairs is None:
+            pairs = self._pairs[source_id] = word_pairs(self.text[source_id])
+        text = self.text[source_id]
+        for phrase, pattern in phrases:
+            if phrase in used:
+                continue
+            if any(pair not in pairs for pair in zip(phrase, phrase[1:])):
+                continue  # cheap reject before the regex
+            match = pattern.search(text)
+            if not match:
+                continue
+            return match.group(0), self.context_hint(source_id, pattern)
+        return None, None
+
+    def context_hint(self, source_id, pattern):
+        """Raw markup around the first occurrence of pattern in one text run, or ""."""
+        runs = self._runs.get(source_id)
+        if runs is None:
+            runs = self._runs[source_id] = markup_runs(self.posts[source_id].content)
+        for run in runs:
+            match = pattern.search(run)
+            if match:
+                return hint_around(run, match)
+        return ""
+
+    def suggest(self, target_id, sources=SOURCES_PER_TARGET, source_load=None):
+        """Up to `sources` suggestions for one target post.
+
+        source_load: {source_id: [anchor phrases suggested]} shared across
+        targets so no source takes more than LINKS_PER_SOURCE links in a run
+        or the same anchor twice.
+        """
+        source_load = source_load if source_load is not None else {}
+        post = self.posts[target_id]
+        phrases = [(phrase, phrase_pattern(phrase)) for phrase in phrase_candidates(post.title, post.slug)]
+        full = [pid for pid, anchors in source_load.items() if len(anchors) >= LINKS_PER_SOURCE]
+        suggestions = []
+        for source_id, score in self.candidates(target_id, exclude=full):
+            used = source_load.setdefault(source_id, [])
+            anchor, hint = self.find_anchor(source_id, phrases, used)
+            if not anchor:
+                continue
+            used.append(tuple(TOKEN_RE.findall(anchor.lower())))
+            suggestions.append({
+                "target_post_id": target_id,
+                "target_url": post.link,
+                "source_post_id": source_id,
+                "source_url": self.posts[source_id].link,
+                "anchor_text": anchor,
+                "context_hint": hint,
+                "score": round(score, 4),
+                "source_authority": round(self.authority.get(source_id, 0.0), 4),
+            })
+            if len(suggestions) >= sources:
+                break
+        return suggestions
+
+    def suggest_all(self, targets=None, sources=SOURCES_PER_TARGET):
+        """Suggestions for every orphan (or the given target ids)."""
+        targets = self.orphans() if targets is None else [t for t in targets if t in self.posts]
+        source_load = {}
+        suggestions = []
+        for target_id in targets:
+            suggestions.extend(self.suggest(target_id, sources=sources, source_load=source_load))
+        return suggestions
+
+    @staticmethod
+    def instructions(suggestions, limit=None):
+        """inject_internal_links instruction payload, one link per orphan first.
+
+        Orders by round (every orphan's best source before any second
+        source) so a capped run spreads links across as many orphans as
+        possible.
+        """
+        rounds = {}
+        seen = {}
+        for s in suggestions:
+            rank = seen.get(s["target_post_id"], 0)
+            seen[s["target_post_id"]] = rank + 1
+            rounds.setdefault(rank, []).append(s)
+        ordered = [s for rank in sorted(rounds) for s in rounds[rank]]
+        if limit is not None:
+            ordered = ordered[:limit]
+        return {
+            "injections": [
+                {
+                    "source_post_id": s["source_post_id"],
+                    "target_url": s["target_url"],
+                    "anchor_text": s["anchor_text"],
+                    "context_hint": s["context_hint"],
+                }
+                for s in ordered
+            ]
+        }
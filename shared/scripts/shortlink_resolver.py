@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Short-link resolver — expands amzn.to links so their tags can be checked.
+
+amzn.to links hide the destination (and its ?tag=) behind a redirect, so the
+affiliate audit used to skip them.  ShortlinkResolver expands them:
+- redirects are followed hop by hop with HEAD requests (GET when the host
+  rejects HEAD), and only while the next hop is still on a short-link host;
+  the destination itself (amazon.com) is never requested
+- requests run concurrently on a bounded worker pool, under a per-host cap
+  on in-flight requests and an adaptive minimum gap between requests
+  (wp_client.HostRateLimiter), with 429/503 backing off
+- every expansion is stored in a persistent cache that never expires, since
+  a short link's destination doesn't change once issued; a warm audit makes
+  no requests at all.  Failures are not cached and are retried next run.
+
+Cache file: state/shortlink_cache.json (shared by every site)
+
+Usage:
+    from shortlink_resolver import ShortlinkResolver
+    resolver = ShortlinkResolver()
+    resolved = resolver.resolve_many(["https://amzn.to/3abcDEF", ...])   # {short: long URL or None}
+    resolver.save()
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from wp_client import HostRateLimiter, get_session
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "../..")
+STATE_DIR = os.path.join(ROOT_DIR, "state")
+CACHE_PATH = os.path.join(STATE_DIR, "shortlink_cache.json")
+
+SHORTLINK_HOSTS = ("amzn.to", "a.co")
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+HEAD_REJECTED_STATUSES = {403, 405, 501}
+THROTTLE_STATUSES = {429, 503}
+
+MAX_REDIRECTS = 5
+MAX_RETRIES = 3
+RESOLVE_WORKERS = int(os.getenv("SHORTLINK_WORKERS", "8"))
+MAX_HOST_CONCURRENCY = int(os.getenv("SHORTLINK_MAX_HOST_CONCURRENCY", "4"))
+MIN_REQUEST_INTERVAL = float(os.getenv("SHORTLINK_MIN_REQUEST_INTERVAL", "0.2"))
+DEFAULT_TIMEOUT = int(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+USER_AGENT = "Mozilla/5.0 (compatible; AffiliateAudit/1.0)"
+
+
+def _host(url):
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class ShortlinkCache:
+    """Persistent {short URL: expansion} map; entries never expire.
+
+    Several audits (one per site) share the file, so save() merges this
+    process's new entries into what is on disk under an exclusive lock
+    instead of overwriting it with a stale copy.
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self._entries = None
+        self._changed = {}  # entries put by this process since the last save
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f).get("links", {})
+        except (OSError, json.JSONDecodeError, AttributeError):
+            return {}
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            self._entries = self._read()
+        return self._entries
+
+    def get(self, short_url):
+        entry = self.entries.get(short_url)
+        return entry["url"] if entry else None
+
+    def put(self, short_url, url, hops):
+        with self._lock:
+            entry = {"url": url, "hops": hops, "resolved_at": datetime.now().isoformat()}
+            self.entries[short_url] = entry
+            self._changed[short_url] = entry
+
+    @contextmanager
+    def file_lock(self):
+        """Exclusive advisory lock around the cache read-merge-replace."""
+        with open(self.path + ".lock", "a") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def save(self):
+        """Merge this process's new entries into the file on disk, atomically."""
+        if not self._changed:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self.file_lock(), self._lock:
+            links = self._read()
+            links.update(self._changed)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump({"links": links}, f, indent=1, sort_keys=True)
+                os.replace(tmp, self.path)
+            except Exception:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+            self._entries = links
+            self._changed = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class ShortlinkResolver:
+    """Concurrent, rate-limited, cached redirect expansion for short links."""
+
+    def __init__(self, cache=None, hosts=SHORTLINK_HOSTS, workers=RESOLVE_WORKERS,
+                 min_interval=MIN_REQUEST_INTERVAL, timeout=DEFAULT_TIMEOUT):
+        self.cache = cache if cache is not None else ShortlinkCache()
+        self.hosts = tuple(hosts)
+        self.workers = workers
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.errors = {}  # short URL -> reason, for links that could not be resolved
+        self.stats = {"cached": 0, "resolved": 0, "failed": 0, "requests": 0}
+        self._limiters = {}
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def is_short(self, url):
+        host = _host(url)
+        return any(host == h or host.endswith("." + h) for h in self.hosts)
+
+    def _host_controls(self, url):
+        host = _host(url)
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = HostRateLimiter(min_interval=self.min_interval)
+                self._semaphores[host] = threading.BoundedSemaphore(MAX_HOST_CONCURRENCY)
+            return self._limiters[host], self._semaphores[host]
+
+    def _request(self, method, url):
+        """One rate-limited request to a short-link host, retrying throttles."""
+        limiter, semaphore = self._host_controls(url)
+        for attempt in range(MAX_RETRIES + 1):
+            limiter.wait()
+            with semaphore:
+                response = get_session(url).request(
+                    method, url, allow_redirects=False, stream=True,
+                    headers={"User-Agent": USER_AGENT}, timeout=self.timeout,
+                )
+                response.close()  # only the status and Location header are needed
+            with self._lock:
+                self.stats["requests"] += 1
+            if response.status_code in THROTTLE_STATUSES and attempt < MAX_RETRIES:
+                limiter.penalize()
+                continue
+            if response.status_code < 400:
+                limiter.reward()
+            return response
+
+    def _expand(self, short_url):
+        """(destination URL, hops) for one short link; raises ValueError if it won't resolve."""
+        url = short_url
+        hops = 0
+        method = "HEAD"
+        while self.is_short(url):
+            if hops >= MAX_REDIRECTS:
+                raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+            response = self._request(method, url)
+            if method == "HEAD" and response.status_code in HEAD_REJECTED_STATUSES:
+                method = "GET"
+                continue
+            location = response.headers.get("Location")
+            if response.status_code not in REDIRECT_STATUSES or not location:
+                raise ValueError(f"HTTP {response.status_code} without a redirect")
+            url = urljoin(url, location)
+            hops += 1
+        return url, hops
+
+    def _resolve_one(self, short_url):
+        try:
+            url, hops = self._expand(short_url)
+        except (requests.RequestException, ValueError) as e:
+            return short_url, None, str(e)
+        self.cache.put(short_url, url, hops)
+        return short_url, url, ""
+
+    def resolve_many(self, urls, on_progress=None):
+        """{short URL: destination URL or None} for every short link in urls.
+
+        Cached links are answered without a request; the rest are expanded
+        concurrently.  on_progress(done, total) is called as each finishes.
+        Links that fail come back as None, with the reason in self.errors.
+        """
+        results = {}
+        pending = []
+        for url in dict.fromkeys(u for u in urls if u and self.is_short(u)):
+            cached = self.cache.get(url)
+            if cached:
+                results[url] = cached
+                self.stats["cached"] += 1
+            else:
+                pending.append(url)
+        if not pending:
+            return results
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(pending)))) as pool:
+            futures = [pool.submit(self._resolve_one, url) for url in pending]
+            for done, future in enumerate(as_completed(futures), start=1):
+                short_url, url, error = future.result()
+                results[short_url] = url
+                if url:
+                    self.stats["resolved"] += 1
+                else:
+                    self.stats["failed"] += 1
+                    self.errors[short_url] = error
+                if on_progress:
+                    on_progress(done, len(pending))
+        return results
+
+    def resolve(self, url):
+        """Destination of a single short link (None if it won't resolve)."""
+        return self.resolve_many([url]).get(url)
+
+    def save(self):
+        self.cache.save()
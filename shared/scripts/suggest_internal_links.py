@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Suggest Internal Links — find source posts and anchor phrases for every
+orphan and write them as inject_internal_links instructions.
+
+Posts come from the shared content cache (a live crawl if it's cold); the
+ranking is link_suggester.LinkSuggester (TF-IDF inverted index, weighted by
+internal PageRank).  Sources inside an agent's URL impact window are
+skipped.  The best MAX_INJECTIONS suggestions (one per orphan first) are
+merged into:
+    state/pending_link_inject_{slug}.json
+
+so the next inject_internal_links call applies them.  Every suggestion is
+returned in the tool result.
+
+Usage:
+    SITE_PREFIX=WP_GRIDDLEKING python3 suggest_internal_links.py [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import requests
+from dotenv import load_dotenv
+
+from content_cache import ContentCache, load_posts
+from link_suggester import SOURCES_PER_TARGET, LinkSuggester, load_cooldown_urls
+from tool_protocol import ProgressReporter, emit_result
+from wp_client import LINK_SUGGEST_FIELDS, WPClient
+
+load_dotenv(os.path.join(os.path.dirname(__file__), "../../.env"))
+
+# ── Config ──────────────────────────────────────────────────────────────────
+SITE_PREFIX = os.getenv("SITE_PREFIX", "")
+if SITE_PREFIX:
+    SITE_PREFIX += "_"
+
+WP_URL = os.getenv(f"{SITE_PREFIX}URL", os.getenv("WP_URL", "")).rstrip("/")
+WP_USERNAME = os.getenv(f"{SITE_PREFIX}USERNAME", os.getenv("WP_USERNAME"))
+WP_APP_PASS = os.getenv(f"{SITE_PREFIX}PASSWORD", os.getenv("WP_APP_PASS"))
+TIMEOUT = int(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+
+ROOT_DIR = os.path.join(os.path.dirname(__file__), "../..")
+STATE_DIR = os.path.join(ROOT_DIR, "state")
+
+raw_prefix = os.getenv("SITE_PREFIX", "")
+SLUG = raw_prefix.lower().replace("wp_", "").replace("_", "") if raw_prefix else "default"
+INSTRUCTION_PATH = os.path.join(STATE_DIR, f"pending_link_inject_{SLUG}.json")
+MAX_INJECTIONS = 30  # inject_internal_links applies at most 30 per run
+
+
+def get_posts(wp):
+    """Published posts from the content cache, or a live crawl if it's cold."""
+    try:
+        cached = load_posts(ContentCache(SLUG), wp)
+    except requests.RequestException as e:
+        print(f"Content cache refresh failed: {e}")
+        cached = None
+    if cached is not None:
+        print(f"Loaded {len(cached)} posts from content cache ({wp.requests_made} requests)")
+        return cached
+
+    progress = ProgressReporter("fetch_posts", unit="pages")
+    pages = []
+
+    def on_page(page, total_pages, batch):
+        pages.append(page)
+        progress.update(len(pages), total=total_pages)
+
+    posts = wp.fetch_all_posts(fields=LINK_SUGGEST_FIELDS, on_page=on_page)
+    progress.finish(len(pages), posts=len(posts))
+    print(f"Fetched {len(posts)} posts from WordPress")
+    return posts
+
+
+def merge_instructions(injections):
+    """Add injections to the pending instruction file; returns how many were new."""
+    existing = []
+    if os.path.exists(INSTRUCTION_PATH):
+        try:
+            with open(INSTRUCTION_PATH, "r") as f:
+                existing = json.load(f).get("injections", [])
+        except (OSError, ValueError, AttributeError):
+            existing = []
+    seen = {(int(i.get("source_post_id") or 0), i.get("target_url")) for i in existing}
+    added = [i for i in injections if (i["source_post_id"], i["target_url"]) not in seen]
+    os.makedirs(STATE_DIR, exist_ok=True)
+    tmp_path = INSTRUCTION_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"injections": existing + added}, f, indent=2)
+    os.replace(tmp_path, INSTRUCTION_PATH)
+    return len(added)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggest internal links for orphan posts.")
+    parser.add_argument("--dry-run", action="store_true", help="Report suggestions without writing instructions")
+    parser.add_argument("--max-injections", type=int, default=MAX_INJECTIONS)
+    parser.add_argument("--sources", type=int, default=SOURCES_PER_TARGET, help="Source posts per orphan")
+    args = parser.parse_args()
+
+    if not WP_URL or not WP_USERNAME or not WP_APP_PASS:
+        print("WordPress credentials missing.")
+        sys.exit(1)
+
+    wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=TIMEOUT)
+    posts = get_posts(wp)
+
+    started = time.perf_counter()
+    cooldown = load_cooldown_urls(STATE_DIR, host=WP_URL)
+    suggester = LinkSuggester(posts, host=WP_URL, cooldown_urls=cooldown)
+    orphans = suggester.orphans()
+    suggestions = suggester.suggest_all(orphans, sources=args.sources)
+    elapsed = time.perf_counter() - started
+    covered = {s["target_post_id"] for s in suggestions}
+    print(f"{len(orphans)} orphans, {len(covered)} with suggestions "
+          f"({len(suggestions)} total, {len(cooldown)} URLs in cooldown) in {elapsed:.2f}s")
+
+    instructions = suggester.instructions(suggestions, limit=args.max_injections)
+    written = 0
+    if not args.dry_run and instructions["injections"]:
+        written = merge_instructions(instructions["injections"])
+        print(f"Wrote {written} injections to {INSTRUCTION_PATH}")
+
+    output = {
+        "success": True,
+        "orphans": len(orphans),
+        "orphans_with_suggestions": len(covered),
+        "orphans_without_suggestions": sorted(set(orphans) - covered),
+        "instructions_written": written,
+        "instruction_file": os.path.basename(INSTRUCTION_PATH) if written else None,
+        "seconds": round(elapsed, 2),
+        "suggestions": suggestions,
+    }
+    emit_result(output)
+    print(json.dumps({k: v for k, v in output.items() if k != "suggestions"}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tool result protocol — how scripts hand structured results back to ToolRegistry.
+
+When a script runs under ToolRegistry, the registry opens a private pipe and
+passes its write end to the child as the file descriptor named in
+TOOL_RESULT_FD.  The script emits exactly one final JSON document on that
+descriptor.  Nothing touches the filesystem, so two sites can run the same
+tool at the same time, and stdout truncation never loses the result.
+
+Scripts run by hand (no TOOL_RESULT_FD) get False back from emit_result() and
+fall back to their legacy report files.
+
+Long-running tools can also stream newline-delimited JSON progress events on
+TOOL_PROGRESS_FD (see ProgressReporter).  The registry forwards each event as
+it arrives so the agent's status shows live throughput instead of a black box.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+RESULT_FD_ENV = "TOOL_RESULT_FD"
+PROGRESS_FD_ENV = "TOOL_PROGRESS_FD"
+
+_result_emitted = False
+_progress_channel = None
+
+
+def has_result_channel():
+    """True when a ToolRegistry result channel is attached to this process."""
+    return bool(os.getenv(RESULT_FD_ENV)) and not _result_emitted
+
+
+def emit_result(data):
+    """Send the final structured result over the registry's result channel.
+
+    Args:
+        data: JSON-serializable result (normally a dict).
+
+    Returns:
+        bool: True if the result was delivered, False if no channel is
+        attached (manual run) or a result was already emitted.
+    """
+    global _result_emitted
+    if not has_result_channel():
+        return False
+
+    try:
+        fd = int(os.environ[RESULT_FD_ENV])
+        payload = json.dumps(data, default=str).encode("utf-8")
+        with os.fdopen(fd, "wb") as channel:
+            channel.write(payload)
+    except (OSError, ValueError, TypeError) as e:
+        print(f"⚠️ Could not emit tool result: {e}")
+        return False
+
+    _result_emitted = True
+    return True
+
+
+def _open_progress_channel():
+    global _progress_channel
+    if _progress_channel is None:
+        fd = os.getenv(PROGRESS_FD_ENV)
+        if not fd:
+            return None
+        try:
+            _progress_channel = os.fdopen(int(fd), "wb", buffering=0)
+        except (OSError, ValueError):
+            return None
+    return _progress_channel
+
+
+def emit_progress(event):
+    """Write one progress event (dict) as a JSON line.  No-op on manual runs."""
+    channel = _open_progress_channel()
+    if channel is None:
+        return False
+    try:
+        line = json.dumps(event, default=str) + "\n"
+        channel.write(line.encode("utf-8"))
+    except (OSError, ValueError, TypeError):
+        return False
+    return True
+
+
+class ProgressReporter:
+    """Throttled progress events for one stage of a tool run.
+
+    Usage:
+        progress = ProgressReporter("fetch_posts", unit="pages")
+        for page in ...:
+            progress.update(done, total=total_pages, posts=len(all_posts))
+        progress.finish(posts=len(all_posts))
+    """
+
+    def __init__(self, stage, total=None, unit="items", min_interval=1.0):
+        self.stage = stage
+        self.total = total
+        self.unit = unit
+        self.min_interval = min_interval
+        self.started = time.monotonic()
+        self._last_emit = 0.0
+
+    def _event(self, done, fields):
+        elapsed = time.monotonic() - self.started
+        rate = (done / elapsed) if elapsed > 0 and done else 0.0
+        eta = None
+        if self.total and rate > 0:
+            eta = max(0.0, (self.total - done) / rate)
+        event = {
+            "stage": self.stage,
+            "done": done,
+            "total": self.total,
+            "unit": self.unit,
+            "elapsed_seconds": round(elapsed, 1),
+            "rate_per_sec": round(rate, 2),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "at": datetime.now().isoformat(),
+        }
+        event.update(fields)
+        return event
+
+    def update(self, done, total=None, force=False, **fields):
+        """Report progress; emits at most once per min_interval unless forced."""
+        if total is not None:
+            self.total = total
+        now = time.monotonic()
+        if not force and now - self._last_emit < self.min_interval:
+            return False
+        self._last_emit = now
+        return emit_progress(self._event(done, fields))
+
+    def finish(self, done=None, **fields):
+        """Emit the final event for this stage."""
+        if done is None:
+            done = self.total or 0
+        fields["final"] = True
+        return self.update(done, force=True, **fields)
@@ -18,6 +18,7 @@ from dotenv import load_dotenv
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
 
 from telegram_utils import send_telegram_alert
+from tool_protocol import emit_result
 
 
 # Configuration
@@ -255,9 +256,10 @@ results = {
     'total_page2_keywords': len([o for o in keyword_opportunities if o['current_position'] and 11 <= o['current_position'] <= 20])
 }
 
-os.makedirs('data', exist_ok=True)
-with open('keyword_opportunities.json', 'w') as f:
-    json.dump(results, f, indent=2)
+if not emit_result(results):
+    os.makedirs('data', exist_ok=True)
+    with open('keyword_opportunities.json', 'w') as f:
+        json.dump(results, f, indent=2)
 
 # Save strategy plan (document for agent to refer to)
 strategy_data = {
@@ -270,4 +272,4 @@ strategy_data = {
 with open(STRATEGY_FILE, 'w') as f:
     json.dump(strategy_data, f, indent=2)
 
-print(f"\n✅ Results saved to keyword_opportunities.json and {STRATEGY_FILE}")
+print(f"\n✅ Results saved (market analysis: {STRATEGY_FILE})")
@@ -12,7 +12,6 @@ from datetime import datetime, timedelta
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from collections import defaultdict
-import time
 from dotenv import load_dotenv
 
 # Load root .env
@@ -20,7 +19,11 @@ from dotenv import load_dotenv
 # Load root .env
 load_dotenv(os.path.join(os.path.dirname(__file__), '../../.env'))
 
+from content_cache import ContentCache, load_posts, site_slug
+from link_graph import LinkGraph
 from telegram_utils import send_telegram_alert
+from tool_protocol import ProgressReporter, emit_result
+from wp_client import SEO_AUDIT_FIELDS, WPClient
 
 
 # Configuration
@@ -39,6 +42,10 @@ BRAVE_API_KEY = os.getenv('BRAVE_SEARCH_API_KEY') # Shared key
 GSC_JSON_KEY = os.getenv(f'{SITE_PREFIX}GSC_JSON_KEY', os.getenv('GSC_JSON_KEY'))
 SITE_URL = os.getenv(f'{SITE_PREFIX}GSC_SITE_URL', 'https://griddleking.com/')
 
+DATA_DIR = os.path.join(os.path.dirname(__file__), '../../data')
+# Latest results per site; orphan_rescue reads its orphans and authorities here
+RESULTS_PATH = os.path.join(DATA_DIR, f'seo_audit_{site_slug()}.json')
+
 print(f"🚀 UNIVERSAL SEO AUDIT - TARGET: {SITE_URL}")
 print(f"📡 CFG PREFIX: {SITE_PREFIX if SITE_PREFIX else 'DEFAULT (Griddle King)'}")
 
@@ -177,63 +184,76 @@ if not WP_USERNAME or not WP_APP_PASS:
     send_telegram_alert(msg)
     exit(1)
 
-wp_auth = (WP_USERNAME, WP_APP_PASS)
+wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=30)
 all_posts = []
-page = 1
+fetched_pages = {}  # page -> posts, kept so a failed crawl still yields what arrived
 
-print("Fetching WordPress posts...")
 wp_fetch_failed = False
-while True:
+fetch_progress = ProgressReporter("fetch_posts", unit="pages")
+
+# The shared content cache (kept fresh by build_site_inventory) serves the
+# whole audit without crawling; fall back to the API when it's cold.
+try:
+    cached_posts = load_posts(ContentCache.for_site(), wp)
+except requests.exceptions.RequestException as e:
+    print(f"⚠️  Content cache refresh failed ({e}); crawling instead")
+    cached_posts = None
+
+if cached_posts is not None:
+    all_posts = cached_posts
+    print(f"Loaded {len(all_posts)} posts from content cache ({wp.requests_made} requests)")
+else:
+    print("Fetching WordPress posts...")
+
+
+def _on_page(page, total_pages, posts):
+    fetched_pages[page] = posts
+    fetch_progress.update(len(fetched_pages), total=total_pages,
+                          posts=sum(len(b) for b in fetched_pages.values()))
+
+
+if cached_posts is None:
     try:
-        response = requests.get(
-            f"{WP_URL}/wp-json/wp/v2/posts",
-            params={'per_page': 100, 'page': page, 'status': 'publish'},
-            auth=wp_auth,
-            timeout=30
-        )
-        if response.status_code == 401 or response.status_code == 403:
+        all_posts = wp.fetch_all_posts(on_page=_on_page, fields=SEO_AUDIT_FIELDS)
+    except requests.exceptions.HTTPError as e:
+        status = e.response.status_code if e.response is not None else None
+        if status in (401, 403):
             msg = (f"🚨 *WORDPRESS AUTH FAILED*\n"
-                   f"• Status code: `{response.status_code}`\n"
+                   f"• Status code: `{status}`\n"
                    f"• WordPress credentials are invalid or expired\n"
                    f"• Content audit is offline")
             print(msg)
             send_telegram_alert(msg)
             wp_fetch_failed = True
-            break
-        if response.status_code != 200:
-            break
-        posts = response.json()
-        if not posts:
-            break
-        all_posts.extend(posts)
-        page += 1
-        time.sleep(0.5)
     except requests.exceptions.RequestException as e:
         msg = (f"🚨 *WORDPRESS API ERROR*\n"
                f"• Error: `{str(e)[:200]}`\n"
-               f"• Retrieved {len(all_posts)} posts before failure\n"
+               f"• Retrieved {sum(len(b) for b in fetched_pages.values())} posts before failure\n"
                f"• Content audit may be incomplete")
         print(msg)
         send_telegram_alert(msg)
         wp_fetch_failed = True
-        break
+
+    if not all_posts and fetched_pages:
+        all_posts = [post for page in sorted(fetched_pages) for post in fetched_pages[page]]
 
 if wp_fetch_failed and len(all_posts) == 0:
     print("❌ No posts retrieved. Cannot continue content audit.")
     exit(1)
 
+fetch_progress.finish(len(fetched_pages), posts=len(all_posts))
 print(f"✅ Retrieved {len(all_posts)} published posts")
 
 # Build post database
 post_db = {}
 for post in all_posts:
-    post_db[post['link']] = {
-        'id': post['id'],
-        'title': post['title']['rendered'],
-        'date': post['date'],
-        'modified': post['modified'],
-        'link': post['link'],
-        'content': post['content']['rendered']
+    post_db[post.link] = {
+        'id': post.id,
+        'title': post.title,
+        'date': post.date,
+        'modified': post.modified,
+        'link': post.link,
+        'content': post.content
     }
 
 # Identify old posts (>12 months)
@@ -287,17 +307,20 @@ for i, page in enumerate(decay_candidates[:5], 1):
 print("\n🔗 STEP 4: Internal Linking Audit")
 print("=" * 60)
 
-# Build internal link graph
+# Build internal link graph from each post's hrefs (normalized, dict lookup)
+graph = LinkGraph({post['id']: url for url, post in post_db.items()}, host=WP_URL)
+
+link_progress = ProgressReporter("link_graph", total=len(post_db), unit="posts")
+for scanned, (url, post) in enumerate(post_db.items(), 1):
+    link_progress.update(scanned)
+    graph.add_content(post['id'], post['content'])
+
 internal_links = defaultdict(set)  # page -> set of pages it links to
 backlinks = defaultdict(set)  # page -> set of pages linking to it
-
-for url, post in post_db.items():
-    content = post['content']
-    # Find internal links in content
-    for target_url in post_db.keys():
-        if target_url != url and target_url in content:
-            internal_links[url].add(target_url)
-            backlinks[target_url].add(url)
+for source_id, target_ids in graph.outbound.items():
+    for target_id in target_ids:
+        internal_links[graph.urls[source_id]].add(graph.urls[target_id])
+        backlinks[graph.urls[target_id]].add(graph.urls[source_id])
 
 # Find orphaned content (no internal links)
 orphaned = []
@@ -315,25 +338,26 @@ for i, orphan in enumerate(orphaned[:10], 1):
     print(f"{i}. {orphan['title']}")
     print(f"   {orphan['url']}")
 
-# Identify high-authority posts (most outbound links)
+# Identify high-authority posts (internal PageRank, site mean = 1.0)
+authority = graph.pagerank()
 high_authority = []
 for url, post in post_db.items():
-    outbound_count = len(internal_links.get(url, set()))
-    backlink_count = len(backlinks.get(url, set()))
-    if outbound_count > 5:  # Posts that already link to others
+    score = authority.get(post['id'], 0.0)
+    if score > 1.0:  # Above-average link equity: good link sources
         high_authority.append({
             'url': url,
             'title': post['title'],
-            'outbound': outbound_count,
-            'backlinks': backlink_count
+            'authority': round(score, 4),
+            'outbound': len(internal_links.get(url, set())),
+            'backlinks': len(backlinks.get(url, set()))
         })
 
-high_authority.sort(key=lambda x: x['outbound'], reverse=True)
+high_authority.sort(key=lambda x: x['authority'], reverse=True)
 
-print(f"\n✅ Top 10 high-authority posts (most internal links):")
+print(f"\n✅ Top 10 high-authority posts (internal PageRank):")
 for i, post in enumerate(high_authority[:10], 1):
     print(f"{i}. {post['title']}")
-    print(f"   Outbound: {post['outbound']} | Backlinks: {post['backlinks']}")
+    print(f"   Authority: {post['authority']:.2f} | Backlinks: {post['backlinks']} | Outbound: {post['outbound']}")
 
 # ============================================================================
 # 5. SAVE RESULTS
@@ -354,8 +378,16 @@ results = {
     }
 }
 
-with open('seo_kickstart_results.json', 'w') as f:
+os.makedirs(DATA_DIR, exist_ok=True)
+with open(RESULTS_PATH + '.tmp', 'w') as f:
     json.dump(results, f, indent=2)
-
-print("✅ Results saved to seo_kickstart_results.json")
+os.replace(RESULTS_PATH + '.tmp', RESULTS_PATH)
+print(f"✅ Results saved to {os.path.relpath(RESULTS_PATH)}")
+
+if emit_result(results):
+    print("✅ Results sent to tool registry")
+else:
+    with open('seo_kickstart_results.json', 'w') as f:
+        json.dump(results, f, indent=2)
+    print("✅ Results saved to seo_kickstart_results.json")
 print("\n🎯 Mission Step 1-4 Complete! Now analyzing keywords...")
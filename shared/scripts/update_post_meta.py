@@ -19,12 +19,17 @@ Usage:
 import os
 import sys
 import json
-import time
 from datetime import datetime
 
-import requests
 from dotenv import load_dotenv
 
+from changelog import Changelog
+from content_cache import ContentCache
+from inventory_store import InventoryDelta
+from tool_protocol import emit_result
+from wp_client import META_EDIT_FIELDS, WPClient
+from write_stage import WriteStage
+
 load_dotenv(os.path.join(os.path.dirname(__file__), "../../.env"))
 
 # ── Config ──────────────────────────────────────────────────────────────────
@@ -44,8 +49,13 @@ DATA_DIR = os.path.join(ROOT_DIR, "data")
 raw_prefix = os.getenv("SITE_PREFIX", "")
 SLUG = raw_prefix.lower().replace("wp_", "").replace("_", "") if raw_prefix else "default"
 INSTRUCTION_PATH = os.path.join(STATE_DIR, f"pending_meta_update_{SLUG}.json")
-CHANGELOG_PATH = os.path.join(DATA_DIR, f"meta_changelog_{SLUG}.json")
-INVENTORY_PATH = os.path.join(STATE_DIR, f"inventory_{SLUG}.json")
+CHANGELOG_PATH = os.path.join(DATA_DIR, f"meta_changelog_{SLUG}.jsonl")
+
+wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=TIMEOUT)
+content_cache = ContentCache(SLUG)
+changelog = Changelog(CHANGELOG_PATH)  # buffered; committed once at end of run
+inventory_delta = InventoryDelta()  # applied in one locked commit at end of run
+write_stage = WriteStage.from_env(wp, content_cache)  # one diffed write per post (per plan under WRITE_STAGE_PATH)
 
 
 def load_instructions():
@@ -62,42 +72,26 @@ def clear_instructions():
         os.unlink(INSTRUCTION_PATH)
 
 
-def update_post(post_id, data):
-    """PUT to WordPress REST API to update a post."""
-    url = f"{WP_URL}/wp-json/wp/v2/posts/{post_id}"
-    resp = requests.post(url, json=data, auth=(WP_USERNAME, WP_APP_PASS), timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()
+def write_posts(payloads):
+    """Stage {post_id: data} and write each changed post once; returns {post_id: WriteResult}."""
+    for pid, data in payloads.items():
+        write_stage.stage(pid, "update_post_meta", **data)
+    return write_stage.flush()
 
 
-def append_changelog(entry):
-    """Append a change record to the changelog."""
-    os.makedirs(os.path.dirname(CHANGELOG_PATH), exist_ok=True)
-    log = []
-    if os.path.exists(CHANGELOG_PATH):
-        with open(CHANGELOG_PATH, "r") as f:
-            log = json.load(f)
-    log.insert(0, entry)
-    log = log[:500]
-    with open(CHANGELOG_PATH, "w") as f:
-        json.dump(log, f, indent=2, default=str)
+def append_changelog(post_id, entry):
+    """Append a change record to the changelog (held with the staged post until it is written in a plan)."""
+    write_stage.log_change(post_id, changelog, entry)
 
 
 def update_inventory(post_id, new_title=None, new_meta=None):
-    """Update the inventory entry for a post after a successful write."""
-    if not os.path.exists(INVENTORY_PATH):
-        return
-    with open(INVENTORY_PATH, "r") as f:
-        inv = json.load(f)
-    entry = inv.get("posts", {}).get(str(post_id))
-    if entry:
-        if new_title:
-            entry["title"] = new_title
-        if new_meta:
-            entry["meta_description"] = new_meta
-        entry["last_audited_at"] = datetime.now().isoformat()
-        with open(INVENTORY_PATH, "w") as f:
-            json.dump(inv, f, indent=2, default=str)
+    """Queue the inventory changes for a post after a successful write."""
+    fields = {"last_audited_at": datetime.now().isoformat()}
+    if new_title:
+        fields["title"] = new_title
+    if new_meta:
+        fields["meta_description"] = new_meta
+    write_stage.update_inventory(post_id, inventory_delta, "set", **fields)
 
 
 def main():
@@ -108,20 +102,26 @@ def main():
     instructions = load_instructions()
     if not instructions:
         print("No pending meta updates found. Nothing to do.")
-        print(json.dumps({"success": True, "updates": 0, "message": "No pending instructions"}))
+        output = {"success": True, "updates": 0, "message": "No pending instructions"}
+        emit_result(output)
+        print(json.dumps(output))
         return
 
     updates = instructions.get("updates", [])
     if not updates:
         print("Instruction file empty.")
         clear_instructions()
-        print(json.dumps({"success": True, "updates": 0, "message": "Empty instruction file"}))
+        output = {"success": True, "updates": 0, "message": "Empty instruction file"}
+        emit_result(output)
+        print(json.dumps(output))
         return
 
     results = []
     succeeded = 0
     failed = 0
 
+    # Build the WordPress update payloads
+    payloads = {}  # post_id -> (data, new_title, new_meta)
     for item in updates[:20]:  # Safety cap: max 20 updates per run
         post_id = item.get("post_id")
         new_title = item.get("new_title")
@@ -130,7 +130,6 @@ def main():
         if not post_id:
             continue
 
-        # Build the WordPress update payload
         data = {}
         if new_title:
             data["title"] = new_title
@@ -143,43 +142,51 @@ def main():
 
         if not data:
             continue
-
-        try:
-            print(f"Updating post {post_id}...", end=" ")
-
-            # Fetch current values for changelog
-            current = requests.get(
-                f"{WP_URL}/wp-json/wp/v2/posts/{post_id}",
-                auth=(WP_USERNAME, WP_APP_PASS),
-                timeout=TIMEOUT,
-            ).json()
-            old_title = current.get("title", {}).get("rendered", "")
-            old_excerpt = current.get("excerpt", {}).get("rendered", "")
-
-            result = update_post(post_id, data)
-            succeeded += 1
-            print("OK")
-
-            change = {
-                "post_id": post_id,
-                "url": current.get("link", ""),
-                "at": datetime.now().isoformat(),
-                "changes": {},
-            }
-            if new_title:
-                change["changes"]["title"] = {"before": old_title, "after": new_title}
-            if new_meta:
-                change["changes"]["meta_description"] = {"before": old_excerpt[:200], "after": new_meta}
-
-            append_changelog(change)
-            update_inventory(post_id, new_title=new_title, new_meta=new_meta)
-            results.append({"post_id": post_id, "status": "ok"})
-            time.sleep(0.5)
-
-        except Exception as e:
+        payloads[int(post_id)] = (data, new_title, new_meta)
+
+    # Fetch the stored values (changelog "before" and no-op check) in one listing request
+    try:
+        current_posts = write_stage.fetch(payloads, fields=META_EDIT_FIELDS)
+    except Exception as e:
+        print(f"Fetching current values FAILED: {e}")
+        current_posts = {}
+
+    for post_id in [pid for pid in payloads if pid not in current_posts]:
+        failed += 1
+        print(f"Post {post_id} FAILED: not found")
+        results.append({"post_id": post_id, "status": "error", "error": "post not found"})
+        del payloads[post_id]
+
+    print(f"Updating {len(payloads)} posts...")
+    written = write_posts({pid: data for pid, (data, _, _) in payloads.items()})
+
+    for post_id, (_, new_title, new_meta) in payloads.items():
+        outcome = written[post_id]
+        if not outcome.ok:
             failed += 1
-            print(f"FAILED: {e}")
-            results.append({"post_id": post_id, "status": "error", "error": str(e)[:200]})
+            print(f"Post {post_id} FAILED: {outcome.error}")
+            results.append({"post_id": post_id, "status": "error", "error": outcome.error[:200]})
+            continue
+
+        staged = outcome.via == "staged"
+        succeeded += 1
+        print(f"Post {post_id}: {'staged' if staged else 'OK'}")
+        current = current_posts[post_id]
+
+        change = {
+            "post_id": post_id,
+            "url": current.link,
+            "at": datetime.now().isoformat(),
+            "changes": {},
+        }
+        if new_title:
+            change["changes"]["title"] = {"before": current.title, "after": new_title}
+        if new_meta:
+            change["changes"]["meta_description"] = {"before": current.excerpt[:200], "after": new_meta}
+
+        append_changelog(post_id, change)
+        update_inventory(post_id, new_title=new_title, new_meta=new_meta)
+        results.append({"post_id": post_id, "status": "staged" if staged else "ok"})
 
     clear_instructions()
 
@@ -187,9 +194,15 @@ def main():
         "success": succeeded > 0,
         "updates": succeeded,
         "failed": failed,
+        "writes": write_stage.summary(),
         "details": results,
     }
     print(f"\nMeta updates: {succeeded} succeeded, {failed} failed")
+    write_stage.finish()
+    changelog.commit()
+    content_cache.save()
+    inventory_delta.commit(SLUG)
+    emit_result(output)
     print(json.dumps(output))
 
 
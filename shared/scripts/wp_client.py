@@ -0,0 +1,683 @@
+#!/usr/bin/env python3
+"""
+Shared WordPress REST client — single source of truth for WP HTTP access.
+
+Every script that talks to /wp-json goes through WPClient instead of bare
+requests.get/post:
+- one keep-alive requests.Session per host (connection pool shared by all
+  clients in the process)
+- automatic retries on 429/5xx and connection errors, exponential backoff
+  with jitter, Retry-After honoured
+- adaptive per-host rate limiting: the minimum gap between requests widens
+  when the host pushes back (429/503) and decays back as requests succeed
+- pagination driven by X-WP-TotalPages: page 1 is fetched first, the rest
+  concurrently on a bounded worker pool under a per-host concurrency cap,
+  and reassembled in page order
+- conditional GETs (If-None-Match / If-Modified-Since) against stored
+  per-endpoint validators, so unchanged listing pages come back as 304
+- _fields projections so each consumer only downloads the keys it reads,
+  and context=edit fetches so write tools edit the stored markup
+- typed WPPost records instead of raw JSON dicts
+- multi-post writes grouped through /batch/v1 (up to BATCH_MAX_ITEMS per
+  request), falling back to concurrent single-post writes under the host
+  cap when the site has no batch route; one WriteResult per item
+
+Usage:
+    from wp_client import WPClient
+    wp = WPClient(WP_URL, WP_USERNAME, WP_APP_PASS, timeout=TIMEOUT)
+    for post in wp.fetch_all_posts():
+        print(post.id, post.link)
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_TIMEOUT = int(os.getenv("HTTP_TIMEOUT_SECONDS", "30"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = int(os.getenv("WP_MAX_RETRIES", "4"))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+POOL_MAXSIZE = int(os.getenv("WP_POOL_MAXSIZE", "8"))
+
+# In-flight requests allowed per host (shared by every client and thread),
+# and the default worker count for paginated crawls.
+MAX_HOST_CONCURRENCY = int(os.getenv("WP_MAX_HOST_CONCURRENCY", "4"))
+CRAWL_WORKERS = int(os.getenv("WP_CRAWL_WORKERS", "4"))
+
+# Adaptive rate limit: floor gap between requests to one host, and ceiling
+# the gap can grow to while the host keeps throttling us.
+MIN_REQUEST_INTERVAL = float(os.getenv("WP_MIN_REQUEST_INTERVAL", "0.1"))
+MAX_REQUEST_INTERVAL = 10.0
+
+PER_PAGE = 100
+
+# WordPress caps /batch/v1 at 25 sub-requests unless a plugin raises it
+# (rest_get_max_batch_size).
+BATCH_MAX_ITEMS = int(os.getenv("WP_BATCH_MAX_ITEMS", "25"))
+# Responses meaning "this site can't batch" rather than "these writes failed".
+BATCH_UNSUPPORTED_STATUSES = {404, 405, 501}
+BATCH_UNSUPPORTED_CODES = {"rest_no_route", "rest_batch_not_allowed", "rest_batch_too_many_requests"}
+
+# _fields projections per consumer: WordPress only serializes (and we only
+# download and parse) the keys each tool actually reads.  Full objects carry
+# yoast_head, _links, guid, meta, etc. that nothing here uses.
+INVENTORY_FIELDS = (
+    "id", "link", "slug", "status", "title", "excerpt", "content",
+    "date", "modified", "modified_gmt", "yoast_head_json.description",
+)
+AFFILIATE_FIELDS = ("id", "link", "title", "content")
+SEO_AUDIT_FIELDS = ("id", "link", "title", "date", "modified", "content")
+META_FIELDS = ("id", "link", "title", "excerpt")
+# What update_post_meta writes, stored values only (pair with context="edit").
+META_EDIT_FIELDS = ("id", "link", "title.raw", "excerpt.raw", "meta")
+LINK_SUGGEST_FIELDS = ("id", "link", "slug", "title", "content")
+
+# Fields every write tool needs: the stored (raw) markup plus identity.
+# Pair with context="edit"; rendered content is never fetched or written back.
+EDIT_FIELDS = ("id", "link", "slug", "modified_gmt", "title.raw", "content.raw")
+
+
+class HostRateLimiter:
+    """Adaptive minimum-interval limiter for one host (thread-safe)."""
+
+    def __init__(self, min_interval=None, max_interval=MAX_REQUEST_INTERVAL):
+        self.floor = MIN_REQUEST_INTERVAL if min_interval is None else min_interval
+        self.ceiling = max_interval
+        self.interval = self.floor
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's request slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def penalize(self):
+        """Host is throttling: double the gap between requests."""
+        with self._lock:
+            self.interval = min(self.ceiling, max(self.interval * 2, self.floor * 2, 0.5))
+
+    def reward(self):
+        """Successful request: decay the gap back toward the floor."""
+        with self._lock:
+            self.interval = max(self.floor, self.interval * 0.9)
+
+
+_sessions = {}
+_limiters = {}
+_semaphores = {}
+_batch_support = {}  # host -> False once /batch/v1 is known to be missing
+_registry_lock = threading.Lock()
+
+
+def _host_key(url):
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+def get_session(url):
+    """Keep-alive Session for a host, shared across clients in this process."""
+    host = _host_key(url)
+    with _registry_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(POOL_MAXSIZE, MAX_HOST_CONCURRENCY),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[host] = session
+        return session
+
+
+def get_rate_limiter(url):
+    """Per-host adaptive rate limiter, shared across clients in this process."""
+    host = _host_key(url)
+    with _registry_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = HostRateLimiter()
+            _limiters[host] = limiter
+        return limiter
+
+
+def get_host_semaphore(url):
+    """Per-host cap on in-flight requests, shared across clients and threads."""
+    host = _host_key(url)
+    with _registry_lock:
+        semaphore = _semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(MAX_HOST_CONCURRENCY)
+            _semaphores[host] = semaphore
+        return semaphore
+
+
+def _rendered(value):
+    """WP returns {"rendered": ..., "raw": ...} objects for text fields."""
+    if isinstance(value, dict):
+        return value.get("rendered") or ""
+    return value or ""
+
+
+def _raw(value):
+    """The stored markup of a text field (only present with context=edit)."""
+    if isinstance(value, dict):
+        return value.get("raw") or ""
+    return ""
+
+
+def build_query(params=None, fields=None, context=None):
+    """Merge listing params with a _fields projection and REST context."""
+    query = dict(params or {})
+    if fields:
+        query["_fields"] = fields if isinstance(fields, str) else ",".join(fields)
+    if context:
+        query["context"] = context
+    return query
+
+
+class ValidatorCache:
+    """ETag/Last-Modified validators per endpoint, persisted by the caller.
+
+    Entries are keyed by route + query and remember which post IDs the page
+    held, so a 304 tells the caller exactly which posts are unchanged.  The
+    moving sync cursor (modified_after) is left out of the key, so the next
+    incremental listing reuses this run's validators.  Entries this run did
+    not request are kept, so a full crawl's validators survive the
+    incremental runs in between.
+    """
+
+    # Query parameters whose value changes every run; keyed by name only.
+    VOLATILE_PARAMS = ("modified_after",)
+
+    def __init__(self, entries=None):
+        self._previous = dict(entries or {})
+        self._current = {}
+        self.not_modified_pages = 0
+        self.not_modified_ids = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path, params):
+        query = sorted((k, "*" if k in ValidatorCache.VOLATILE_PARAMS else v)
+                       for k, v in (params or {}).items())
+        return f"{path}?{urlencode(query)}"
+
+    def headers_for(self, key):
+        entry = self._previous.get(key) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, response, post_ids):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._current[key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "total_pages": WPClient._total_pages(response),
+                "post_ids": post_ids,
+            }
+
+    def not_modified(self, key):
+        """Record a 304 for key; returns the cached entry."""
+        entry = self._previous.get(key) or {}
+        with self._lock:
+            self._current[key] = entry
+            self.not_modified_pages += 1
+            self.not_modified_ids.extend(entry.get("post_ids", []))
+        return entry
+
+    def to_dict(self):
+        return {**self._previous, **self._current}
+
+
+@dataclass
+class WPPost:
+    """Typed view of a /wp/v2/posts object."""
+
+    id: int
+    link: str = ""
+    slug: str = ""
+    status: str = ""
+    title: str = ""
+    content: str = ""
+    content_raw: str = ""
+    excerpt: str = ""
+    date: str = ""
+    date_gmt: str = ""
+    modified: str = ""
+    modified_gmt: str = ""
+    yoast_description: str = ""
+    raw: dict = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_api(cls, data):
+        yoast = data.get("yoast_head_json") or {}
+        return cls(
+            id=data["id"],
+            link=data.get("link", ""),
+            slug=data.get("slug", ""),
+            status=data.get("status", ""),
+            title=_rendered(data.get("title")) or _raw(data.get("title")),
+            content=_rendered(data.get("content")),
+            content_raw=_raw(data.get("content")),
+            excerpt=_rendered(data.get("excerpt")) or _raw(data.get("excerpt")),
+            date=data.get("date", "") or "",
+            date_gmt=data.get("date_gmt", "") or "",
+            modified=data.get("modified", "") or "",
+            modified_gmt=data.get("modified_gmt", "") or "",
+            yoast_description=(yoast.get("description") or "") if isinstance(yoast, dict) else "",
+            raw=data,
+        )
+
+    @property
+    def editable_content(self):
+        """Markup to edit and write back: raw when fetched with context=edit."""
+        return self.content_raw or self.content
+
+
+@dataclass
+class WriteResult:
+    """Outcome of one post write in a multi-post update."""
+
+    post_id: int
+    ok: bool
+    status: int = 0
+    data: dict = field(default_factory=dict, repr=False)
+    error: str = ""
+    via: str = ""  # "batch" or "single"
+
+
+def _error_message(body, status):
+    if isinstance(body, dict) and body.get("message"):
+        return f"{status} {body.get('code', '')}: {body['message']}".strip()
+    return f"HTTP {status}"
+
+
+class WPClient:
+    """Pooled, retrying, rate-limited client for one WordPress site."""
+
+    def __init__(self, base_url, username=None, password=None, timeout=DEFAULT_TIMEOUT):
+        self.base_url = (base_url or "").rstrip("/")
+        self.auth = (username, password) if username and password else None
+        self.timeout = timeout
+        self.session = get_session(self.base_url)
+        self.limiter = get_rate_limiter(self.base_url)
+        self.semaphore = get_host_semaphore(self.base_url)
+        self.requests_made = 0
+        self._count_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, site_prefix=None, timeout=DEFAULT_TIMEOUT):
+        """Build a client from SITE_PREFIX-style env vars ({PREFIX}_URL etc.)."""
+        prefix = site_prefix if site_prefix is not None else os.getenv("SITE_PREFIX", "")
+        if prefix and not prefix.endswith("_"):
+            prefix += "_"
+        return cls(
+            os.getenv(f"{prefix}URL", os.getenv("WP_URL", "")),
+            os.getenv(f"{prefix}USERNAME", os.getenv("WP_USERNAME")),
+            os.getenv(f"{prefix}PASSWORD", os.getenv("WP_APP_PASS")),
+            timeout=timeout,
+        )
+
+    def api_url(self, path):
+        """Absolute URL for a wp-json route ("wp/v2/posts" or "/wp/v2/posts")."""
+        return f"{self.base_url}/wp-json/{path.lstrip('/')}"
+
+    @staticmethod
+    def _retry_delay(attempt, response=None):
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after:
+                try:
+                    return min(BACKOFF_MAX_SECONDS, max(0.0, float(retry_after)))
+                except ValueError:
+                    pass
+        delay = BACKOFF_BASE_SECONDS * (2 ** attempt)
+        return min(BACKOFF_MAX_SECONDS, delay) * (0.5 + random.random() / 2)
+
+    def request(self, method, path, params=None, json=None, headers=None, retries=MAX_RETRIES):
+        """Send a request with rate limiting and retries.
+
+        Returns the final requests.Response (which may still be an error
+        status once retries are exhausted); connection errors re-raise after
+        the last attempt.
+        """
+        url = path if path.startswith("http") else self.api_url(path)
+        attempt = 0
+        while True:
+            self.limiter.wait()
+            try:
+                with self.semaphore:
+                    response = self.session.request(
+                        method,
+                        url,
+                        params=params,
+                        json=json,
+                        headers=headers,
+                        auth=self.auth,
+                        timeout=self.timeout,
+                    )
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retries:
+                    raise
+                self.limiter.penalize()
+                time.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+            with self._count_lock:
+                self.requests_made += 1
+
+            if response.status_code in RETRY_STATUSES and attempt < retries:
+                if response.status_code in (429, 503):
+                    self.limiter.penalize()
+                time.sleep(self._retry_delay(attempt, response))
+                attempt += 1
+                continue
+
+            if response.status_code < 400:
+                self.limiter.reward()
+            return response
+
+    def get_json(self, path, params=None):
+        """GET a route and return decoded JSON; raises HTTPError on failure."""
+        response = self.request("GET", path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    # ── Posts ───────────────────────────────────────────────────────────
+
+    def get_post(self, post_id, params=None, fields=None, context=None):
+        """Fetch one post by ID (context="edit" includes raw markup)."""
+        query = build_query(params, fields, context)
+        return WPPost.from_api(self.get_json(f"wp/v2/posts/{post_id}", params=query))
+
+    def get_post_by_slug(self, slug, status=None, fields=None, context=None):
+        """Fetch one post by slug, or None if no post has that slug."""
+        params = {"slug": slug}
+        if status:
+            params["status"] = status
+        posts = self.get_json("wp/v2/posts", params=build_query(params, fields, context))
+        return WPPost.from_api(posts[0]) if posts else None
+
+    def update_post(self, post_id, data):
+        """POST partial updates (content, title, excerpt, meta...) to a post."""
+        response = self.request("POST", f"wp/v2/posts/{post_id}", json=data)
+        response.raise_for_status()
+        return response.json()
+
+    def get_posts(self, post_ids, fields=None, context=None, status="any"):
+        """Fetch many posts by ID via include= listings (100 per request).
+
+        Returns {id: WPPost}; IDs WordPress didn't return are absent.
+        """
+        ids = sorted({int(pid) for pid in post_ids})
+        found = {}
+        for start in range(0, len(ids), PER_PAGE):
+            chunk = ids[start:start + PER_PAGE]
+            params = {"include": ",".join(str(pid) for pid in chunk), "per_page": PER_PAGE}
+            for post in self.fetch_all_posts(params, status=status, fields=fields,
+                                             context=context, workers=1):
+                found[post.id] = post
+        return found
+
+    def get_posts_by_slugs(self, slugs, fields=None, context=None, status="any",
+                           workers=MAX_HOST_CONCURRENCY):
+        """Fetch many posts by slug via slug= listings (100 per request, concurrent).
+
+        Returns {slug: WPPost}; slugs WordPress didn't return are absent.
+        """
+        wanted = sorted({slug for slug in slugs if slug})
+        chunks = [wanted[start:start + PER_PAGE] for start in range(0, len(wanted), PER_PAGE)]
+        if not chunks:
+            return {}
+
+        def fetch(chunk):
+            params = {"slug": ",".join(chunk), "per_page": PER_PAGE}
+            return self.fetch_all_posts(params, status=status, fields=fields,
+                                        context=context, workers=1)
+
+        found = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+            for batch in pool.map(fetch, chunks):
+                for post in batch:
+                    found.setdefault(post.slug, post)
+        return found
+
+    # ── Multi-post writes ───────────────────────────────────────────────
+
+    @property
+    def batch_supported(self):
+        return _batch_support.get(_host_key(self.base_url), True)
+
+    def _single_write(self, post_id, data):
+        try:
+            response = self.request("POST", f"wp/v2/posts/{post_id}", json=data)
+            body = response.json() if response.content else {}
+        except (requests.RequestException, ValueError) as e:
+            return WriteResult(post_id, False, error=str(e)[:200], via="single")
+        if response.status_code >= 400:
+            return WriteResult(post_id, False, response.status_code,
+                               error=_error_message(body, response.status_code), via="single")
+        return WriteResult(post_id, True, response.status_code, data=body, via="single")
+
+    def _batch_write(self, items):
+        """One /batch/v1 request; None if the site can't batch these."""
+        payload = {
+            "validation": "normal",
+            "requests": [
+                {"method": "POST", "path": f"/wp/v2/posts/{post_id}", "body": data}
+                for post_id, data in items
+            ],
+        }
+        try:
+            response = self.request("POST", "batch/v1", json=payload)
+            body = response.json() if response.content else {}
+        except (requests.RequestException, ValueError):
+            return None
+        code = body.get("code") if isinstance(body, dict) else None
+        if response.status_code in BATCH_UNSUPPORTED_STATUSES or code in BATCH_UNSUPPORTED_CODES:
+            _batch_support[_host_key(self.base_url)] = False
+            return None
+        responses = body.get("responses") if isinstance(body, dict) else None
+        if response.status_code >= 400 or not isinstance(responses, list) or len(responses) != len(items):
+            return None
+
+        results = []
+        for (post_id, _), item in zip(items, responses):
+            status = item.get("status", 0)
+            item_body = item.get("body") or {}
+            if 200 <= status < 300:
+                results.append(WriteResult(post_id, True, status, data=item_body, via="batch"))
+            else:
+                results.append(WriteResult(post_id, False, status,
+                                           error=_error_message(item_body, status), via="batch"))
+        return results
+
+    def update_posts(self, updates, workers=MAX_HOST_CONCURRENCY, batch=True):
+        """Apply partial updates to many posts; one WriteResult per item.
+
+        Updates are grouped into /batch/v1 requests of BATCH_MAX_ITEMS.
+        Groups the site won't batch (WordPress < 5.6, route disabled) fall
+        back to single-post POSTs, run concurrently under the per-host cap.
+        Failures are reported per item, never raised.
+
+        Args:
+            updates: Iterable of (post_id, data) pairs.
+            workers: Concurrent requests (batches or single writes).
+            batch: Set False to skip /batch/v1 entirely.
+
+        Returns:
+            list[WriteResult] in the same order as updates.
+        """
+        items = [(int(post_id), data) for post_id, data in updates]
+        if not items:
+            return []
+        results = [None] * len(items)
+        singles = list(range(len(items)))
+
+        if batch and self.batch_supported:
+            groups = [
+                list(range(start, min(start + BATCH_MAX_ITEMS, len(items))))
+                for start in range(0, len(items), BATCH_MAX_ITEMS)
+            ]
+            singles = []
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(groups)))) as pool:
+                futures = {
+                    pool.submit(self._batch_write, [items[i] for i in group]): group
+                    for group in groups
+                }
+                for future in as_completed(futures):
+                    group = futures[future]
+                    batch_results = future.result()
+                    if batch_results is None:
+                        singles.extend(group)
+                        continue
+                    for i, result in zip(group, batch_results):
+                        results[i] = result
+
+        if singles:
+            with ThreadPoolExecutor(max_workers=max(1, min(workers, len(singles)))) as pool:
+                futures = {pool.submit(self._single_write, *items[i]): i for i in singles}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        return results
+
+    # ── Listings ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _total_pages(response):
+        header = response.headers.get("X-WP-TotalPages", "")
+        return int(header) if header.isdigit() else None
+
+    def _fetch_page(self, query, page, validators=None):
+        """Fetch one listing page; None past the last page (400).
+
+        With validators, sends a conditional GET; a 304 yields an empty batch
+        (the unchanged IDs are recorded on the ValidatorCache) and the page
+        count remembered from the previous run.
+        """
+        params = {**query, "page": page}
+        key = headers = None
+        if validators is not None:
+            key = ValidatorCache.key("wp/v2/posts", params)
+            headers = validators.headers_for(key) or None
+        response = self.request("GET", "wp/v2/posts", params=params, headers=headers)
+        if response.status_code == 304 and validators is not None:
+            entry = validators.not_modified(key)
+            response.headers.setdefault("X-WP-TotalPages", str(entry.get("total_pages") or ""))
+            return [], response
+        if response.status_code == 400 and page > 1:
+            return None, response
+        response.raise_for_status()
+        batch = [WPPost.from_api(p) for p in response.json()]
+        if validators is not None:
+            validators.store(key, response, [p.id for p in batch])
+        return batch, response
+
+    def iter_post_pages(self, params=None, on_page=None, fields=None, context=None):
+        """Yield (page_number, total_pages, [WPPost]) sequentially.
+
+        Pagination follows X-WP-TotalPages from the responses; a 400 past the
+        last page (rest_post_invalid_page_number) just ends the listing.
+        """
+        query = {"per_page": PER_PAGE}
+        query.update(build_query(params, fields, context))
+        page = 1
+        total_pages = None
+        while total_pages is None or page <= total_pages:
+            batch, response = self._fetch_page(query, page)
+            if batch is None:
+                break
+            total_pages = self._total_pages(response)
+            if on_page:
+                on_page(page, total_pages, batch)
+            yield page, total_pages, batch
+            if not batch or total_pages is None and len(batch) < query["per_page"]:
+                break
+            page += 1
+
+    def fetch_all_posts(self, params=None, status="publish", on_page=None,
+                        workers=CRAWL_WORKERS, fields=None, context=None, validators=None):
+        """Fetch every post matching params across all pages.
+
+        Page 1 is fetched first to learn X-WP-TotalPages; the remaining pages
+        are fetched concurrently and reassembled in page order.  Servers that
+        omit the header fall back to sequential paging.
+
+        Args:
+            params: Extra query params (orderby, modified_after, ...).
+            status: Post status filter (None to leave unset).
+            on_page: Optional callable(page, total_pages, batch), called from
+                the calling thread as each page arrives (not in page order).
+            workers: Concurrent page fetches (1 = sequential).
+            fields: Optional _fields projection (tuple or comma string); only
+                these keys are serialized and sent by WordPress.
+            context: REST context ("edit" adds raw markup; needs edit rights).
+            validators: Optional ValidatorCache; pages answered 304 add no
+                posts and their IDs land on validators.not_modified_ids.
+
+        Returns:
+            list[WPPost]
+        """
+        query = {"per_page": PER_PAGE}
+        query.update(build_query(params, fields, context))
+        if status and "status" not in query:
+            query["status"] = status
+
+        first, response = self._fetch_page(query, 1, validators)
+        total_pages = self._total_pages(response)
+        if on_page:
+            on_page(1, total_pages, first)
+        if total_pages is None:
+            posts = list(first)
+            page, batch = 1, first
+            while batch and len(batch) >= query["per_page"]:
+                page += 1
+                batch, _ = self._fetch_page(query, page, validators)
+                if batch is None:
+                    break
+                posts.extend(batch)
+                if on_page:
+                    on_page(page, None, batch)
+            return posts
+        if total_pages <= 1:
+            return list(first)
+
+        pages = {1: first}
+        remaining = range(2, total_pages + 1)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(remaining)))) as pool:
+            futures = {
+                pool.submit(self._fetch_page, query, page, validators): page
+                for page in remaining
+            }
+            for future in as_completed(futures):
+                page = futures[future]
+                batch, _ = future.result()
+                pages[page] = batch or []
+                if on_page:
+                    on_page(page, total_pages, pages[page])
+
+        return [post for page in sorted(pages) for post in pages[page]]
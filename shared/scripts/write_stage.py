@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Write staging for the WordPress write tools — each post written at most once.
+
+Write tools stage edits here instead of POSTing whole bodies directly:
+- fetch() loads each touched post once (raw markup, context=edit) and keeps
+  the current value of every writable field it returned (title, content,
+  excerpt, meta, status, slug) as the diff base; posts already loaded are
+  not fetched again
+- stage() records an edit from a named source; later edits to the same post
+  build on current() and merge into one pending update
+- flush() drops fields whose value equals the base (for meta, every staged
+  key equal to the stored one), skips posts with nothing
+  left to change, logs a structural diff (tag/text tokens) of each content
+  change, and writes the rest through WPClient.update_posts
+
+Plan-level coalescing: when WRITE_STAGE_PATH is set (the agent brain sets it
+for plans with several write steps), from_env() loads the plan's stage from
+that file and flush() only saves it back, so every write tool in the plan
+edits the same fetched posts.  Each edit is tagged with WRITE_STAGE_STEP.
+commit_staged_writes.py then writes each post once and reports the outcome
+per originating step.  Changelog entries and inventory changes that tools
+log through log_change() / update_inventory() are kept with the post in
+the stage file and only applied once its real write succeeds.
+
+Usage:
+    from write_stage import WriteStage
+    stage = WriteStage(wp, content_cache)
+    posts = stage.fetch(post_ids)
+    stage.stage(post_id, "inject_internal_links", content=new_html)
+    results = stage.flush()          # {post_id: WriteResult}
+    stage.log_change(post_id, changelog, {...})                    # after an ok write
+    stage.update_inventory(post_id, inventory_delta, "add_link", target_url)
+    stage.finish()                   # plan stage: save the records logged above
+
+    stage = WriteStage.from_env(wp, content_cache)   # plan stage if WRITE_STAGE_PATH is set
+"""
+
+import difflib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+
+from changelog import Changelog
+from wp_client import EDIT_FIELDS, WPPost, WriteResult
+
+# Tags and the text between them; the unit of the structural diff.
+HTML_TOKEN_RE = re.compile(r"<[^>]*>|[^<]+")
+
+# Post fields an edit can stage; add_post() records a base for each one fetched.
+WRITABLE_FIELDS = ("title", "content", "excerpt", "meta", "status", "slug")
+
+
+@dataclass
+class StagedEdit:
+    """One source's contribution to a post's pending update."""
+
+    source: str
+    fields: list = field(default_factory=list)
+    step: str = ""  # plan step that made the edit (WRITE_STAGE_STEP)
+
+
+def stored_value(post, name):
+    """A writable field's stored value as fetched: raw markup when present, meta as a dict."""
+    if name == "content":
+        return post.editable_content
+    value = post.raw.get(name)
+    if name == "meta":
+        return dict(value) if isinstance(value, dict) else {}  # WordPress sends [] when empty
+    if isinstance(value, dict):
+        return value.get("raw") or value.get("rendered") or ""
+    return value or ""
+
+
+def differs(base, value):
+    """True if writing value would change base (meta: any staged key differs)."""
+    if isinstance(value, dict) and isinstance(base, dict):
+        return any(base.get(key) != item for key, item in value.items())
+    return base != value
+
+
+def html_tokens(html):
+    return HTML_TOKEN_RE.findall(html or "")
+
+
+def structural_diff(before, after):
+    """Token-level diff stats between two versions of a post's markup."""
+    a, b = html_tokens(before), html_tokens(after)
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    stats = {"hunks": 0, "tokens_removed": 0, "tokens_added": 0, "chars_removed": 0, "chars_added": 0}
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            continue
+        stats["hunks"] += 1
+        stats["tokens_removed"] += i2 - i1
+        stats["tokens_added"] += j2 - j1
+        stats["chars_removed"] += sum(len(t) for t in a[i1:i2])
+        stats["chars_added"] += sum(len(t) for t in b[j1:j2])
+    return stats
+
+
+class WriteStage:
+    """Pending post updates, merged per post and diffed against the fetched base."""
+
+    def __init__(self, wp, content_cache=None, path=None):
+        self.wp = wp
+        self.content_cache = content_cache
+        self.path = path  # set: flush() saves here instead of writing
+        self.step = os.getenv("WRITE_STAGE_STEP", "")
+        self.posts = {}   # post_id -> WPPost as fetched
+        self.loaded = {}  # post_id -> top-level fields fetched
+        self.base = {}    # post_id -> {field: current value}
+        self.staged = {}  # post_id -> {field: pending value}
+        self.edits = {}   # post_id -> [StagedEdit]
+        self.log = []     # one entry per post considered by flush()
+        self._records_dirty = False
+        self.records = {}  # post_id -> {"changelog": [[path, entry]], "inventory": [[op, args, kwargs]]} (plan stage)
+
+    @classmethod
+    def from_env(cls, wp, content_cache=None):
+        """The plan's deferred stage when WRITE_STAGE_PATH is set, else a direct one."""
+        path = os.getenv("WRITE_STAGE_PATH", "")
+        return cls.load(path, wp, content_cache, defer=True) if path else cls(wp, content_cache)
+
+    @classmethod
+    def load(cls, path, wp, content_cache=None, defer=False):
+        """Restore a saved stage; defer keeps flush() saving back to path."""
+        stage = cls(wp, content_cache, path=path if defer else None)
+        if not os.path.exists(path):
+            return stage
+        with open(path, "r") as f:
+            data = json.load(f)
+        for pid, entry in data.get("posts", {}).items():
+            pid = int(pid)
+            stage.posts[pid] = WPPost.from_api(entry["post"])
+            stage.loaded[pid] = set(entry.get("loaded", []))
+            stage.base[pid] = entry.get("base", {})
+        stage.staged = {int(pid): fields for pid, fields in data.get("staged", {}).items()}
+        stage.edits = {int(pid): [StagedEdit(**e) for e in edits] for pid, edits in data.get("edits", {}).items()}
+        stage.records = {int(pid): records for pid, records in data.get("records", {}).items()}
+        return stage
+
+    def save(self, path=None):
+        path = path or self.path
+        data = {
+            "posts": {
+                str(pid): {"post": post.raw, "loaded": sorted(self.loaded.get(pid, ())), "base": self.base.get(pid, {})}
+                for pid, post in self.posts.items()
+            },
+            "staged": {str(pid): fields for pid, fields in self.staged.items()},
+            "edits": {str(pid): [asdict(e) for e in edits] for pid, edits in self.edits.items()},
+            "records": {str(pid): records for pid, records in self.records.items()},
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    # ── Loading ─────────────────────────────────────────────────────────
+
+    def add_post(self, post, fields=EDIT_FIELDS):
+        """Register a fetched WPPost as the base for its edits."""
+        self.posts[post.id] = post
+        self.loaded.setdefault(post.id, set()).update(f.split(".")[0] for f in fields)
+        base = self.base.setdefault(post.id, {})
+        for name in WRITABLE_FIELDS:
+            if name in post.raw:
+                base.setdefault(name, stored_value(post, name))
+
+    def fetch(self, post_ids, fields=EDIT_FIELDS, context="edit"):
+        """{post_id: WPPost} for post_ids, fetching only posts not loaded with these fields."""
+        ids = {int(pid) for pid in post_ids}
+        if self.path:
+            # Later tools in the plan edit content too: fetch it with the first.
+            fields, context = tuple(dict.fromkeys((*EDIT_FIELDS, *fields))), "edit"
+        wanted = {f.split(".")[0] for f in fields}
+        missing = [pid for pid in ids if not wanted <= self.loaded.get(pid, set())]
+        if missing:
+            for post in self.wp.get_posts(missing, fields=fields, context=context).values():
+                self.add_post(post, fields)
+        return {pid: self.posts[pid] for pid in ids if pid in self.posts}
+
+    def current(self, post_id, field="content"):
+        """The value a new edit should build on: staged if any, else the base."""
+        post_id = int(post_id)
+        staged = self.staged.get(post_id, {})
+        if field in staged:
+            return staged[field]
+        return self.base.get(post_id, {}).get(field)
+
+    # ── Staging ─────────────────────────────────────────────────────────
+
+    def stage(self, post_id, source, **fields):
+        """Record an edit; fields merge into the post's pending update."""
+        post_id = int(post_id)
+        pending = self.staged.setdefault(post_id, {})
+        for name, value in fields.items():
+            if isinstance(value, dict) and isinstance(pending.get(name), dict):
+                pending[name] = {**pending[name], **value}
+            else:
+                pending[name] = value
+        self.edits.setdefault(post_id, []).append(StagedEdit(source, sorted(fields), self.step))
+
+    def changes(self, post_id):
+        """The staged fields that actually differ from the base."""
+        base = self.base.get(post_id, {})
+        return {name: value for name, value in self.staged.get(post_id, {}).items()
+                if name not in base or differs(base[name], value)}
+
+    # ── Writing ─────────────────────────────────────────────────────────
+
+    def flush(self, workers=None):
+        """Write every post with real changes once; returns {post_id: WriteResult}.
+
+        Posts whose staged values all equal the base get an ok WriteResult
+        with via="noop" and no request.  A deferred (plan) stage saves itself
+        instead and reports its posts with via="staged".
+        """
+        if self.path:
+            self.save()
+            return {pid: WriteResult(pid, True, via="staged" if self.changes(pid) else "noop")
+                    for pid in self.staged}
+        results = {}
+        updates = []
+        entries = {}
+        for post_id in sorted(self.staged):
+            data = self.changes(post_id)
+            sources = [edit.source for edit in self.edits.get(post_id, [])]
+            entry = {"post_id": post_id, "sources": sources, "fields": sorted(data)}
+            if "content" in data and "content" in self.base.get(post_id, {}):
+                entry["diff"] = structural_diff(self.base[post_id]["content"], data["content"])
+            self.log.append(entry)
+            entries[post_id] = entry
+            if not data:
+                results[post_id] = WriteResult(post_id, True, via="noop")
+                print(f"Post {post_id}: no change, write skipped ({', '.join(sources)})")
+                continue
+            diff = entry.get("diff")
+            if diff:
+                print(f"Post {post_id}: {diff['hunks']} hunks, +{diff['chars_added']}/-{diff['chars_removed']} chars "
+                      f"({', '.join(sources)})")
+            updates.append((post_id, data))
+
+        kwargs = {"workers": workers} if workers else {}
+        written = dict(updates)
+        for result in self.wp.update_posts(updates, **kwargs):
+            results[result.post_id] = result
+            entries[result.post_id]["written"] = result.ok
+            if not result.ok:
+                continue
+            if self.content_cache is not None:
+                self.content_cache.invalidate(result.post_id)  # readers refresh it from WordPress
+            base = self.base.setdefault(result.post_id, {})
+            for name, value in written[result.post_id].items():
+                if isinstance(value, dict) and isinstance(base.get(name), dict):
+                    value = {**base[name], **value}
+                base[name] = value
+
+        self.staged.clear()
+        self.edits.clear()
+        return results
+
+    # ── Records ─────────────────────────────────────────────────────────
+
+    def _records(self, post_id):
+        self._records_dirty = True
+        return self.records.setdefault(int(post_id), {"changelog": [], "inventory": []})
+
+    def log_change(self, post_id, changelog, entry):
+        """Append a changelog entry for a written post.
+
+        In a plan stage the post isn't written yet: the entry is kept with it
+        and appended by apply_records() once the real write succeeds.
+        """
+        if self.path:
+            self._records(post_id)["changelog"].append([os.path.abspath(changelog.path), entry])
+        else:
+            changelog.append(entry)
+
+    def update_inventory(self, post_id, delta, op, *args, **kwargs):
+        """Queue an InventoryDelta change (increment, set, add_link, remove_link) for a written post.
+
+        Deferred like log_change() in a plan stage.
+        """
+        if self.path:
+            self._records(post_id)["inventory"].append([op, list(args), kwargs])
+        else:
+            getattr(delta, op)(int(post_id), *args, **kwargs)
+
+    def finish(self):
+        """Save records logged after flush() back to a plan stage (no-op otherwise)."""
+        if self.path and self._records_dirty:
+            self.save()
+            self._records_dirty = False
+
+    def apply_records(self, post_ids, delta):
+        """Apply the deferred records of post_ids (the ones really written); returns entries logged."""
+        changelogs = {}
+        logged = 0
+        for post_id in post_ids:
+            records = self.records.pop(int(post_id), None)
+            if not records:
+                continue
+            for path, entry in records["changelog"]:
+                if path not in changelogs:
+                    changelogs[path] = Changelog(path)
+                changelogs[path].append(entry)
+                logged += 1
+            for op, args, kwargs in records["inventory"]:
+                getattr(delta, op)(int(post_id), *args, **kwargs)
+        for log in changelogs.values():
+            log.commit()
+        return logged
+
+    def summary(self):
+        """Counts for a tool's result: posts written, no-op writes skipped, edits merged."""
+        if self.path:
+            return {"deferred_to": os.path.basename(self.path), "posts_staged": len(self.staged)}
+        return {
+            "posts_written": sum(1 for e in self.log if e.get("written")),
+            "noop_writes_skipped": sum(1 for e in self.log if not e["fields"]),
+            "edits_merged": sum(max(0, len(e["sources"]) - 1) for e in self.log),
+            "chars_changed": sum(e.get("diff", {}).get("chars_added", 0) + e.get("diff", {}).get("chars_removed", 0)
+                                 for e in self.log),
+        }